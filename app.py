@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 from src.analyzer import MarketBasketAnalyzer
+from src.cache import ResultCache, fingerprint_file
+from src.network import LayoutCache
 
 st.set_page_config(page_title="Market Basket Analysis", layout="wide")
 
@@ -19,10 +21,36 @@ def get_sample_data():
     }
     return pd.DataFrame(data)
 
+@st.cache_resource
+def get_result_cache():
+    return ResultCache('.mba_cache')
+
+@st.cache_resource
+def get_layout_cache():
+    return LayoutCache(size=32)
+
+def get_analyzer(source_key, build):
+    # Streamlit reruns the script on every widget change; keeping the analyzer
+    # in the session lets a new support or confidence value filter the
+    # lattice and rules already mined instead of starting over.
+    if st.session_state.get('analyzer_key') != source_key:
+        st.session_state['analyzer'] = build()
+        st.session_state['analyzer_key'] = source_key
+    else:
+        # The profile would otherwise sum up every rerun since the upload.
+        st.session_state['analyzer'].profile.clear()
+    return st.session_state['analyzer']
+
+def build_sample_analyzer():
+    analyzer = MarketBasketAnalyzer(get_sample_data(), cache=get_result_cache())
+    analyzer.preprocess_data()
+    return analyzer
+
 if uploaded_file is not None:
 
-    df = pd.read_csv(uploaded_file)
-    st.success(f"Successfully loaded {len(df)} records")
+    df = pd.read_csv(uploaded_file, nrows=10)
+    uploaded_file.seek(0)
+    st.success(f"Successfully opened {uploaded_file.name}")
 elif use_sample_data:
     df = get_sample_data()
     st.info("Using sample data. Replace with your own data for more meaningful insights.")
@@ -44,8 +72,14 @@ with st.expander("View Raw Data"):
     st.text(f"Column names: {', '.join(df.columns)}")
 
 try:
-    analyzer = MarketBasketAnalyzer(df)
-    analyzer.preprocess_data()
+    if uploaded_file is not None:
+        with st.spinner("Encoding transactions..."):
+            analyzer = get_analyzer(
+                fingerprint_file(uploaded_file),
+                lambda: MarketBasketAnalyzer.from_csv(uploaded_file, cache=get_result_cache())
+            )
+    else:
+        analyzer = get_analyzer('sample', build_sample_analyzer)
 
     st.header("Dataset Overview")
     insights = analyzer.generate_insights()
@@ -62,27 +96,50 @@ try:
         cols[i].metric(label, value)
 
     st.header("Analysis Parameters")
-    col1, col2 = st.columns(2)
-    with col1:
-        min_support = st.slider("Minimum Support", 0.01, 0.5, 0.05, 
-                              help="Minimum frequency threshold for items to be considered frequent")
-    with col2:
-        min_confidence = st.slider("Minimum Confidence", 0.1, 1.0, 0.5,
-                                 help="Minimum probability threshold for rules to be considered strong")
-  
-    with st.spinner("Finding frequent itemsets..."):
-        itemsets = analyzer.find_frequent_itemsets(min_support=min_support)
-    
-    if itemsets.empty:
-        st.warning(f"No frequent itemsets found with minimum support of {min_support}. Try lowering the support threshold.")
-        st.stop()
+    mode = st.radio("Mining Mode", ["Thresholds", "Top-k Rules"], horizontal=True,
+                    help="Top-k finds the best rules without choosing a minimum support")
+    if mode == "Top-k Rules":
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            top_k = st.number_input("Number of Rules", 10, 1000, 100, step=10)
+        with col2:
+            top_metric = st.selectbox("Rank By", ["lift", "confidence", "support"])
+        with col3:
+            min_confidence = st.slider("Minimum Confidence", 0.0, 1.0, 0.1,
+                                     help="Minimum probability threshold for rules to be considered strong")
+
+        with st.spinner(f"Finding the top {top_k} rules by {top_metric}..."):
+            rules = analyzer.find_top_rules(k=int(top_k), metric=top_metric,
+                                            min_confidence=min_confidence, time_limit=30)
+        search = analyzer.top_rules_search
+        st.caption(f"Searched down to support {search['min_support']:.4f} "
+                   f"in {len(search['rounds'])} rounds ({search['stopped']})")
+
+        if rules.empty:
+            st.warning(f"No association rules found with minimum confidence of {min_confidence}. Try lowering the confidence threshold.")
+            st.stop()
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            min_support = st.slider("Minimum Support", 0.01, 0.5, 0.05, 
+                                  help="Minimum frequency threshold for items to be considered frequent")
+        with col2:
+            min_confidence = st.slider("Minimum Confidence", 0.1, 1.0, 0.5,
+                                     help="Minimum probability threshold for rules to be considered strong")
+      
+        with st.spinner("Finding frequent itemsets..."):
+            itemsets = analyzer.find_frequent_itemsets(min_support=min_support)
         
-    with st.spinner("Generating association rules..."):
-        rules = analyzer.generate_rules(min_confidence=min_confidence)
-    
-    if rules.empty:
-        st.warning(f"No association rules found with minimum confidence of {min_confidence}. Try lowering the confidence threshold.")
-        st.stop()
+        if itemsets.empty:
+            st.warning(f"No frequent itemsets found with minimum support of {min_support}. Try lowering the support threshold.")
+            st.stop()
+            
+        with st.spinner("Generating association rules..."):
+            rules = analyzer.generate_rules(min_confidence=min_confidence)
+        
+        if rules.empty:
+            st.warning(f"No association rules found with minimum confidence of {min_confidence}. Try lowering the confidence threshold.")
+            st.stop()
     
     st.header("Visualizations")
     
@@ -102,29 +159,25 @@ try:
         st.subheader("Association Network")
         min_lift = st.slider("Minimum Lift for Network Graph", 1.0, 5.0, 1.2,
                            help="Higher values show stronger associations only")
-        fig_network = analyzer.create_network_graph(min_confidence=min_confidence, min_lift=min_lift)
+        max_edges = st.slider("Maximum Edges", 10, 500, 100,
+                            help="Only the strongest rules by lift are drawn")
+        fig_network = analyzer.create_network_graph(min_confidence=min_confidence, min_lift=min_lift,
+                                                    max_edges=max_edges, layout_cache=get_layout_cache())
         st.pyplot(fig_network)
 
     st.header("Top Association Rules")
     
-    display_rules = rules.copy()
-    
-    def format_itemset(itemset):
-        return ', '.join(list(itemset))
-    
-    display_rules['antecedents_str'] = display_rules['antecedents'].apply(format_itemset)
-    display_rules['consequents_str'] = display_rules['consequents'].apply(format_itemset)
-
-    top_rules = display_rules.sort_values('lift', ascending=False).head(10)
+    store = analyzer.rule_store()
+    top_rules = store.display(store.top(10, 'lift'))
    
     top_rules['confidence_str'] = top_rules['confidence'].apply(lambda x: f"{x:.2%}")
     top_rules['lift_str'] = top_rules['lift'].apply(lambda x: f"{x:.2f}")
     top_rules['support_str'] = top_rules['support'].apply(lambda x: f"{x:.4f}")
 
     st.dataframe(
-        top_rules[['antecedents_str', 'consequents_str', 'support_str', 'confidence_str', 'lift_str']].rename(columns={
-            'antecedents_str': 'Antecedents',
-            'consequents_str': 'Consequents',
+        top_rules[['antecedents', 'consequents', 'support_str', 'confidence_str', 'lift_str']].rename(columns={
+            'antecedents': 'Antecedents',
+            'consequents': 'Consequents',
             'support_str': 'Support',
             'confidence_str': 'Confidence',
             'lift_str': 'Lift'
@@ -133,7 +186,7 @@ try:
     )
     
     st.header("Export Results")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         report = analyzer.generate_report()
         st.download_button(
@@ -143,13 +196,31 @@ try:
             mime="text/plain"
         )
     with col2:
-        rules_csv = rules.to_csv(index=False)
+        rules_csv = store.to_csv()
         st.download_button(
             "Download Rules as CSV",
             rules_csv,
             file_name="association_rules.csv",
             mime="text/csv"
         )
+    with col3:
+        st.download_button(
+            "Download Rules as Parquet",
+            store.to_parquet(),
+            file_name="association_rules.parquet",
+            mime="application/vnd.apache.parquet"
+        )
+
+    with st.expander("Performance"):
+        st.text(f"Total pipeline time: {analyzer.profile.total_seconds:.3f} s")
+        st.dataframe(analyzer.profile.to_frame().drop(columns=['params', 'started_at'], errors='ignore'),
+                     use_container_width=True)
+        st.download_button(
+            "Download Profile as JSON",
+            analyzer.profile.to_json(),
+            file_name="pipeline_profile.json",
+            mime="application/json"
+        )
 
 except Exception as e:
     st.error(f"An error occurred: {str(e)}")
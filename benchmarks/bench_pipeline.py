@@ -0,0 +1,253 @@
+"""
+Benchmark the mining pipeline across data scale, density and min_support.
+
+Synthetic datasets come from generate_synthetic_baskets (Zipf product
+popularity, configurable basket-size distribution). For every dataset the
+harness times and memory-profiles each MarketBasketAnalyzer stage, running
+itemset mining and rule generation once per min_support value on a fresh
+analyzer so threshold reuse does not hide the real cost. Results are
+written as JSON and, with --baseline, compared against a stored run; any
+stage slower (or hungrier) than the baseline by more than --tolerance is
+reported and the script exits with status 1. Interpreter startup (importing
+the analyzer, launching the CLI) is timed first in fresh processes.
+
+    python benchmarks/bench_pipeline.py --baskets 20000,50000 --support 0.005,0.01,0.02
+    python benchmarks/bench_pipeline.py --output current.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer import MarketBasketAnalyzer  # noqa: E402
+from src.utils import generate_synthetic_baskets  # noqa: E402
+
+# Differences below these floors are treated as noise, whatever the ratio.
+MIN_SECONDS = 0.05
+MIN_MEGABYTES = 5.0
+
+
+def measure(function, memory=True):
+    """
+    Run function once and return (result, seconds, peak_megabytes).
+
+    Peak memory is measured with tracemalloc (NumPy allocations are
+    traced), so it is the extra memory the stage needed, not the process RSS.
+    """
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = function()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _record(results, dataset, stage, seconds, peak, min_support=None, **outputs):
+    results.append({
+        'dataset': dataset,
+        'stage': stage,
+        'min_support': min_support,
+        'seconds': seconds,
+        'peak_mb': peak,
+        'outputs': outputs,
+    })
+
+
+def bench_dataset(transactions, dataset, supports, algorithm, min_confidence, sparse, memory):
+    results = []
+
+    def prepared():
+        analyzer = MarketBasketAnalyzer(transactions.copy())
+        analyzer.preprocess_data()
+        return analyzer
+
+    analyzer, seconds, peak = measure(prepared, memory)
+    _record(results, dataset, 'preprocess_data', seconds, peak, rows=len(analyzer.transactions_df))
+
+    matrix, seconds, peak = measure(lambda: analyzer.create_binary_matrix(sparse=sparse), memory)
+    basket_matrix = analyzer._basket_matrix()
+    _record(results, dataset, 'create_binary_matrix', seconds, peak, baskets=basket_matrix.n_baskets,
+            items=basket_matrix.n_products, density=basket_matrix.density)
+
+    figure, seconds, peak = measure(lambda: analyzer.plot_association_heatmap(top_n=20), memory)
+    plt.close('all')
+    _record(results, dataset, 'plot_association_heatmap', seconds, peak)
+
+    for min_support in supports:
+        run = MarketBasketAnalyzer(analyzer.transactions_df)
+        run._set_basket_matrix(basket_matrix, sparse)
+
+        itemsets, seconds, peak = measure(
+            lambda: run.find_frequent_itemsets(min_support=min_support, algorithm=algorithm), memory
+        )
+        _record(results, dataset, 'find_frequent_itemsets', seconds, peak, min_support,
+                itemsets=len(itemsets))
+
+        rules, seconds, peak = measure(lambda: run.generate_rules(min_confidence=min_confidence), memory)
+        _record(results, dataset, 'generate_rules', seconds, peak, min_support, rules=len(rules))
+    return results
+
+
+PLOTTING = ('matplotlib', 'seaborn', 'networkx', 'mlxtend')
+STARTUP_COMMANDS = {
+    'import src.analyzer': ['-c', f"import sys, src.analyzer; "
+                                  f"print(int(any(name in sys.modules for name in {PLOTTING!r})))"],
+    'cli --help': ['-m', 'src.cli', '--help'],
+}
+
+
+def bench_startup(repeats=3):
+    """
+    Time fresh interpreters importing the analyzer and starting the CLI.
+
+    Each command runs repeats times in a new process from the repository
+    root and the fastest wall time is kept. The import check also records
+    whether any plotting or mlxtend module was loaded, which a headless
+    batch job should never pay for.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for stage, command in STARTUP_COMMANDS.items():
+        command = [sys.executable] + command
+        best, output = None, ''
+        for _ in range(repeats):
+            started = time.perf_counter()
+            output = subprocess.run(command, cwd=root, check=True, capture_output=True, text=True).stdout
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        outputs = {'plotting_loaded': bool(int(output))} if stage.startswith('import') else {}
+        _record(results, 'startup', stage, best, None, **outputs)
+    return results
+
+
+def _key(result):
+    return (result['dataset'], result['stage'], result['min_support'])
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Flag stages that regressed against a baseline run.
+
+    A stage regresses when its time (or peak memory) exceeds the baseline by
+    more than tolerance as a fraction and by more than the noise floor.
+
+    Returns:
+        List of dicts with dataset, stage, min_support, metric, baseline,
+        current and ratio
+    """
+    previous = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS), ('peak_mb', MIN_MEGABYTES)):
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append({
+                    'dataset': result['dataset'],
+                    'stage': result['stage'],
+                    'min_support': result['min_support'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': after / before if before else float('inf'),
+                })
+    return regressions
+
+
+def run(args):
+    supports = [float(value) for value in args.support.split(',')]
+    results = [] if args.no_startup else bench_startup()
+    for n_baskets in (int(value) for value in args.baskets.split(',')):
+        for n_products in (int(value) for value in args.products.split(',')):
+            dataset = f"b{n_baskets}-p{n_products}-z{args.zipf}-s{args.basket_size}-{args.size_distribution}"
+            transactions = generate_synthetic_baskets(
+                n_baskets, n_products, zipf_exponent=args.zipf, mean_basket_size=args.basket_size,
+                size_distribution=args.size_distribution, seed=args.seed
+            )
+            print(f"{dataset}: {len(transactions):,} rows", file=sys.stderr)
+            results.extend(bench_dataset(transactions, dataset, supports, args.algorithm,
+                                         args.min_confidence, args.sparse, not args.no_memory))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'config': vars(args),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark MarketBasketAnalyzer stages')
+    parser.add_argument('--baskets', default='10000,50000', help='comma-separated basket counts')
+    parser.add_argument('--products', default='500', help='comma-separated catalog sizes')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent of product popularity')
+    parser.add_argument('--basket-size', type=float, default=4.0, help='mean items per basket')
+    parser.add_argument('--size-distribution', default='poisson', choices=['poisson', 'geometric', 'fixed'])
+    parser.add_argument('--support', default='0.005,0.01,0.02,0.05', help='comma-separated min_support grid')
+    parser.add_argument('--min-confidence', type=float, default=0.1)
+    parser.add_argument('--algorithm', default='fpgrowth', choices=['apriori', 'fpgrowth', 'eclat', 'auto'])
+    parser.add_argument('--sparse', action='store_true', help='use the sparse BasketMatrix')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (faster, timings only)')
+    parser.add_argument('--no-startup', action='store_true', help='skip the interpreter startup timings')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='earlier results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2)
+
+    for result in results['results']:
+        support = '' if result['min_support'] is None else f" @ {result['min_support']:g}"
+        memory = '' if result['peak_mb'] is None else f"  {result['peak_mb']:8.1f} MB"
+        outputs = ' '.join(f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+                           for name, value in result['outputs'].items())
+        print(f"{result['dataset']:36s} {result['stage'] + support:34s} "
+              f"{result['seconds']:8.3f} s{memory}  {outputs}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['dataset']} {regression['stage']} "
+                  f"min_support={regression['min_support']} {regression['metric']}: "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f} "
+                  f"({regression['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Local load test for the recommendation service.
+
+Mines rules from a transactions CSV (or loads a saved ServingModel), starts
+the service in-process on a free port and drives it with concurrent
+keep-alive HTTP clients sending carts drawn from real baskets. Prints
+throughput and p50/p90/p99 latency per endpoint.
+
+    python benchmarks/load_test.py "data/Groceries data.csv" --requests 5000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import quote
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer import MarketBasketAnalyzer  # noqa: E402
+from src.service import RecommendationService, ServingModel  # noqa: E402
+
+
+def build_model(args):
+    """Return (model, model_dir, basket_matrix); basket_matrix is None for a saved model"""
+    if args.model:
+        return ServingModel.load(args.model), args.model, None
+    analyzer = MarketBasketAnalyzer.from_csv(args.csv)
+    analyzer.find_frequent_itemsets(min_support=args.min_support, algorithm='fpgrowth')
+    analyzer.generate_rules(min_confidence=args.min_confidence)
+    return ServingModel.from_analyzer(analyzer), None, analyzer.binary_matrix
+
+
+def sample_carts(model, basket_matrix, n, rng):
+    """Carts taken from real baskets when available, otherwise random antecedent items"""
+    products = model.rule_index.products
+    if basket_matrix is not None and basket_matrix.n_baskets:
+        matrix = basket_matrix.matrix
+        rows = rng.integers(0, basket_matrix.n_baskets, n)
+        return [products[matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]].tolist() or
+                [products[0].item()] for row in rows]
+    pool = np.flatnonzero(model.rule_index.in_antecedent)
+    return [products[rng.choice(pool, size=min(3, len(pool)), replace=False)].tolist() for _ in range(n)]
+
+
+def make_paths(carts, rng, mix):
+    endpoints = rng.choice(list(mix), size=len(carts), p=list(mix.values()))
+    paths = []
+    for endpoint, cart in zip(endpoints, carts):
+        items = ','.join(quote(str(item), safe='') for item in cart)
+        if endpoint == '/recommend':
+            paths.append((endpoint, f"/recommend?items={items}&k=5"))
+        elif endpoint == '/rules':
+            paths.append((endpoint, f"/rules?antecedent={quote(str(cart[0]), safe='')}&limit=10"))
+        else:
+            paths.append((endpoint, f"/itemset-support?items={items}"))
+    return paths
+
+
+async def client(host, port, paths, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for endpoint, path in paths:
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies[endpoint].append(time.perf_counter() - started)
+            if status != 200:
+                errors[endpoint] = errors.get(endpoint, 0) + 1
+    finally:
+        writer.close()
+
+
+def summarize(latencies, errors, elapsed):
+    report = {'elapsed_s': elapsed, 'endpoints': {}}
+    total = 0
+    for endpoint, values in latencies.items():
+        if not values:
+            continue
+        values = np.array(values) * 1000
+        total += len(values)
+        report['endpoints'][endpoint] = {
+            'requests': len(values),
+            'errors': errors.get(endpoint, 0),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p90_ms': float(np.percentile(values, 90)),
+            'p99_ms': float(np.percentile(values, 99)),
+            'max_ms': float(values.max()),
+        }
+    report['requests'] = total
+    report['throughput_rps'] = total / elapsed if elapsed else 0.0
+    return report
+
+
+async def run(args):
+    model, model_dir, basket_matrix = build_model(args)
+    service = RecommendationService(model, model_dir=model_dir, batch_window=args.batch_window,
+                                    max_batch=args.max_batch, cache_size=args.cache_size)
+    host, port = await service.start('127.0.0.1', 0)
+
+    rng = np.random.default_rng(args.seed)
+    carts = sample_carts(model, basket_matrix, args.requests, rng)
+    mix = {'/recommend': 0.8, '/rules': 0.1, '/itemset-support': 0.1}
+    paths = make_paths(carts, rng, mix)
+
+    latencies = {endpoint: [] for endpoint in mix}
+    errors = {}
+    shards = [paths[offset::args.concurrency] for offset in range(args.concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, shard, latencies, errors) for shard in shards if shard))
+    elapsed = time.perf_counter() - started
+
+    report = summarize(latencies, errors, elapsed)
+    report['service'] = dict(service.stats)
+    await service.stop()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure recommendation service latency')
+    parser.add_argument('csv', nargs='?', default='data/Groceries data.csv',
+                        help='transactions CSV with transaction_id and product_id columns')
+    parser.add_argument('--model', help='load a saved ServingModel directory instead of mining the CSV')
+    parser.add_argument('--min-support', type=float, default=0.005)
+    parser.add_argument('--min-confidence', type=float, default=0.1)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--batch-window', type=float, default=0.001)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--cache-size', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print(f"{report['requests']} requests in {report['elapsed_s']:.2f}s "
+          f"({report['throughput_rps']:.0f} req/s)")
+    for endpoint, stats in report['endpoints'].items():
+        print(f"{endpoint:18s} n={stats['requests']:6d}  p50={stats['p50_ms']:.2f}ms  "
+              f"p90={stats['p90_ms']:.2f}ms  p99={stats['p99_ms']:.2f}ms  errors={stats['errors']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
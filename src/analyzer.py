@@ -1,46 +1,201 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from mlxtend.frequent_patterns import apriori, association_rules
-from mlxtend.preprocessing import TransactionEncoder
-import networkx as nx
 from datetime import datetime
+from .cache import ResultCache, fingerprint_file, fingerprint_matrix, fingerprint_transactions
+from .cooccurrence import CooccurrenceIndex
+from .encoding import BasketMatrix
+from .incremental import IncrementalMiner
+from .mining import ALGORITHMS, ItemsetLattice, min_count_for_support, mine_itemsets
+from .preprocessing import clean_transactions, parse_dates
+from .parallel import resolve_n_jobs, segment_itemsets, son_itemsets
+from .profiling import PipelineProfile, profiled
+from .recommend import RuleIndex
+from .rules import RULE_COLUMNS, rules_from_lattice
+from .rulestore import RuleStore
+from .sampling import sample_itemsets
+from .taxonomy import Taxonomy, taxonomy_itemsets, taxonomy_rules
+from .topk import top_k_rules
+from .visualization import AnalyzerPlots
+from .windows import WindowedCounts
 
-class MarketBasketAnalyzer:
-    def __init__(self, transactions_df):
+class MarketBasketAnalyzer(AnalyzerPlots):
+    def __init__(self, transactions_df, binary_matrix=None, cache=None, profile=None):
         """
         Initialize the analyzer with a DataFrame containing transaction data.
         Required column: transaction_id, product_id
         Optional columns: customer_id, timestamp
+
+        transactions_df may be None when an already encoded BasketMatrix is
+        passed as binary_matrix (see from_csv).
+
+        cache may be a ResultCache or a directory path; the encoded matrix,
+        itemsets and rules are then persisted there, keyed by a content hash
+        of the transactions plus the parameters of each stage.
+
+        Every pipeline stage is timed into profile, a PipelineProfile
+        (created if not given; pass PipelineProfile(memory='tracemalloc') for
+        exact per-stage memory).
         """
         self.transactions_df = transactions_df
-        self.binary_matrix = None
+        self.binary_matrix = binary_matrix
         self.frequent_itemsets = None
         self.rules = None
+        self.cache = cache if cache is None or isinstance(cache, ResultCache) else ResultCache(cache)
+        self._lattice = None
+        self._min_support = None
+        self._min_confidence = None
+        self._min_lift = None
+        self._miner = None
+        self._pending = []
+        self._encoded = None
+        self._fingerprint = None
+        self._itemset_pool = None
+        self._rule_pool = None
+        self._top_rules_pool = None
+        self._cooccurrence = None
+        self.windowed = None
+        self._windowed_key = None
+        self._date_format = None
+        self.preprocess_report = None
+        self.top_rules_search = None
+        self._layouts = None
+        self._rule_store = None
+        self._approximate = False
+        self.sample_report = None
+        self.taxonomy_report = None
+        self.profile = profile if profile is not None else PipelineProfile()
+
+        if self.transactions_df is None:
+            if not isinstance(binary_matrix, BasketMatrix):
+                raise ValueError("Provide transactions_df or an encoded BasketMatrix")
+            return
 
         required_columns = ['transaction_id', 'product_id']
         for col in required_columns:
             if col not in self.transactions_df.columns:
                 raise ValueError(f"Missing required column: {col}")
-        
-    def preprocess_data(self):
-        """Clean and preprocess the transaction data"""
-        self.transactions_df = self.transactions_df.drop_duplicates()
-        
-        self.transactions_df = self.transactions_df.dropna(subset=['transaction_id', 'product_id'])
 
-        if 'timestamp' in self.transactions_df.columns:
-            self.transactions_df['timestamp'] = pd.to_datetime(self.transactions_df['timestamp'])
-            
+    @classmethod
+    def from_csv(cls, path, chunksize=1_000_000, cache=None, profile=None, **kwargs):
+        """
+        Build an analyzer by streaming a CSV file into a sparse basket matrix.
+
+        The file is read in chunks of chunksize rows, deduplicated, stripped of
+        nulls and integer-encoded on the fly, so the raw transactions are never
+        held in memory at once. transactions_df stays None; everything else
+        works from the encoded baskets; customer and date aggregates come from
+        BasketMatrix.summary and its row counts become preprocess_report. Extra keyword arguments go to
+        BasketMatrix.from_csv.
+
+        With a cache, the encoded matrix is stored under a hash of the raw
+        file bytes and reused the next time the same file is loaded.
+        """
+        if cache is not None and not isinstance(cache, ResultCache):
+            cache = ResultCache(cache)
+        profile = profile if profile is not None else PipelineProfile()
+
+        with profile.stage('from_csv', chunksize=chunksize) as record:
+            basket_matrix = None
+            if cache is not None:
+                fingerprint = fingerprint_file(path)
+                key = cache.make_key(fingerprint, 'csv', **kwargs)
+                basket_matrix = cache.get_matrix(key)
+
+            if basket_matrix is None:
+                basket_matrix = BasketMatrix.from_csv(path, chunksize=chunksize, **kwargs)
+                if cache is not None:
+                    cache.put_matrix(key, basket_matrix)
+            record.sizes.update(baskets=basket_matrix.n_baskets, items=basket_matrix.n_products,
+                                density=basket_matrix.density)
+
+        analyzer = cls(None, binary_matrix=basket_matrix, cache=cache, profile=profile)
+        analyzer.preprocess_report = {
+            name: value for name, value in basket_matrix.summary.items()
+            if name not in ('unique_customers', 'date_range')
+        } or None
+        if cache is not None:
+            analyzer._fingerprint = fingerprint
+        return analyzer
+
+    @profiled('preprocess_data')
+    def preprocess_data(self, date_format=None):
+        """
+        Clean and preprocess the transaction data.
+
+        Rows missing a transaction or product and repeated (transaction,
+        product) pairs are dropped in one pass, product ids become a
+        categorical and timestamp is parsed (pass date_format, e.g.
+        '%d/%m/%Y', to skip format inference). The rows dropped at each step
+        are kept in self.preprocess_report.
+        """
+        if self.transactions_df is None:
+            return
+
+        self._date_format = date_format
+        self.transactions_df, self.preprocess_report = clean_transactions(
+            self.transactions_df, date_format=date_format
+        )
+        self._data_changed()
+
+    def _data_changed(self):
+        """Forget everything derived from the previous version of the data"""
+        self._fingerprint = None
+        self._itemset_pool = None
+        self._rule_pool = None
+        self._top_rules_pool = None
+        self._cooccurrence = None
+
+    def _profile_sizes(self):
+        """Sizes of everything built so far, recorded after each stage"""
+        sizes = {}
+        if self.transactions_df is not None:
+            sizes['rows'] = len(self.transactions_df)
+        basket_matrix = None
+        if isinstance(self.binary_matrix, BasketMatrix):
+            basket_matrix = self.binary_matrix
+        elif self._encoded is not None and self._encoded[0] is self.binary_matrix:
+            basket_matrix = self._encoded[1]
+        if basket_matrix is not None:
+            sizes.update(baskets=basket_matrix.n_baskets, items=basket_matrix.n_products,
+                         density=basket_matrix.density)
+        if self.frequent_itemsets is not None:
+            sizes['itemsets'] = len(self.frequent_itemsets)
+        if self.rules is not None:
+            sizes['rules'] = len(self.rules)
+        return sizes
+
+    def _cache_key(self, stage, **params):
+        """Cache key for a stage of the pipeline on the current data"""
+        if self._fingerprint is None:
+            if self.transactions_df is not None:
+                self._fingerprint = fingerprint_transactions(self.transactions_df)
+            else:
+                self._fingerprint = fingerprint_matrix(self._basket_matrix())
+        return self.cache.make_key(self._fingerprint, stage, **params)
+
     def generate_insights(self):
         """Generate basic statistics and insights about the dataset"""
-        insights = {
-            'total_transactions': self.transactions_df['transaction_id'].nunique(),
-            'unique_products': self.transactions_df['product_id'].nunique(),
-            'avg_basket_size': self.transactions_df.groupby('transaction_id')['product_id'].count().mean()
-        }
+        if isinstance(self.binary_matrix, BasketMatrix):
+            basket_sizes = self.binary_matrix.basket_sizes()
+            insights = {
+                'total_transactions': self.binary_matrix.n_baskets,
+                'unique_products': int(np.count_nonzero(self.binary_matrix.item_counts())),
+                'avg_basket_size': basket_sizes.mean() if len(basket_sizes) else 0.0
+            }
+        else:
+            insights = {
+                'total_transactions': self.transactions_df['transaction_id'].nunique(),
+                'unique_products': self.transactions_df['product_id'].nunique(),
+                'avg_basket_size': self.transactions_df.groupby('transaction_id')['product_id'].count().mean()
+            }
         
+        if self.transactions_df is None:
+            if isinstance(self.binary_matrix, BasketMatrix):
+                summary = self.binary_matrix.summary
+                insights.update((name, summary[name]) for name in ('unique_customers', 'date_range')
+                                if name in summary)
+            return insights
+
         if 'customer_id' in self.transactions_df.columns:
             insights['unique_customers'] = self.transactions_df['customer_id'].nunique()
         
@@ -52,110 +207,536 @@ class MarketBasketAnalyzer:
             
         return insights
     
-    def create_binary_matrix(self):
-        """Convert transactions into a binary matrix format"""
-        transactions_grouped = self.transactions_df.groupby('transaction_id')['product_id'].agg(list)
-    
-        te = TransactionEncoder()
-        te_ary = te.fit(transactions_grouped).transform(transactions_grouped)
+    @profiled('create_binary_matrix')
+    def create_binary_matrix(self, sparse=False):
+        """
+        Convert transactions into a binary matrix format.
+
+        With sparse=True the result is a BasketMatrix (scipy CSR plus product
+        vocabulary) instead of a dense boolean DataFrame, so memory grows with
+        the number of purchased items rather than baskets x products.
+        """
+        if self.transactions_df is None:
+            basket_matrix = self._basket_matrix()
+        elif self.cache is not None:
+            key = self._cache_key('matrix')
+            basket_matrix = self.cache.get_matrix(key)
+            if basket_matrix is None:
+                basket_matrix = BasketMatrix.from_transactions(self.transactions_df)
+                self.cache.put_matrix(key, basket_matrix)
+        else:
+            basket_matrix = BasketMatrix.from_transactions(self.transactions_df)
 
-        self.binary_matrix = pd.DataFrame(te_ary, columns=te.columns_)
+        self._set_basket_matrix(basket_matrix, sparse)
+        self._miner = None
+        self._itemset_pool = None
+        self._rule_pool = None
+        self._cooccurrence = None
         return self.binary_matrix
-    
-    def find_frequent_itemsets(self, min_support=0.01):
-        """Apply Apriori algorithm to find frequent itemsets"""
+
+    def _set_basket_matrix(self, basket_matrix, sparse):
+        if sparse:
+            self.binary_matrix = basket_matrix
+        else:
+            self.binary_matrix = pd.DataFrame(
+                basket_matrix.matrix.toarray(),
+                columns=basket_matrix.products
+            )
+        # Keep the encoding (with its transaction ids) next to a dense matrix.
+        self._encoded = (self.binary_matrix, basket_matrix)
+
+    def _basket_matrix(self):
+        """Return the binary matrix as a BasketMatrix, whatever its representation"""
         if self.binary_matrix is None:
             self.create_binary_matrix()
-            
-        self.frequent_itemsets = apriori(
-            self.binary_matrix,
-            min_support=min_support,
-            use_colnames=True
-        )
+        if isinstance(self.binary_matrix, BasketMatrix):
+            return self.binary_matrix
+        if self._encoded is not None and self._encoded[0] is self.binary_matrix:
+            return self._encoded[1]
+        return BasketMatrix.from_dense(self.binary_matrix)
+
+    @profiled('find_frequent_itemsets')
+    def find_frequent_itemsets(self, min_support=0.01, algorithm='apriori', n_jobs=None,
+                               sample=None, approximate=False, verify=False, confidence=0.95, seed=None):
+        """
+        Find frequent itemsets.
+
+        algorithm selects the mining engine: 'apriori' (mlxtend), the native
+        'fpgrowth' or 'eclat' engines working on integer-coded baskets, or
+        'auto' to pick a native engine from the matrix density and catalog
+        size. Every engine returns the same support/itemsets frame.
+
+        n_jobs > 1 (or -1 for all cores) shards the baskets across a process
+        pool with SON partition mining plus a global verification pass; the
+        result is identical to the single-process run. Matrices below
+        parallel.SON_MIN_WORK (baskets x stored items) are still mined in
+        one process, where the pool would only add overhead.
+
+        approximate=True (or passing sample, a fraction or a basket count)
+        mines a random sample of baskets at a lowered threshold instead, with
+        a native engine. The frame then has support_lower and support_upper
+        columns holding a per-itemset confidence interval. verify=True counts
+        the candidates in one pass over the full data, making supports exact.
+        Details of the run are kept in sample_report; see sample_itemsets.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}. Choose from {ALGORITHMS}")
+        if self.binary_matrix is None:
+            self.create_binary_matrix()
+        self._min_support = min_support
+        self._miner = None
+        self._approximate = False
+        self.sample_report = None
+
+        if approximate or sample is not None:
+            lattice, lower, upper, self.sample_report = sample_itemsets(
+                self._basket_matrix(), min_support, sample=sample, verify=verify, algorithm=algorithm,
+                confidence=confidence, seed=seed
+            )
+            self._approximate = not self.sample_report['complete']
+            self._lattice = lattice
+            self.frequent_itemsets = lattice.to_frame()
+            if not self._approximate:
+                self._remember_itemsets()
+            self.frequent_itemsets = self.frequent_itemsets.assign(support_lower=lower, support_upper=upper)
+            return self.frequent_itemsets
+
+        if self._reuse_itemsets(min_support):
+            return self.frequent_itemsets
+
+        key = cached = None
+        if self.cache is not None:
+            # One entry per data version: the lowest-support lattice mined so
+            # far, which answers every higher threshold in a new analyzer too.
+            key = self._cache_key('itemsets')
+            cached = self.cache.get_itemsets(key)
+            if cached is not None:
+                if self._itemset_pool is None or cached.min_count < self._itemset_pool[0].min_count:
+                    self._itemset_pool = (cached, cached.to_frame())
+                if self._reuse_itemsets(min_support):
+                    return self.frequent_itemsets
+
+        if resolve_n_jobs(n_jobs) > 1:
+            self._lattice = son_itemsets(
+                self._basket_matrix(), min_support, algorithm=algorithm, n_jobs=n_jobs
+            )
+            self.frequent_itemsets = self._lattice.to_frame()
+        elif algorithm == 'apriori':
+            # mlxtend is only imported when its engines are asked for.
+            from mlxtend.frequent_patterns import apriori
+
+            if isinstance(self.binary_matrix, BasketMatrix):
+                binary_matrix = self.binary_matrix.to_dataframe(sparse_frame=True)
+            else:
+                binary_matrix = self.binary_matrix
+
+            self.frequent_itemsets = apriori(
+                binary_matrix,
+                min_support=min_support,
+                use_colnames=True
+            )
+            self._lattice = None
+        else:
+            self._lattice = mine_itemsets(self._basket_matrix(), min_support, algorithm=algorithm)
+            self.frequent_itemsets = self._lattice.to_frame()
+
+        if key is not None and (cached is None or self._itemset_lattice().min_count < cached.min_count):
+            self.cache.put_itemsets(key, self._itemset_lattice())
+        self._remember_itemsets()
+        return self.frequent_itemsets
+
+    def _reuse_itemsets(self, min_support):
+        """
+        Answer a min_support query from the lowest-support lattice mined so far.
+
+        Raising the threshold only drops itemsets, so a lattice mined at a lower
+        support already holds the exact answer; it is filtered instead of
+        mined again.
+        """
+        if self._itemset_pool is None:
+            return False
+        lattice, frame = self._itemset_pool
+        min_count = min_count_for_support(min_support, lattice.n_baskets)
+        if min_count < lattice.min_count:
+            return False
+
+        keep = lattice.counts >= min_count
+        self._lattice = lattice.take(np.flatnonzero(keep))
+        self._lattice.min_count = min_count
+        self.frequent_itemsets = frame[keep].reset_index(drop=True)
+        return True
+
+    def _remember_itemsets(self):
+        lattice = self._itemset_lattice()
+        if self._itemset_pool is None or lattice.min_count < self._itemset_pool[0].min_count:
+            self._itemset_pool = (lattice, self.frequent_itemsets)
+
+    def _itemset_lattice(self):
+        """Return the frequent itemsets as an integer-coded ItemsetLattice"""
+        if self._lattice is None:
+            basket_matrix = self._basket_matrix()
+            self._lattice = ItemsetLattice.from_frame(
+                self.frequent_itemsets,
+                basket_matrix.n_baskets,
+                basket_matrix.products,
+                min_count_for_support(self._min_support or 0.0, basket_matrix.n_baskets)
+            )
+        return self._lattice
+
+    def add_transactions(self, transactions_df):
+        """
+        Queue newly arrived transactions for the next update() call.
+
+        The new rows must belong to new baskets (unseen transaction_id values).
+        """
+        for col in ['transaction_id', 'product_id']:
+            if col not in transactions_df.columns:
+                raise ValueError(f"Missing required column: {col}")
+        self._pending.append(transactions_df)
+        return self
+
+    @profiled('update')
+    def update(self):
+        """
+        Fold queued transactions into the itemsets and rules incrementally.
+
+        Per-itemset counts for the frequent itemsets and their negative border
+        are kept between calls, so only the new baskets are counted. The full
+        data is rescanned only when a border itemset becomes frequent. Rules
+        are regenerated from the updated itemsets with the last confidence.
+        """
+        if self.frequent_itemsets is None:
+            raise ValueError("Must find frequent itemsets before updating")
+        if self._approximate:
+            raise ValueError("Incremental updates need exact itemsets; mine without sampling or with verify=True")
+        if not self._pending:
+            return self.frequent_itemsets
+
+        new_transactions, _ = clean_transactions(pd.concat(self._pending, ignore_index=True),
+                                                 date_format=self._date_format)
+        self._pending = []
+
+        basket_matrix = self._basket_matrix()
+        if self._miner is None:
+            self._miner = IncrementalMiner.from_lattice(
+                self._itemset_lattice(), basket_matrix, self._min_support or 0.0
+            )
+
+        combined, delta = basket_matrix.append(new_transactions)
+        self._set_basket_matrix(combined, isinstance(self.binary_matrix, BasketMatrix))
+        self._data_changed()
+        if self.transactions_df is not None:
+            self.transactions_df = pd.concat([self.transactions_df, new_transactions], ignore_index=True)
+
+        self._miner.update(delta, combined)
+        self._lattice = self._miner.lattice(combined.products)
+        self.frequent_itemsets = self._lattice.to_frame()
+        self._remember_itemsets()
+
+        if self.rules is not None:
+            self.generate_rules(self._min_confidence, self._min_lift)
         return self.frequent_itemsets
     
-    def generate_rules(self, min_confidence=0.5):
-        """Generate association rules from frequent itemsets"""
+    @profiled('generate_rules')
+    def generate_rules(self, min_confidence=0.5, min_lift=None, engine='native'):
+        """
+        Generate association rules from frequent itemsets.
+
+        The default 'native' engine works on integer-coded itemsets and
+        computes every metric in batched NumPy, pruning by min_confidence and
+        min_lift in one pass. engine='mlxtend' uses mlxtend's
+        association_rules instead.
+        """
         if self.frequent_itemsets is None:
             raise ValueError("Must find frequent itemsets before generating rules")
-            
-        self.rules = association_rules(
-            self.frequent_itemsets,
-            metric="confidence",
-            min_threshold=min_confidence
-        )
+        if engine not in ('native', 'mlxtend'):
+            raise ValueError(f"Unknown rule engine: {engine}")
+        self._min_confidence = min_confidence
+        self._min_lift = min_lift
+
+        if engine == 'native' and self._reuse_rules(min_confidence, min_lift):
+            return self.rules
+
+        key = None
+        if self.cache is not None and not self._approximate:
+            key = self._cache_key(
+                'rules', min_support=self._min_support, min_confidence=min_confidence,
+                min_lift=min_lift, engine=engine
+            )
+            cached = self.cache.get_rule_store(key)
+            if cached is not None:
+                self._set_rule_store(cached)
+                if engine == 'native':
+                    self._remember_rules(min_confidence, min_lift)
+                return self.rules
+
+        if engine == 'native':
+            # The store is built from the code arrays directly; the frame is
+            # decoded from it, so rule_store() never re-encodes the rules.
+            self._set_rule_store(RuleStore.from_lattice(
+                self._itemset_lattice(),
+                min_confidence=min_confidence,
+                min_lift=min_lift
+            ))
+        else:
+            from mlxtend.frequent_patterns import association_rules
+
+            self.rules = association_rules(
+                self.frequent_itemsets,
+                metric="confidence",
+                min_threshold=min_confidence
+            )
+            if min_lift is not None:
+                self.rules = self.rules[self.rules['lift'] >= min_lift].reset_index(drop=True)
+
+        if key is not None:
+            self.cache.put_rule_store(key, self.rule_store())
+        if engine == 'native':
+            self._remember_rules(min_confidence, min_lift)
         return self.rules
-    
-    def plot_product_frequency(self, top_n=20):
-        """Plot top N most frequent products"""
-        plt.figure(figsize=(12, 6))
-        product_freq = self.transactions_df['product_id'].value_counts().head(top_n)
-        sns.barplot(x=product_freq.values, y=product_freq.index)
-        plt.title(f'Top {top_n} Most Frequent Products')
-        plt.xlabel('Frequency')
-        plt.ylabel('Product ID')
-        return plt
-    
-    def plot_association_heatmap(self, top_n=20):
-        """Create a heatmap of product co-occurrences"""
+
+    def _reuse_rules(self, min_confidence, min_lift):
+        """
+        Answer a rules query by filtering rules generated with looser thresholds.
+
+        A rule's support is its itemset's support, so rules generated from a
+        lower-support lattice at a lower confidence/lift contain the exact
+        answer for any stricter combination of the three thresholds.
+        """
+        if self._rule_pool is None or self._approximate:
+            return False
+        min_count, pool_confidence, pool_lift, rules, store = self._rule_pool
+        lattice = self._itemset_lattice()
+        if lattice.min_count < min_count or min_confidence < pool_confidence:
+            return False
+        if pool_lift is not None and (min_lift is None or min_lift < pool_lift):
+            return False
+
+        keep = (rules['support'].to_numpy() >= lattice.min_count / max(lattice.n_baskets, 1)) & \
+            (rules['confidence'].to_numpy() >= min_confidence)
+        if min_lift is not None:
+            keep &= rules['lift'].to_numpy() >= min_lift
+        self.rules = rules[keep].reset_index(drop=True)
+        self._rule_store = (self.rules, store.take(np.flatnonzero(keep)))
+        return True
+
+    def _remember_rules(self, min_confidence, min_lift):
+        if self._approximate:
+            return
+        self._rule_pool = (self._itemset_lattice().min_count, min_confidence, min_lift, self.rules,
+                           self.rule_store())
+
+    def _set_rule_store(self, store):
+        self.rules = store.to_frame()
+        self._rule_store = (self.rules, store)
+
+    @profiled('find_top_rules')
+    def find_top_rules(self, k=100, metric='lift', min_confidence=0.0, min_count=2, max_len=None,
+                       max_itemsets=200_000, time_limit=None, algorithm='fpgrowth'):
+        """
+        Find the k best rules by metric without guessing min_support.
+
+        The support threshold starts high and is lowered until k rules are
+        found (metric='support') or the itemset/time budget would be
+        exceeded, while the k-th best confidence or lift is used as the rule
+        threshold of later rounds. See top_k_rules. The thresholds reached
+        are stored in top_rules_search; frequent_itemsets holds the last
+        lattice and rules the top k.
+
+        The last search is kept, so repeating the same query (as every
+        dashboard rerun does) returns it without searching again.
+        """
         if self.binary_matrix is None:
             self.create_binary_matrix()
-
-        cooc_matrix = self.binary_matrix.T.dot(self.binary_matrix)
-        
-        plt.figure(figsize=(12, 10))
-        sns.heatmap(
-            cooc_matrix.iloc[:top_n, :top_n],
-            annot=True,
-            cmap='YlOrRd',
-            fmt='g'
-        )
-        plt.title('Product Co-occurrence Heatmap')
-        return plt
+        basket_matrix = self._basket_matrix()
+        key = (k, metric, min_confidence, min_count, max_len, max_itemsets, time_limit, algorithm)
+        pool = self._top_rules_pool
+        if pool is not None and pool[0] is basket_matrix and pool[1] == key:
+            rules, lattice, search = pool[2:]
+        else:
+            rules, lattice, search = top_k_rules(
+                basket_matrix, k=k, metric=metric, min_confidence=min_confidence,
+                min_count=min_count, max_len=max_len, max_itemsets=max_itemsets,
+                time_limit=time_limit, algorithm=algorithm
+            )
+            self._top_rules_pool = (basket_matrix, key, rules, lattice, search)
+        self._min_support = search['min_support']
+        self._approximate = False
+        self._miner = None
+        self._lattice = lattice
+        self.frequent_itemsets = lattice.to_frame()
+        if max_len is None:
+            # A length-capped lattice cannot answer later exact queries.
+            self._remember_itemsets()
+        self._min_confidence = min_confidence
+        self._min_lift = None
+        self.rules = rules
+        self.top_rules_search = search
+        return self.rules
     
-    def create_network_graph(self, min_confidence=0.5, min_lift=1.0):
-        """Create a network graph of product associations"""
-        if self.rules is None:
-            self.generate_rules(min_confidence)
-            
-        G = nx.Graph()
+    def cooccurrence(self):
+        """Sparse co-occurrence index over the current basket matrix"""
+        basket_matrix = self._basket_matrix()
+        if self._cooccurrence is None or self._cooccurrence.basket_matrix is not basket_matrix:
+            self._cooccurrence = CooccurrenceIndex(basket_matrix)
+        return self._cooccurrence
 
-        filtered_rules = self.rules[
-            (self.rules['confidence'] >= min_confidence) &
-            (self.rules['lift'] >= min_lift)
-        ]
-        
-        if filtered_rules.empty:
-            plt.figure(figsize=(8, 6))
-            plt.text(0.5, 0.5, "No associations meet the criteria", 
-                     horizontalalignment='center', verticalalignment='center',
-                     fontsize=14)
-            plt.gca().set_axis_off()
-            return plt
-
-        for _, rule in filtered_rules.iterrows():
-            antecedents = list(rule['antecedents'])[0]
-            consequents = list(rule['consequents'])[0]
-            G.add_edge(
-                antecedents,
-                consequents,
-                weight=rule['lift'],
-                confidence=rule['confidence']
+    def top_partners(self, product, k=10, metric='count'):
+        """Top-k products bought together with product (see CooccurrenceIndex)"""
+        return self.cooccurrence().top_partners(product, k=k, metric=metric)
+
+    @profiled('mine_windows')
+    def mine_windows(self, freq='M', window=1, step=1, min_support=0.01, min_confidence=0.5,
+                     min_lift=None, time_column='timestamp', algorithm='fpgrowth', max_len=None,
+                     date_format=None):
+        """
+        Mine rules per time window (see WindowedCounts).
+
+        Baskets are dated by their earliest timestamp and assigned once to
+        freq partitions ('D', 'W', 'M', ...). Windows span window consecutive
+        partitions and move by step, so window=1 gives calendar periods and
+        window=3, step=1 a three-period sliding window. The partition counts
+        are kept in self.windowed and reused by later calls with the same
+        freq and a support at least as strict; self.windowed.support_trend
+        tracks one itemset over time.
+
+        A time_column that is not parsed yet goes through parse_dates with
+        date_format, which defaults to the one given to preprocess_data; pass
+        it for day-first dates such as '%d/%m/%Y'. Baskets whose timestamp
+        cannot be parsed are left out of every window and counted in
+        self.windowed.undated_baskets.
+
+        Partitions holding only a few baskets make min_support a very small
+        count, so nearly every subset of their baskets is frequent; use a
+        coarser freq or max_len there.
+
+        Returns:
+            DataFrame with window_start, window_end and window_baskets
+            followed by the usual rule columns
+        """
+        if self.transactions_df is None or time_column not in self.transactions_df.columns:
+            raise ValueError(f"Windowed mining needs a {time_column} column")
+
+        if date_format is None:
+            date_format = self._date_format
+        basket_matrix = self._basket_matrix()
+        key = (freq, time_column, algorithm, max_len, date_format)
+        reusable = (
+            self.windowed is not None and self._windowed_key == (key, basket_matrix)
+            and self.windowed.min_support <= min_support
+        )
+        if not reusable:
+            times = parse_dates(self.transactions_df[time_column], date_format)
+            basket_times = times.groupby(self.transactions_df['transaction_id']).min()
+            self.windowed = WindowedCounts.build(
+                basket_matrix, basket_times.reindex(basket_matrix.transactions),
+                freq=freq, min_support=min_support, algorithm=algorithm, max_len=max_len
             )
-        
-        plt.figure(figsize=(12, 12))
-        pos = nx.spring_layout(G)
-        nx.draw(
-            G,
-            pos,
-            with_labels=True,
-            node_color='lightblue',
-            node_size=1000,
-            font_size=8,
-            width=[G[u][v]['weight'] for u, v in G.edges()]
+            self._windowed_key = (key, basket_matrix)
+
+        return self.windowed.rules(window, step, min_support=min_support,
+                                   min_confidence=min_confidence, min_lift=min_lift)
+
+    @profiled('mine_by')
+    def mine_by(self, segment_column, min_support=0.01, min_confidence=0.5, min_lift=None,
+                algorithm='fpgrowth', n_jobs=-1, min_baskets=1, max_len=None):
+        """
+        Mine rules separately for every segment (customer cohort, store, ...).
+
+        Each basket belongs to the segment of its first row. The baskets are
+        encoded once; their rows are regrouped so every segment is a
+        contiguous slice of the shared sparse matrix, and the slices are
+        mined concurrently in a process pool (see segment_itemsets), each at
+        its own min_support. Segments with fewer than min_baskets baskets are
+        skipped: a handful of baskets makes nearly every subset frequent.
+
+        Returns:
+            DataFrame with segment and segment_baskets followed by the usual
+            rule columns, segments in sorted order
+        """
+        if self.transactions_df is None or segment_column not in self.transactions_df.columns:
+            raise ValueError(f"Missing segment column: {segment_column}")
+
+        basket_matrix = self._basket_matrix()
+        labels = self.transactions_df.groupby('transaction_id')[segment_column].first()
+        codes, segments = pd.factorize(labels.reindex(basket_matrix.transactions), sort=True)
+
+        sizes = np.bincount(codes[codes >= 0], minlength=len(segments))
+        keep = np.flatnonzero(sizes >= max(min_baskets, 1))
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        bounds = [(int(starts[code]), int(starts[code] + sizes[code])) for code in keep]
+
+        grouped = BasketMatrix(basket_matrix.matrix[order], basket_matrix.products,
+                               basket_matrix.transactions[order])
+        lattices = segment_itemsets(grouped, bounds, min_support, algorithm=algorithm,
+                                    n_jobs=n_jobs, max_len=max_len)
+
+        frames = []
+        for code, lattice in zip(keep, lattices):
+            rules = rules_from_lattice(lattice, min_confidence=min_confidence, min_lift=min_lift)
+            if rules.empty:
+                continue
+            rules.insert(0, 'segment', segments[code])
+            rules.insert(1, 'segment_baskets', lattice.n_baskets)
+            frames.append(rules)
+
+        if not frames:
+            return pd.DataFrame(columns=['segment', 'segment_baskets'] + RULE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    @profiled('mine_taxonomy')
+    def mine_taxonomy(self, taxonomy, min_support=0.01, min_confidence=0.5, min_lift=None,
+                      item_support=None, max_categories=1, max_len=None):
+        """
+        Mine generalized rules over products and their categories.
+
+        taxonomy is a Taxonomy, an item -> category mapping, or the name of
+        a category column of the transactions. Categories are mined at
+        min_support and anything with a product at item_support, so a low
+        min_support finds broad category patterns without the item-level
+        explosion. Descendants of infrequent categories are never counted;
+        see taxonomy_itemsets. Counts of the search are kept in
+        taxonomy_report.
+
+        Returns:
+            DataFrame with the usual rule columns plus level ('item',
+            'category' or 'cross')
+        """
+        if isinstance(taxonomy, str):
+            if self.transactions_df is None or taxonomy not in self.transactions_df.columns:
+                raise ValueError(f"Missing category column: {taxonomy}")
+            taxonomy = Taxonomy.from_frame(self.transactions_df, 'product_id', taxonomy)
+        elif not isinstance(taxonomy, Taxonomy):
+            taxonomy = Taxonomy(taxonomy)
+
+        lattice, self.taxonomy_report = taxonomy_itemsets(
+            self._basket_matrix(), taxonomy, min_support, item_support=item_support,
+            max_categories=max_categories, max_len=max_len
         )
-        return plt
-    
+        return taxonomy_rules(lattice, taxonomy, min_confidence=min_confidence, min_lift=min_lift)
+
+    def build_rule_index(self, rank_by='lift'):
+        """Compile the current rules into a RuleIndex for serving recommendations"""
+        if self.rules is None:
+            raise ValueError("Generate rules first using generate_rules()")
+        return RuleIndex.from_rules(self.rules, self._itemset_lattice().products, rank_by=rank_by)
+
+    def rule_store(self):
+        """
+        The current rules as a columnar RuleStore.
+
+        Built once per rules frame, so sorting, top-k, display and export
+        after a rerun reuse the same code arrays.
+        """
+        if self.rules is None:
+            raise ValueError("Generate rules first using generate_rules()")
+        if self._rule_store is None or self._rule_store[0] is not self.rules:
+            store = RuleStore.from_frame(self.rules, self._itemset_lattice().products)
+            self._rule_store = (self.rules, store)
+        return self._rule_store[1]
+
     def generate_report(self):
         """Generate a comprehensive analysis report"""
         insights = self.generate_insights()
@@ -203,5 +784,13 @@ Total Rules Generated: {len(self.rules) if self.rules is not None else 0}
                 consequent = ', '.join(list(rule['consequents']))
                 report += f"{i}. Consider bundling {antecedent} with {consequent} "
                 report += f"(Confidence: {rule['confidence']:.2%}, Lift: {rule['lift']:.2f})\n"
-        
+
+        if len(self.profile):
+            report += f"""
+4. Performance
+--------------
+Total Time: {self.profile.total_seconds:.3f} s (memory: {self.profile.memory or 'not tracked'})
+{self.profile.summary()}
+"""
+
         return report
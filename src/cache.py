@@ -0,0 +1,151 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from .encoding import BasketMatrix
+from .mining import ItemsetLattice
+from .rulestore import RuleStore
+
+_HASH_BLOCK = 1 << 20
+
+
+def fingerprint_transactions(transactions_df, columns=('transaction_id', 'product_id')):
+    """Content hash of the basket columns of a transactions DataFrame"""
+    digest = hashlib.sha1()
+    hashes = pd.util.hash_pandas_object(transactions_df[list(columns)], index=False)
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_matrix(basket_matrix):
+    """Content hash of an encoded BasketMatrix"""
+    digest = hashlib.sha1()
+    digest.update(basket_matrix.matrix.indptr.tobytes())
+    digest.update(basket_matrix.matrix.indices.tobytes())
+    for vocabulary in (basket_matrix.products, basket_matrix.transactions):
+        digest.update(pd.util.hash_pandas_object(vocabulary, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_file(path):
+    """
+    Content hash of a file path or seekable file-like object.
+
+    Hashing the raw bytes is much cheaper than parsing the CSV, so it is used
+    to key the encoded matrix of an uploaded file.
+    """
+    digest = hashlib.sha1()
+    if hasattr(path, 'read'):
+        position = path.tell()
+        for block in iter(lambda: path.read(_HASH_BLOCK), b''):
+            digest.update(block if isinstance(block, bytes) else block.encode())
+        path.seek(position)
+    else:
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded on-disk cache of encoded matrices, itemsets and rules.
+
+    Entries are uncompressed .npz files named by a hash of the data
+    fingerprint and the stage parameters, so a restarted process or a
+    repeated query loads them without recomputing. Reads refresh an entry's
+    modification time and writes evict the least recently used entries once
+    the directory grows past max_bytes.
+
+    Args:
+        directory: where entries are stored (created if missing)
+        max_bytes: total size budget for all entries
+    """
+
+    def __init__(self, directory='.mba_cache', max_bytes=1 << 30):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint, stage, **params):
+        payload = json.dumps({'fingerprint': fingerprint, 'stage': stage, 'params': params},
+                             sort_keys=True, default=str)
+        return f"{stage}-{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _read(self, key, loader):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                buffer = io.BytesIO(handle.read())
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        try:
+            return loader(buffer)
+        except (OSError, ValueError, KeyError):
+            # A truncated or stale entry is just a miss.
+            os.remove(path)
+            return None
+
+    def _write(self, key, saver, value, *args):
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                saver(temp_file, value, *args)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def size(self):
+        """Total bytes used by cache entries"""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        for _, _, name in self._entries():
+            os.remove(os.path.join(self.directory, name))
+
+    def get_matrix(self, key):
+        return self._read(key, BasketMatrix.load)
+
+    def put_matrix(self, key, basket_matrix):
+        self._write(key, lambda file, value: value.save(file), basket_matrix)
+
+    def get_itemsets(self, key):
+        return self._read(key, ItemsetLattice.load)
+
+    def put_itemsets(self, key, lattice):
+        self._write(key, lambda file, value: value.save(file), lattice)
+
+    def get_rule_store(self, key):
+        return self._read(key, RuleStore.load)
+
+    def put_rule_store(self, key, store):
+        self._write(key, lambda file, value: value.save(file), store)
@@ -0,0 +1,75 @@
+"""
+Mine association rules from a transaction CSV without Streamlit.
+
+    python -m src.cli "data/Groceries data.csv" --min-support 0.005 --output rules.parquet
+    python -m src.cli orders.csv --transaction-col order_id --top-k 100 --output top_rules.csv
+
+Only the headless analyzer core is imported; the plotting stack is never
+loaded. Rules go to --output (.parquet or .csv) or, without it, the ten
+strongest are printed.
+"""
+import argparse
+import sys
+import time
+
+from .analyzer import MarketBasketAnalyzer
+from .mining import ALGORITHMS
+from .topk import TOP_K_METRICS
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Mine association rules from a transaction CSV')
+    parser.add_argument('csv', help='transaction CSV, one (transaction, product) pair per row')
+    parser.add_argument('--transaction-col', default='transaction_id')
+    parser.add_argument('--product-col', default='product_id')
+    parser.add_argument('--min-support', type=float, default=0.01)
+    parser.add_argument('--min-confidence', type=float, default=0.5)
+    parser.add_argument('--min-lift', type=float)
+    parser.add_argument('--algorithm', default='auto', choices=ALGORITHMS)
+    parser.add_argument('--n-jobs', type=int, help='worker processes for SON mining (-1 for all cores)')
+    parser.add_argument('--sample', type=float, help='mine a basket sample (fraction or count)')
+    parser.add_argument('--verify', action='store_true', help='recount sampled itemsets on the full data')
+    parser.add_argument('--top-k', type=int, help='find the k best rules instead of using --min-support')
+    parser.add_argument('--metric', default='lift', choices=TOP_K_METRICS, help='ranking metric of --top-k')
+    parser.add_argument('--output', help='write rules to a .parquet or .csv file')
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help='CSV rows read at a time')
+    parser.add_argument('--profile', action='store_true', help='print per-stage timings')
+    return parser
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    args = build_parser().parse_args(argv)
+
+    analyzer = MarketBasketAnalyzer.from_csv(
+        args.csv, chunksize=args.chunksize,
+        transaction_col=args.transaction_col, product_col=args.product_col
+    )
+    if args.top_k is not None:
+        analyzer.find_top_rules(k=args.top_k, metric=args.metric, min_confidence=args.min_confidence)
+    else:
+        analyzer.find_frequent_itemsets(
+            min_support=args.min_support, algorithm=args.algorithm, n_jobs=args.n_jobs,
+            sample=args.sample, verify=args.verify
+        )
+        analyzer.generate_rules(min_confidence=args.min_confidence, min_lift=args.min_lift)
+
+    store = analyzer.rule_store()
+    if args.output is None:
+        print(store.display(store.top(10, 'lift')).to_string(index=False))
+    elif args.output.endswith('.parquet'):
+        store.to_parquet(args.output)
+    else:
+        store.to_csv(args.output)
+
+    basket_matrix = analyzer._basket_matrix()
+    print(f"{len(store):,} rules from {basket_matrix.n_baskets:,} baskets and "
+          f"{basket_matrix.n_products:,} products in {time.perf_counter() - started:.2f} s"
+          + (f" -> {args.output}" if args.output else ''), file=sys.stderr)
+    if args.profile:
+        print(analyzer.profile.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+PARTNER_METRICS = ('count', 'confidence', 'lift')
+
+
+class CooccurrenceIndex:
+    """
+    Sparse product co-occurrence queries over a BasketMatrix.
+
+    Pair counts are only ever computed for a subset of columns (the top-N
+    most frequent products, or the baskets holding one product), so the cost
+    follows the number of purchased items involved rather than catalog^2.
+    """
+
+    def __init__(self, basket_matrix):
+        self.basket_matrix = basket_matrix
+        self.item_counts = basket_matrix.item_counts()
+        self._csc = None
+        self._pair_counts = {}
+
+    def top_products(self, top_n=20):
+        """Codes of the top_n most frequent products, most frequent first"""
+        codes = np.arange(len(self.item_counts))
+        order = np.lexsort((codes, -self.item_counts))
+        return order[:top_n]
+
+    def pair_counts(self, top_n=20):
+        """
+        Co-occurrence counts among the top_n most frequent products.
+
+        Returns:
+            Square DataFrame indexed by product; the diagonal holds each
+            product's basket count
+        """
+        if top_n not in self._pair_counts:
+            codes = self.top_products(top_n)
+            columns = self.basket_matrix.matrix[:, codes].astype(np.int64)
+            names = self.basket_matrix.products[codes]
+            self._pair_counts[top_n] = pd.DataFrame(
+                (columns.T @ columns).toarray(), index=names, columns=names
+            )
+        return self._pair_counts[top_n]
+
+    def _baskets_with(self, code):
+        if self._csc is None:
+            self._csc = self.basket_matrix.matrix.tocsc()
+            self._csc.sort_indices()
+        return self._csc.indices[self._csc.indptr[code]:self._csc.indptr[code + 1]]
+
+    def top_partners(self, product, k=10, metric='count'):
+        """
+        Products most often bought together with product ("customers also bought").
+
+        Args:
+            product: product id
+            k: number of partners to return
+            metric: rank partners by 'count', 'confidence' (P(partner | product))
+                or 'lift'
+
+        Returns:
+            DataFrame with columns product, count, confidence, lift
+        """
+        if metric not in PARTNER_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Choose from {PARTNER_METRICS}")
+        code = self.basket_matrix.products.get_indexer([product])[0]
+        if code < 0:
+            raise KeyError(f"Unknown product: {product}")
+
+        matrix = self.basket_matrix.matrix
+        rows = self._baskets_with(code)
+        starts = matrix.indptr[rows]
+        lengths = matrix.indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        partners = matrix.indices[np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())]
+
+        counts = np.bincount(partners, minlength=len(self.item_counts))
+        counts[code] = 0
+        candidates = np.flatnonzero(counts)
+        counts = counts[candidates]
+
+        confidence = counts / max(len(rows), 1)
+        lift = confidence * self.basket_matrix.n_baskets / self.item_counts[candidates]
+        score = {'count': counts, 'confidence': confidence, 'lift': lift}[metric]
+
+        order = np.lexsort((candidates, -score))[:k]
+        return pd.DataFrame({
+            'product': self.basket_matrix.products[candidates[order]],
+            'count': counts[order],
+            'confidence': confidence[order],
+            'lift': lift[order],
+        })
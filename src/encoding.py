@@ -0,0 +1,421 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .preprocessing import factorize_sorted, infer_date_format, parse_dates
+
+
+SUMMARY_COUNTS = (
+    'unique_customers', 'rows_in', 'dropped_missing_keys', 'dropped_duplicates',
+    'unparsed_timestamps', 'rows_out'
+)
+
+
+def vocabulary_array(values):
+    """
+    Convert a vocabulary Index to a plain NumPy array for .npz storage.
+
+    Numeric ids keep their dtype; anything else is stored as unicode so the
+    file can be loaded without pickle.
+    """
+    array = pd.Index(values).to_numpy()
+    if array.dtype == object:
+        array = array.astype(str)
+    return array
+
+
+class BasketMatrix:
+    """
+    Sparse basket x product incidence matrix.
+
+    Rows are baskets (one per transaction_id) and columns are products. Only
+    the purchased (basket, product) pairs are stored, so memory grows with the
+    number of purchased items instead of baskets x catalog.
+
+    Attributes:
+        matrix: scipy.sparse CSR matrix of dtype bool with sorted indices
+        products: Index of product ids, position = column code
+        transactions: Index of transaction ids, position = row code
+        summary: aggregates of the source rows the matrix cannot hold
+            (unique_customers, date_range and the data-quality counts of
+            clean_transactions' report); only filled by from_csv
+    """
+
+    def __init__(self, matrix, products, transactions, summary=None):
+        matrix = sparse.csr_matrix(matrix, dtype=bool)
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        self.matrix = matrix
+        self.products = pd.Index(products)
+        self.transactions = pd.Index(transactions)
+        self.summary = dict(summary or {})
+
+        if self.matrix.shape != (len(self.transactions), len(self.products)):
+            raise ValueError("Matrix shape does not match the vocabularies")
+
+    @classmethod
+    def from_codes(cls, basket_codes, product_codes, products, transactions):
+        """
+        Build the matrix from parallel arrays of integer codes.
+
+        Duplicate (basket, product) pairs are collapsed, so callers can pass
+        raw encoded rows without deduplicating them first.
+        """
+        n_baskets = len(transactions)
+        n_products = len(products)
+
+        keys = np.unique(
+            np.asarray(basket_codes, dtype=np.int64) * n_products
+            + np.asarray(product_codes, dtype=np.int64)
+        )
+        rows = keys // max(n_products, 1)
+        indices = (keys - rows * n_products).astype(np.int32)
+        indptr = np.zeros(n_baskets + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_baskets), out=indptr[1:])
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=bool), indices, indptr),
+            shape=(n_baskets, n_products)
+        )
+        return cls(matrix, products, transactions)
+
+    @classmethod
+    def from_transactions(cls, transactions_df, transaction_col='transaction_id',
+                          product_col='product_id'):
+        """
+        Factorize transaction and product ids straight into integer codes.
+
+        Rows with a missing transaction or product are ignored. Both
+        vocabularies are sorted, so the column order matches mlxtend's
+        TransactionEncoder. Categorical columns reuse their codes.
+        """
+        basket_codes, transactions = factorize_sorted(transactions_df[transaction_col])
+        product_codes, products = factorize_sorted(transactions_df[product_col])
+
+        valid = (basket_codes >= 0) & (product_codes >= 0)
+        if not valid.all():
+            basket_codes = basket_codes[valid]
+            product_codes = product_codes[valid]
+
+        return cls.from_codes(basket_codes, product_codes, products, transactions)
+
+    @classmethod
+    def from_csv(cls, path, chunksize=1_000_000, transaction_col='transaction_id',
+                 product_col='product_id', customer_col='customer_id', time_col='timestamp',
+                 date_format=None, **read_csv_kwargs):
+        """
+        Stream a transaction CSV into a BasketMatrix in bounded memory.
+
+        Only the transaction and product columns are encoded, chunk by chunk.
+        Each chunk is cleaned (nulls dropped) and integer-encoded, so peak
+        memory is one raw chunk plus the encoded (basket, product) pairs.
+        When the file has customer or timestamp columns, the distinct
+        customers and the date range are aggregated on the way into
+        BasketMatrix.summary, together with the row counts of the cleaning.
+        Without date_format, the format of the first timestamp is used for
+        the whole file. A usecols in read_csv_kwargs is read in addition to
+        the transaction and product columns.
+
+        Args:
+            path: file path or file-like object accepted by pandas.read_csv
+            chunksize: number of CSV rows per chunk
+            transaction_col: column holding the basket id
+            product_col: column holding the product id
+            customer_col: optional column holding the customer id
+            time_col: optional column holding the transaction time
+            date_format: strftime format of time_col, see parse_dates
+            **read_csv_kwargs: passed through to pandas.read_csv
+
+        Returns:
+            BasketMatrix
+        """
+        encoder = StreamingBasketEncoder(transaction_col, product_col, customer_col, time_col, date_format)
+        usecols = read_csv_kwargs.pop('usecols', None)
+        if usecols is None:
+            columns = {transaction_col, product_col, customer_col, time_col}
+            selected = columns.__contains__
+        elif callable(usecols):
+            selected = lambda column: column in (transaction_col, product_col) or usecols(column)
+        else:
+            columns = {transaction_col, product_col, *usecols}
+            selected = columns.__contains__
+        reader = pd.read_csv(path, chunksize=chunksize, usecols=selected, **read_csv_kwargs)
+        for chunk in reader:
+            encoder.partial_fit(chunk)
+        return encoder.finish()
+
+    @classmethod
+    def from_dense(cls, binary_matrix):
+        """Convert a dense boolean DataFrame (baskets x products)"""
+        matrix = sparse.csr_matrix(binary_matrix.to_numpy(dtype=bool))
+        return cls(matrix, binary_matrix.columns, binary_matrix.index)
+
+    def append(self, transactions_df, transaction_col='transaction_id', product_col='product_id'):
+        """
+        Encode new baskets against this matrix's vocabularies.
+
+        Known products keep their codes and unseen products are appended to
+        the end of the vocabulary, so codes already stored elsewhere (mined
+        itemsets, rule indexes) stay valid.
+
+        Returns:
+            (combined, delta): the matrix with the new baskets appended, and
+            a matrix holding only the new baskets (same product vocabulary)
+        """
+        transactions_df = transactions_df.dropna(subset=[transaction_col, product_col])
+        if transactions_df[transaction_col].isin(self.transactions).any():
+            raise ValueError("New transactions reuse transaction ids that are already encoded")
+
+        basket_codes, new_transactions = pd.factorize(transactions_df[transaction_col], sort=True)
+        product_values = transactions_df[product_col]
+        unseen = pd.Index(pd.unique(product_values[self.products.get_indexer(product_values) < 0]))
+        if len(unseen):
+            try:
+                unseen = unseen.sort_values()
+            except TypeError:
+                pass
+        products = self.products.append(unseen)
+
+        delta = BasketMatrix.from_codes(
+            basket_codes, products.get_indexer(product_values), products, new_transactions
+        )
+        widened = sparse.csr_matrix(
+            (self.matrix.data, self.matrix.indices, self.matrix.indptr),
+            shape=(self.n_baskets, len(products))
+        )
+        combined = BasketMatrix(
+            sparse.vstack([widened, delta.matrix], format='csr'),
+            products,
+            self.transactions.append(new_transactions)
+        )
+        return combined, delta
+
+    def save(self, file):
+        """Write the CSR arrays, vocabularies and summary to an uncompressed .npz file"""
+        summary = {
+            name: np.array(self.summary[name], dtype=np.int64)
+            for name in SUMMARY_COUNTS if name in self.summary
+        }
+        if 'date_range' in self.summary:
+            summary['date_range'] = np.array(self.summary['date_range'], dtype='datetime64[ns]')
+        np.savez(
+            file,
+            indptr=self.matrix.indptr,
+            indices=self.matrix.indices,
+            shape=np.array(self.shape),
+            products=vocabulary_array(self.products),
+            transactions=vocabulary_array(self.transactions),
+            **summary
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Read a matrix written by save"""
+        with np.load(file) as data:
+            indices = data['indices']
+            matrix = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=bool), indices, data['indptr']),
+                shape=tuple(data['shape'])
+            )
+            summary = {name: int(data[name]) for name in SUMMARY_COUNTS if name in data.files}
+            if 'date_range' in data.files:
+                summary['date_range'] = tuple(pd.Timestamp(value) for value in data['date_range'])
+            return cls(matrix, data['products'], data['transactions'], summary)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def n_baskets(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_products(self):
+        return self.matrix.shape[1]
+
+    @property
+    def nnz(self):
+        return self.matrix.nnz
+
+    @property
+    def density(self):
+        cells = self.n_baskets * self.n_products
+        return self.nnz / cells if cells else 0.0
+
+    def __len__(self):
+        return self.n_baskets
+
+    def item_counts(self):
+        """Number of baskets containing each product"""
+        return np.bincount(self.matrix.indices, minlength=self.n_products)
+
+    def basket_sizes(self):
+        """Number of distinct products in each basket"""
+        return np.diff(self.matrix.indptr)
+
+    def item_support(self):
+        """Support of each product as a Series indexed by product id"""
+        n_baskets = max(self.n_baskets, 1)
+        return pd.Series(self.item_counts() / n_baskets, index=self.products)
+
+    def to_dataframe(self, sparse_frame=True):
+        """
+        Convert to a baskets x products boolean DataFrame.
+
+        With sparse_frame=True the result uses pandas sparse columns, which
+        mlxtend's apriori accepts without densifying the whole matrix.
+        """
+        if sparse_frame:
+            frame = pd.DataFrame.sparse.from_spmatrix(
+                self.matrix.astype(np.uint8), index=self.transactions, columns=self.products
+            )
+            return frame.astype(pd.SparseDtype(bool, False))
+        return pd.DataFrame(self.matrix.toarray(), index=self.transactions, columns=self.products)
+
+
+class _Vocabulary:
+    """Grow-only mapping from ids to dense integer codes"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, values):
+        """Encode a Series, only touching the dict once per distinct value"""
+        local_codes, uniques = pd.factorize(values)
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        for position, value in enumerate(uniques.tolist()):
+            code = self.codes.get(value)
+            if code is None:
+                code = len(self.values)
+                self.codes[value] = code
+                self.values.append(value)
+            lookup[position] = code
+        return lookup[local_codes]
+
+    def sorted_remap(self):
+        """
+        Return (sorted values, old code -> new code) so the final vocabulary
+        is ordered like the in-memory factorize path. Mixed, unorderable ids
+        keep their first-seen order.
+        """
+        values = pd.Index(self.values)
+        try:
+            order = values.argsort()
+        except TypeError:
+            order = np.arange(len(values))
+        remap = np.empty(len(values), dtype=np.int64)
+        remap[order] = np.arange(len(values))
+        return values[order], remap
+
+
+class StreamingBasketEncoder:
+    """
+    Incrementally encode transaction chunks into (basket, product) codes.
+
+    Call partial_fit for every chunk and finish once at the end. Pairs are
+    deduplicated per chunk and again globally in finish, so duplicate rows
+    spread across chunks are collapsed too. Chunks holding customer_col or
+    time_col also update the distinct customers and the first/last
+    timestamp. Those and the row counts (keyed like the report of
+    clean_transactions) are handed to BasketMatrix.summary by finish.
+    """
+
+    def __init__(self, transaction_col='transaction_id', product_col='product_id',
+                 customer_col=None, time_col=None, date_format=None):
+        self.transaction_col = transaction_col
+        self.product_col = product_col
+        self.customer_col = customer_col
+        self.time_col = time_col
+        self.date_format = date_format
+        self.transactions = _Vocabulary()
+        self.products = _Vocabulary()
+        self.customers = None
+        self.date_range = None
+        self.rows_in = 0
+        self.dropped_missing_keys = 0
+        self.unparsed_timestamps = 0
+        self.rows_out = None
+        self._pairs = []
+
+    def partial_fit(self, chunk):
+        for col in (self.transaction_col, self.product_col):
+            if col not in chunk.columns:
+                raise ValueError(f"Missing required column: {col}")
+
+        self.rows_in += len(chunk)
+        valid = chunk[self.transaction_col].notna() & chunk[self.product_col].notna()
+        if not valid.all():
+            self.dropped_missing_keys += int((~valid).sum())
+            chunk = chunk[valid]
+
+        if self.customer_col in chunk.columns:
+            if self.customers is None:
+                self.customers = set()
+            self.customers.update(chunk[self.customer_col].dropna().unique().tolist())
+        if self.time_col in chunk.columns:
+            values = chunk[self.time_col]
+            if self.date_format is None:
+                # Pin the first guess so later chunks cannot switch between
+                # day-first and month-first readings.
+                self.date_format = infer_date_format(values)
+            times = parse_dates(values, self.date_format)
+            self.unparsed_timestamps += int(times.isna().sum() - values.isna().sum())
+            self._update_date_range(times)
+
+        basket_codes = self.transactions.encode(chunk[self.transaction_col])
+        product_codes = self.products.encode(chunk[self.product_col])
+        self._pairs.append(np.unique((basket_codes << 32) | product_codes))
+        return self
+
+    def _update_date_range(self, times):
+        first, last = times.min(), times.max()
+        if pd.isna(first):
+            return
+        if self.date_range is not None:
+            first, last = min(first, self.date_range[0]), max(last, self.date_range[1])
+        self.date_range = (first, last)
+
+    def summary(self):
+        """
+        Aggregates seen so far: unique_customers and date_range keyed like
+        generate_insights, plus the row counts keyed like clean_transactions'
+        report (dropped_duplicates and rows_out only once finish has run).
+        """
+        summary = {
+            'rows_in': self.rows_in,
+            'dropped_missing_keys': self.dropped_missing_keys,
+            'unparsed_timestamps': self.unparsed_timestamps,
+        }
+        if self.rows_out is not None:
+            summary['dropped_duplicates'] = self.rows_in - self.dropped_missing_keys - self.rows_out
+            summary['rows_out'] = self.rows_out
+        if self.customers is not None:
+            summary['unique_customers'] = len(self.customers)
+        if self.date_range is not None:
+            summary['date_range'] = self.date_range
+        return summary
+
+    def finish(self):
+        """Build the BasketMatrix from every chunk seen so far"""
+        if self._pairs:
+            pairs = np.unique(np.concatenate(self._pairs))
+        else:
+            pairs = np.empty(0, dtype=np.int64)
+        self._pairs = [pairs]
+        self.rows_out = len(pairs)
+
+        transactions, basket_remap = self.transactions.sorted_remap()
+        products, product_remap = self.products.sorted_remap()
+        basket_matrix = BasketMatrix.from_codes(
+            basket_remap[pairs >> 32],
+            product_remap[pairs & 0xFFFFFFFF],
+            products,
+            transactions
+        )
+        basket_matrix.summary = self.summary()
+        return basket_matrix
@@ -0,0 +1,155 @@
+from collections import defaultdict
+
+from .mining import ItemsetLattice, count_itemsets, fpgrowth, min_count_for_support
+
+
+def candidate_join(frequent_k):
+    """
+    Apriori candidate generation for one level.
+
+    Joins sorted k-itemsets sharing their first k-1 items and keeps the
+    (k+1)-candidates whose every k-subset is frequent.
+
+    Args:
+        frequent_k: set of sorted tuples, all of the same length k
+
+    Returns:
+        List of sorted (k+1)-tuples
+    """
+    groups = defaultdict(list)
+    for itemset in frequent_k:
+        groups[itemset[:-1]].append(itemset[-1])
+
+    candidates = []
+    for prefix, last_items in groups.items():
+        last_items.sort()
+        for position, first in enumerate(last_items):
+            for second in last_items[position + 1:]:
+                candidate = prefix + (first, second)
+                if all(candidate[:skip] + candidate[skip + 1:] in frequent_k
+                       for skip in range(len(candidate) - 2)):
+                    candidates.append(candidate)
+    return candidates
+
+
+def negative_border(frequent, n_products, max_len=None):
+    """
+    Minimal infrequent itemsets: not frequent, but every proper subset is.
+
+    Args:
+        frequent: set of sorted tuples (downward closed)
+        n_products: size of the product vocabulary
+        max_len: optional maximum itemset length
+
+    Returns:
+        List of sorted tuples
+    """
+    border = [(item,) for item in range(n_products) if (item,) not in frequent]
+
+    levels = defaultdict(set)
+    for itemset in frequent:
+        levels[len(itemset)].add(itemset)
+    for length in sorted(levels):
+        if max_len is not None and length >= max_len:
+            break
+        border.extend(
+            candidate for candidate in candidate_join(levels[length]) if candidate not in frequent
+        )
+    return border
+
+
+class IncrementalMiner:
+    """
+    FUP-style maintenance of frequent itemsets under appended baskets.
+
+    Keeps absolute counts for the frequent itemsets and for their negative
+    border. New baskets are counted only against those tracked itemsets; an
+    itemset outside both sets cannot become frequent unless some border
+    itemset does first, so the full data is rescanned only in that case.
+    """
+
+    def __init__(self, min_support, max_len=None):
+        self.min_support = min_support
+        self.max_len = max_len
+        self.frequent = {}
+        self.border = {}
+        self.n_baskets = 0
+        self.n_products = 0
+        self.rescans = 0
+
+    @classmethod
+    def from_lattice(cls, lattice, basket_matrix, min_support, max_len=None):
+        """Start from already mined itemsets; only the border is counted"""
+        miner = cls(min_support, max_len)
+        miner.frequent = dict(lattice.iter_itemsets())
+        miner.n_baskets = basket_matrix.n_baskets
+        miner._count_border(basket_matrix)
+        return miner
+
+    def fit(self, basket_matrix):
+        """Mine the full data and count the negative border"""
+        self.n_baskets = basket_matrix.n_baskets
+        min_count = min_count_for_support(self.min_support, self.n_baskets)
+        self.frequent = {
+            tuple(sorted(codes)): count
+            for codes, count in fpgrowth(basket_matrix.matrix, min_count, self.max_len)
+        }
+        self._count_border(basket_matrix)
+        return self
+
+    def _count_border(self, basket_matrix):
+        self.n_products = basket_matrix.n_products
+        border = sorted(
+            negative_border(set(self.frequent), self.n_products, self.max_len),
+            key=lambda codes: (len(codes), codes)
+        )
+        self.border = dict(zip(border, count_itemsets(basket_matrix.matrix, border).tolist()))
+
+    def update(self, delta_matrix, basket_matrix):
+        """
+        Fold newly appended baskets into the tracked counts.
+
+        Args:
+            delta_matrix: BasketMatrix holding only the new baskets
+            basket_matrix: BasketMatrix of all baskets, used if a rescan is needed
+
+        Returns:
+            True if the border changed and the full data was rescanned
+        """
+        self.n_baskets += delta_matrix.n_baskets
+        min_count = min_count_for_support(self.min_support, self.n_baskets)
+
+        for item in range(self.n_products, delta_matrix.n_products):
+            self.border[(item,)] = 0
+        self.n_products = delta_matrix.n_products
+
+        tracked = sorted(
+            list(self.frequent) + list(self.border), key=lambda codes: (len(codes), codes)
+        )
+        counts = dict(self.frequent)
+        counts.update(self.border)
+        for itemset, count in zip(tracked, count_itemsets(delta_matrix.matrix, tracked).tolist()):
+            counts[itemset] += count
+
+        if any(counts[itemset] >= min_count for itemset in self.border):
+            self.rescans += 1
+            self.fit(basket_matrix)
+            return True
+
+        # Without promotions the new frequent set is a subset of the old one,
+        # so its border only holds itemsets whose counts are already known.
+        self.frequent = {
+            itemset: counts[itemset] for itemset in self.frequent if counts[itemset] >= min_count
+        }
+        self.border = {
+            itemset: counts[itemset]
+            for itemset in negative_border(set(self.frequent), self.n_products, self.max_len)
+        }
+        return False
+
+    def lattice(self, products):
+        """Current frequent itemsets as an ItemsetLattice"""
+        return ItemsetLattice.from_itemsets(
+            self.frequent.items(), self.n_baskets, products,
+            min_count_for_support(self.min_support, self.n_baskets)
+        )
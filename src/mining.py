@@ -0,0 +1,482 @@
+import math
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .encoding import vocabulary_array
+
+ALGORITHMS = ('apriori', 'fpgrowth', 'eclat', 'auto')
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def min_count_for_support(min_support, n_baskets):
+    """
+    Smallest absolute basket count whose support passes min_support.
+
+    Uses the same float comparison as mlxtend (count / n >= min_support), so
+    every engine keeps exactly the same itemsets at the boundary.
+    """
+    if n_baskets == 0:
+        return 1
+    count = max(int(math.ceil(min_support * n_baskets)), 1)
+    while count > 1 and (count - 1) / n_baskets >= min_support:
+        count -= 1
+    while count / n_baskets < min_support:
+        count += 1
+    return count
+
+
+class ItemsetLattice:
+    """
+    Frequent itemsets stored as sorted integer product codes.
+
+    Itemsets are kept CSR-style (offsets into a flat items array) together with
+    their absolute basket counts, in canonical order: by length, then by codes.
+    That is the order mlxtend's apriori emits, so frames built from any engine
+    compare equal.
+    """
+
+    def __init__(self, offsets, items, counts, n_baskets, products, min_count=1):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.items = np.asarray(items, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.n_baskets = int(n_baskets)
+        self.products = pd.Index(products)
+        self.min_count = int(min_count)
+
+    @classmethod
+    def from_itemsets(cls, itemsets, n_baskets, products, min_count=1):
+        """
+        Build a lattice from (codes, count) pairs in any order.
+
+        Args:
+            itemsets: iterable of (tuple of product codes, basket count)
+        """
+        pairs = sorted(
+            ((tuple(sorted(codes)), count) for codes, count in itemsets),
+            key=lambda pair: (len(pair[0]), pair[0])
+        )
+        lengths = np.fromiter((len(codes) for codes, _ in pairs), dtype=np.int64, count=len(pairs))
+        offsets = np.zeros(len(pairs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        items = np.fromiter(
+            (code for codes, _ in pairs for code in codes), dtype=np.int32, count=int(offsets[-1])
+        )
+        counts = np.fromiter((count for _, count in pairs), dtype=np.int64, count=len(pairs))
+        return cls(offsets, items, counts, n_baskets, products, min_count)
+
+    @classmethod
+    def from_frame(cls, frame, n_baskets, products, min_count=1):
+        """Build a lattice from a support/itemsets frame with product names"""
+        products = pd.Index(products)
+        codes = products.get_indexer([item for itemset in frame['itemsets'] for item in itemset])
+        if (codes < 0).any():
+            raise ValueError("Itemsets contain products missing from the vocabulary")
+
+        itemsets = []
+        position = 0
+        for itemset, support in zip(frame['itemsets'], frame['support']):
+            itemsets.append((codes[position:position + len(itemset)], int(round(support * n_baskets))))
+            position += len(itemset)
+        return cls.from_itemsets(itemsets, n_baskets, products, min_count)
+
+    def save(self, file):
+        """Write the itemsets to an uncompressed .npz file"""
+        np.savez(
+            file,
+            offsets=self.offsets,
+            items=self.items,
+            counts=self.counts,
+            n_baskets=np.array(self.n_baskets),
+            min_count=np.array(self.min_count),
+            products=vocabulary_array(self.products)
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Read itemsets written by save"""
+        with np.load(file) as data:
+            return cls(
+                data['offsets'], data['items'], data['counts'], int(data['n_baskets']),
+                data['products'], int(data['min_count'])
+            )
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    @property
+    def supports(self):
+        return self.counts / max(self.n_baskets, 1)
+
+    @property
+    def max_length(self):
+        return int(self.lengths.max()) if len(self) else 0
+
+    def itemset(self, index):
+        return tuple(self.items[self.offsets[index]:self.offsets[index + 1]].tolist())
+
+    def iter_itemsets(self):
+        """Yield (codes tuple, count) pairs in canonical order"""
+        items = self.items.tolist()
+        offsets = self.offsets.tolist()
+        for index, count in enumerate(self.counts.tolist()):
+            yield tuple(items[offsets[index]:offsets[index + 1]]), count
+
+    def by_length(self, length):
+        """
+        Return (positions, rows) for all itemsets of one length.
+
+        rows is an (m, length) int array of sorted codes.
+        """
+        positions = np.flatnonzero(self.lengths == length)
+        if len(positions) == 0:
+            return positions, np.empty((0, length), dtype=np.int32)
+        start = self.offsets[positions[0]]
+        stop = self.offsets[positions[-1] + 1]
+        return positions, self.items[start:stop].reshape(-1, length)
+
+    def take(self, positions):
+        """Return a new lattice with the itemsets at the given positions"""
+        positions = np.asarray(positions, dtype=np.int64)
+        lengths = self.lengths[positions]
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if len(positions):
+            flat = np.repeat(self.offsets[positions] - offsets[:-1], lengths) + np.arange(offsets[-1])
+            items = self.items[flat]
+        else:
+            items = self.items[:0]
+        return ItemsetLattice(
+            offsets, items, self.counts[positions], self.n_baskets, self.products, self.min_count
+        )
+
+    def filter(self, min_count):
+        """Return the itemsets with at least min_count baskets"""
+        lattice = self.take(np.flatnonzero(self.counts >= min_count))
+        lattice.min_count = max(int(min_count), self.min_count)
+        return lattice
+
+    def to_frame(self):
+        """Convert to mlxtend's support/itemsets frame with product names"""
+        names = self.products.to_numpy()[self.items].tolist()
+        offsets = self.offsets.tolist()
+        itemsets = [
+            frozenset(names[offsets[index]:offsets[index + 1]]) for index in range(len(self))
+        ]
+        return pd.DataFrame({'support': self.supports, 'itemsets': itemsets})
+
+
+def choose_algorithm(basket_matrix):
+    """
+    Pick a mining engine from the shape of the basket matrix.
+
+    ECLAT's vertical bitsets pay off on dense data with a modest catalog,
+    where intersections stay cheap. Sparse data or large catalogs favour
+    FP-Growth, whose tree compresses shared basket prefixes.
+    """
+    n_products = basket_matrix.n_products
+    bitset_bytes = n_products * (basket_matrix.n_baskets // 8 + 1)
+
+    if basket_matrix.density >= 0.05 and n_products <= 2000 and bitset_bytes <= 512 * 2**20:
+        return 'eclat'
+    return 'fpgrowth'
+
+
+def _frequent_items(matrix, min_count):
+    counts = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    return counts, np.flatnonzero(counts >= min_count)
+
+
+class _FPNode:
+    __slots__ = ('item', 'count', 'parent', 'children')
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+
+def _build_fptree(paths):
+    """Build an FP-tree from (ordered items, count) paths"""
+    root = _FPNode(None, None)
+    header = defaultdict(list)
+    for path, count in paths:
+        node = root
+        for item in path:
+            child = node.children.get(item)
+            if child is None:
+                child = _FPNode(item, node)
+                node.children[item] = child
+                header[item].append(child)
+            child.count += count
+            node = child
+    return root, header
+
+
+def _single_path(root):
+    path = []
+    node = root
+    while node.children:
+        if len(node.children) > 1:
+            return None
+        node = next(iter(node.children.values()))
+        path.append((node.item, node.count))
+    return path
+
+
+def _fpgrowth(paths, rank, min_count, suffix, max_len, out):
+    root, header = _build_fptree(paths)
+
+    path = _single_path(root)
+    if path is not None:
+        limit = len(path) if max_len is None else min(len(path), max_len - len(suffix))
+        for size in range(1, limit + 1):
+            for combo in combinations(path, size):
+                out.append((suffix + tuple(item for item, _ in combo), min(c for _, c in combo)))
+        return
+
+    for item in sorted(header, key=rank.__getitem__, reverse=True):
+        nodes = header[item]
+        count = sum(node.count for node in nodes)
+        if count < min_count:
+            continue
+        itemset = suffix + (item,)
+        out.append((itemset, count))
+        if max_len is not None and len(itemset) >= max_len:
+            continue
+
+        base = []
+        item_counts = defaultdict(int)
+        for node in nodes:
+            prefix = []
+            parent = node.parent
+            while parent.item is not None:
+                prefix.append(parent.item)
+                parent = parent.parent
+            if prefix:
+                base.append((prefix, node.count))
+                for prefix_item in prefix:
+                    item_counts[prefix_item] += node.count
+
+        conditional = []
+        for prefix, prefix_count in base:
+            kept = [i for i in reversed(prefix) if item_counts[i] >= min_count]
+            if kept:
+                conditional.append((kept, prefix_count))
+        if conditional:
+            _fpgrowth(conditional, rank, min_count, itemset, max_len, out)
+
+
+def fpgrowth(matrix, min_count, max_len=None):
+    """
+    Mine frequent itemsets with FP-Growth on a CSR basket matrix.
+
+    Args:
+        matrix: scipy.sparse CSR matrix with sorted indices (baskets x products)
+        min_count: minimum number of baskets an itemset must appear in
+        max_len: optional maximum itemset length
+
+    Returns:
+        List of (tuple of product codes, basket count)
+    """
+    counts, frequent = _frequent_items(matrix, min_count)
+    if len(frequent) == 0:
+        return []
+
+    # Rank 0 is the most frequent item; ties broken by product code.
+    order = frequent[np.lexsort((frequent, -counts[frequent]))]
+    rank_of = np.full(matrix.shape[1], -1, dtype=np.int64)
+    rank_of[order] = np.arange(len(order))
+
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    ranks = rank_of[matrix.indices]
+    keep = ranks >= 0
+    rows, ranks = rows[keep], ranks[keep]
+    sorter = np.lexsort((ranks, rows))
+    rows, ranks = rows[sorter], ranks[sorter]
+
+    # Identical baskets collapse into a single weighted path.
+    path_counts = defaultdict(int)
+    bounds = np.flatnonzero(np.diff(rows)) + 1
+    for path in np.split(order[ranks], bounds):
+        if len(path):
+            path_counts[tuple(path.tolist())] += 1
+
+    rank = {int(item): position for position, item in enumerate(order)}
+    out = []
+    _fpgrowth(list(path_counts.items()), rank, min_count, (), max_len, out)
+    return out
+
+
+def _eclat(prefix, members, min_count, max_len, intersect, out):
+    for position, (item, tids, count) in enumerate(members):
+        itemset = prefix + (item,)
+        out.append((itemset, count))
+        if max_len is not None and len(itemset) >= max_len:
+            continue
+
+        suffix = []
+        for other, other_tids, _ in members[position + 1:]:
+            joined, joined_count = intersect(tids, other_tids)
+            if joined_count >= min_count:
+                suffix.append((other, joined, joined_count))
+        if suffix:
+            _eclat(itemset, suffix, min_count, max_len, intersect, out)
+
+
+def _bitset_intersect(left, right):
+    joined = np.bitwise_and(left, right)
+    return joined, int(_POPCOUNT[joined].sum())
+
+
+def _tidlist_intersect(left, right):
+    joined = np.intersect1d(left, right, assume_unique=True)
+    return joined, len(joined)
+
+
+def eclat(matrix, min_count, max_len=None, vertical='auto'):
+    """
+    Mine frequent itemsets with ECLAT on a vertical layout.
+
+    Each product becomes either a packed bitset over baskets or a sorted
+    tid-list, and itemsets are grown depth-first by intersecting them.
+
+    Args:
+        matrix: scipy.sparse CSR matrix with sorted indices (baskets x products)
+        min_count: minimum number of baskets an itemset must appear in
+        max_len: optional maximum itemset length
+        vertical: 'bitset', 'tidlist' or 'auto' (bitsets for dense columns)
+
+    Returns:
+        List of (tuple of product codes, basket count)
+    """
+    counts, frequent = _frequent_items(matrix, min_count)
+    if len(frequent) == 0:
+        return []
+
+    n_baskets = matrix.shape[0]
+    if vertical == 'auto':
+        # A bitset costs n/8 bytes, a tid-list 8 bytes per basket holding it.
+        mean_count = counts[frequent].mean()
+        vertical = 'bitset' if mean_count * 8 >= n_baskets / 8 else 'tidlist'
+    if vertical not in ('bitset', 'tidlist'):
+        raise ValueError(f"Unknown vertical layout: {vertical}")
+
+    csc = matrix[:, frequent].tocsc()
+    csc.sort_indices()
+    members = []
+    for column, item in enumerate(frequent):
+        tids = csc.indices[csc.indptr[column]:csc.indptr[column + 1]].astype(np.int64)
+        if vertical == 'bitset':
+            mask = np.zeros(n_baskets, dtype=bool)
+            mask[tids] = True
+            tids = np.packbits(mask)
+        members.append((int(item), tids, int(counts[item])))
+
+    # Growing from the least frequent items keeps intersections small.
+    members.sort(key=lambda member: member[2])
+    intersect = _bitset_intersect if vertical == 'bitset' else _tidlist_intersect
+
+    out = []
+    _eclat((), members, min_count, max_len, intersect, out)
+    return out
+
+
+def count_itemsets(matrix, itemsets):
+    """
+    Count the baskets containing each itemset.
+
+    Candidates are grouped by their prefix (all items but the last). The
+    baskets holding a prefix are found once by intersecting tid-lists, and the
+    counts for every last item sharing that prefix come from a single pass
+    over those baskets' rows.
+
+    Args:
+        matrix: scipy.sparse CSR matrix with sorted indices (baskets x products)
+        itemsets: sequence of sorted tuples of product codes
+
+    Returns:
+        int64 array of basket counts, aligned with itemsets
+    """
+    counts = np.zeros(len(itemsets), dtype=np.int64)
+    if len(itemsets) == 0:
+        return counts
+
+    matrix = matrix.tocsr()
+    csc = matrix.tocsc()
+    csc.sort_indices()
+    item_counts = np.diff(csc.indptr)
+    prefixes = {}
+
+    def tidlist(prefix):
+        tids = prefixes.get(prefix)
+        if tids is None:
+            column = prefix[-1]
+            tids = csc.indices[csc.indptr[column]:csc.indptr[column + 1]]
+            if len(prefix) > 1:
+                tids = np.intersect1d(tidlist(prefix[:-1]), tids, assume_unique=True)
+            prefixes[prefix] = tids
+        return tids
+
+    groups = defaultdict(list)
+    for position, itemset in enumerate(itemsets):
+        if len(itemset) == 1:
+            counts[position] = item_counts[itemset[0]]
+        else:
+            groups[tuple(itemset[:-1])].append((itemset[-1], position))
+
+    for prefix, members in groups.items():
+        rows = tidlist(prefix)
+        if len(rows) == 0:
+            continue
+        starts = matrix.indptr[rows]
+        lengths = matrix.indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        values = matrix.indices[np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())]
+
+        last = np.array([item for item, _ in members])
+        order = np.argsort(last)
+        hits = np.searchsorted(last[order], values)
+        found = hits < len(last)
+        found[found] = last[order][hits[found]] == values[found]
+        member_counts = np.bincount(hits[found], minlength=len(last))
+        positions = np.array([position for _, position in members])
+        counts[positions[order]] = member_counts
+    return counts
+
+
+def mine_itemsets(basket_matrix, min_support, algorithm='fpgrowth', max_len=None):
+    """
+    Mine frequent itemsets with a native engine.
+
+    Args:
+        basket_matrix: BasketMatrix to mine
+        min_support: minimum support as a fraction of baskets
+        algorithm: 'fpgrowth', 'eclat' or 'auto'
+        max_len: optional maximum itemset length
+
+    Returns:
+        ItemsetLattice
+    """
+    if algorithm == 'auto':
+        algorithm = choose_algorithm(basket_matrix)
+
+    min_count = min_count_for_support(min_support, basket_matrix.n_baskets)
+    if algorithm == 'fpgrowth':
+        itemsets = fpgrowth(basket_matrix.matrix, min_count, max_len)
+    elif algorithm == 'eclat':
+        itemsets = eclat(basket_matrix.matrix, min_count, max_len)
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}. Choose from {ALGORITHMS}")
+
+    return ItemsetLattice.from_itemsets(
+        itemsets, basket_matrix.n_baskets, basket_matrix.products, min_count
+    )
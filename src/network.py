@@ -0,0 +1,146 @@
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+# Above this many nodes the O(n^2)-per-iteration spring layout is only run
+# for a few iterations from a spectral starting point.
+SPRING_NODE_LIMIT = 300
+
+EDGE_COLUMNS = ['source', 'target', 'kind', 'lift', 'confidence']
+
+
+def itemset_label(itemset):
+    """Node name of an itemset: the item itself, or the sorted items joined by ' + '"""
+    return ' + '.join(sorted(map(str, itemset)))
+
+
+def rule_edges(rules, min_confidence=0.5, min_lift=1.0, max_edges=200):
+    """
+    Edge list of the association network, strongest rules first.
+
+    Rules are filtered and ranked with array operations, and only the
+    max_edges rules with the highest lift are turned into edges, so the
+    cost no longer grows with the full rule table. Every antecedent and
+    consequent becomes one node; a multi-item itemset is a hyperedge node
+    named after its items and linked to each member item by a 'member'
+    edge. Labels are built once per distinct itemset.
+
+    Args:
+        rules: DataFrame with antecedents, consequents, confidence and lift
+        min_confidence: minimum rule confidence
+        min_lift: minimum rule lift
+        max_edges: maximum number of rule edges (None keeps all)
+
+    Returns:
+        DataFrame with source, target, kind ('rule' or 'member'), lift and
+        confidence; member edges have NaN metrics
+    """
+    lift = rules['lift'].to_numpy()
+    confidence = rules['confidence'].to_numpy()
+    positions = np.flatnonzero((confidence >= min_confidence) & (lift >= min_lift))
+    if max_edges is not None and len(positions) > max_edges:
+        strongest = np.argpartition(-lift[positions], max_edges - 1)[:max_edges]
+        positions = positions[strongest]
+    positions = positions[np.lexsort((positions, -lift[positions]))]
+    if len(positions) == 0:
+        return pd.DataFrame({col: pd.Series(dtype=object if col in EDGE_COLUMNS[:3] else float)
+                             for col in EDGE_COLUMNS})
+
+    labels = {}
+    columns = {}
+    for side in ('antecedents', 'consequents'):
+        itemsets = rules[side].to_numpy()[positions]
+        for itemset in itemsets:
+            if itemset not in labels:
+                labels[itemset] = itemset_label(itemset)
+        columns[side] = [labels[itemset] for itemset in itemsets]
+
+    edges = pd.DataFrame({
+        'source': columns['antecedents'],
+        'target': columns['consequents'],
+        'kind': 'rule',
+        'lift': lift[positions],
+        'confidence': confidence[positions],
+    })
+    members = [(label, str(item)) for itemset, label in labels.items() if len(itemset) > 1 for item in itemset]
+    if members:
+        member_edges = pd.DataFrame(members, columns=['source', 'target'])
+        member_edges['kind'] = 'member'
+        member_edges = member_edges.sort_values(['source', 'target'], ignore_index=True)
+        edges = pd.concat([edges, member_edges], ignore_index=True)
+    return edges[EDGE_COLUMNS]
+
+
+def build_graph(edges):
+    """Graph of an edge list from rule_edges; the strongest rule wins on repeated pairs"""
+    G = nx.Graph()
+    rule_edges_only = edges[edges['kind'] == 'rule']
+    members = edges[edges['kind'] == 'member']
+    G.add_nodes_from(pd.unique(edges[['source', 'target']].to_numpy().ravel()), hyperedge=False)
+    G.add_nodes_from(members['source'].drop_duplicates(), hyperedge=True)
+    G.add_edges_from(
+        (source, target, {'kind': 'member', 'weight': 1.0})
+        for source, target in zip(members['source'].tolist(), members['target'].tolist())
+    )
+    # Rows are sorted by lift, so adding them in reverse leaves the
+    # strongest attributes on every node pair.
+    G.add_edges_from(
+        (source, target, {'kind': 'rule', 'weight': lift, 'confidence': confidence})
+        for source, target, lift, confidence in zip(
+            rule_edges_only['source'].tolist()[::-1], rule_edges_only['target'].tolist()[::-1],
+            rule_edges_only['lift'].tolist()[::-1], rule_edges_only['confidence'].tolist()[::-1]
+        )
+    )
+    return G
+
+
+def compute_layout(G, seed=42):
+    """
+    Node positions for G.
+
+    Small graphs get the full spring layout. Larger ones start from the
+    spectral layout (a sparse eigensolver) and only refine it with a few
+    spring iterations, since every spring iteration is quadratic in the
+    number of nodes.
+    """
+    if G.number_of_nodes() <= SPRING_NODE_LIMIT:
+        return nx.spring_layout(G, seed=seed)
+    initial = nx.spectral_layout(G)
+    return nx.spring_layout(G, pos=initial, iterations=10, seed=seed)
+
+
+class LayoutCache:
+    """
+    Least-recently-used store of graph layouts keyed by their edge set.
+
+    Redrawing the same rules then reuses the positions instead of running
+    the layout again. An analyzer's own cache only lives as long as the
+    analyzer; for reuse across Streamlit reruns keep one instance in
+    st.cache_resource and pass it to create_network_graph.
+    """
+
+    def __init__(self, size=8):
+        self.size = size
+        self._layouts = OrderedDict()
+
+    @staticmethod
+    def key(G):
+        return frozenset(frozenset(edge) for edge in G.edges())
+
+    def get(self, G, seed=42):
+        """Cached positions for G, computing them on a miss; returns (pos, hit)"""
+        key = (self.key(G), seed)
+        pos = self._layouts.get(key)
+        if pos is not None:
+            self._layouts.move_to_end(key)
+            return pos, True
+        pos = compute_layout(G, seed)
+        self._layouts[key] = pos
+        if len(self._layouts) > self.size:
+            self._layouts.popitem(last=False)
+        return pos, False
+
+    def __len__(self):
+        return len(self._layouts)
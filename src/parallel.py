@@ -0,0 +1,220 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from .mining import (ItemsetLattice, choose_algorithm, count_itemsets, eclat, fpgrowth,
+                     min_count_for_support)
+
+_ENGINES = {'fpgrowth': fpgrowth, 'eclat': eclat}
+
+# Below this many baskets x stored items, SON's process start-up, shared
+# memory and extra counting pass cost more than they save: on Groceries
+# (9.8k baskets, 43k items, ~4e8) SON at min_support 0.004 took 11.6 s
+# against 1.8 s in one process.
+SON_MIN_WORK = 10 ** 11
+
+# Views onto the shared CSR arrays, attached once per worker process.
+_WORKER_STATE = {}
+
+
+def resolve_n_jobs(n_jobs):
+    """Translate n_jobs (None, -1 or a positive int) into a process count"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+
+class SharedBasketMatrix:
+    """
+    Publish the CSR arrays of a basket matrix in shared memory.
+
+    Workers attach to the segments by name, so the encoded matrix is copied
+    once into shared memory instead of being pickled for every task. Use as a
+    context manager; the segments are unlinked on exit.
+    """
+
+    def __init__(self, matrix):
+        self.shape = matrix.shape
+        self._segments = []
+        arrays = {}
+        for name in ('indptr', 'indices'):
+            source = getattr(matrix, name)
+            segment = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            self._segments.append(segment)
+            np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)[:] = source
+            arrays[name] = (segment.name, source.dtype.str, source.shape)
+        self.spec = {'shape': self.shape, 'arrays': arrays}
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach(spec):
+    """Pool initializer: map the shared CSR arrays into this worker"""
+    segments = []
+    arrays = {}
+    for name, (segment_name, dtype, shape) in spec['arrays'].items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        segments.append(segment)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+    _WORKER_STATE['segments'] = segments
+    _WORKER_STATE['arrays'] = arrays
+    _WORKER_STATE['shape'] = spec['shape']
+
+
+def _row_slice(start, stop):
+    """CSR matrix over rows [start, stop) backed by the shared arrays"""
+    indptr = _WORKER_STATE['arrays']['indptr']
+    indices = _WORKER_STATE['arrays']['indices']
+    begin, end = indptr[start], indptr[stop]
+    return sparse.csr_matrix(
+        (np.ones(end - begin, dtype=bool), indices[begin:end], indptr[start:stop + 1] - begin),
+        shape=(stop - start, _WORKER_STATE['shape'][1])
+    )
+
+
+def _mine_partition(task):
+    start, stop, min_count, algorithm, max_len = task
+    itemsets = _ENGINES[algorithm](_row_slice(start, stop), min_count, max_len)
+    return {tuple(sorted(codes)): count for codes, count in itemsets}
+
+
+def _count_partition(task):
+    start, stop, candidates = task
+    return count_itemsets(_row_slice(start, stop), candidates)
+
+
+def partition_bounds(n_rows, n_partitions):
+    """Split [0, n_rows) into contiguous (start, stop) row ranges"""
+    edges = np.linspace(0, n_rows, n_partitions + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+
+def son_itemsets(basket_matrix, min_support, algorithm='fpgrowth', n_jobs=-1, max_len=None,
+                 min_work=SON_MIN_WORK):
+    """
+    Mine frequent itemsets in parallel with the SON two-pass scheme.
+
+    Pass one mines each row partition locally at a proportionally scaled
+    threshold; any globally frequent itemset is locally frequent in at least
+    one partition, so the union is a complete candidate set. Pass two counts
+    the candidates each partition did not already report and keeps the
+    globally frequent ones, so the result is identical to a single-process
+    run.
+
+    Matrices with fewer than min_work baskets x stored items (SON_MIN_WORK,
+    1e11, by default: about 150k baskets of four items) are mined in one
+    process instead, since the pool and the second pass then cost more than
+    the partitions save. The lattice is the same either way.
+
+    Args:
+        basket_matrix: BasketMatrix to mine
+        min_support: minimum support as a fraction of baskets
+        algorithm: local engine, 'fpgrowth' or 'eclat' ('apriori'/'auto' pick one)
+        n_jobs: number of worker processes (-1 for all cores)
+        max_len: optional maximum itemset length
+        min_work: smallest n_baskets * nnz mined in parallel
+
+    Returns:
+        ItemsetLattice
+    """
+    if algorithm not in _ENGINES:
+        algorithm = choose_algorithm(basket_matrix)
+
+    n_baskets = basket_matrix.n_baskets
+    min_count = min_count_for_support(min_support, n_baskets)
+    n_jobs = resolve_n_jobs(n_jobs)
+    bounds = partition_bounds(n_baskets, n_jobs)
+
+    if len(bounds) <= 1 or n_baskets * basket_matrix.nnz < min_work:
+        itemsets = _ENGINES[algorithm](basket_matrix.matrix, min_count, max_len)
+        return ItemsetLattice.from_itemsets(itemsets, n_baskets, basket_matrix.products, min_count)
+
+    with SharedBasketMatrix(basket_matrix.matrix) as shared, \
+            ProcessPoolExecutor(len(bounds), initializer=_attach, initargs=(shared.spec,)) as pool:
+        # Integer scaling of the global count keeps the SON guarantee exact.
+        tasks = [
+            (start, stop, max((min_count * (stop - start)) // n_baskets, 1), algorithm, max_len)
+            for start, stop in bounds
+        ]
+        local_counts = list(pool.map(_mine_partition, tasks))
+        totals = {}
+        for local in local_counts:
+            for codes, count in local.items():
+                totals[codes] = totals.get(codes, 0) + count
+
+        # Each partition only recounts the candidates it did not report itself.
+        missing = [
+            sorted((codes for codes in totals if codes not in local), key=lambda codes: (len(codes), codes))
+            for local in local_counts
+        ]
+        verify_tasks = [(start, stop, todo) for (start, stop), todo in zip(bounds, missing)]
+        for todo, partial in zip(missing, pool.map(_count_partition, verify_tasks)):
+            for codes, count in zip(todo, partial.tolist()):
+                totals[codes] += count
+
+    return ItemsetLattice.from_itemsets(
+        ((codes, count) for codes, count in totals.items() if count >= min_count),
+        n_baskets, basket_matrix.products, min_count
+    )
+
+
+def segment_itemsets(basket_matrix, bounds, min_support, algorithm='fpgrowth', n_jobs=-1, max_len=None):
+    """
+    Mine each contiguous row range of a basket matrix as its own dataset.
+
+    Unlike son_itemsets the ranges are independent segments: each gets its
+    own min_support threshold and lattice. The matrix is published once in
+    shared memory and the ranges are handed to the pool largest first, so a
+    few big segments do not end up queued behind many small ones.
+
+    Args:
+        basket_matrix: BasketMatrix whose rows are grouped by segment
+        bounds: list of (start, stop) row ranges, one per segment
+        min_support: minimum support within each segment
+        algorithm: 'fpgrowth' or 'eclat' ('apriori'/'auto' pick one)
+        n_jobs: number of worker processes (-1 for all cores)
+        max_len: optional maximum itemset length
+
+    Returns:
+        List of ItemsetLattice, aligned with bounds
+    """
+    if algorithm not in _ENGINES:
+        algorithm = choose_algorithm(basket_matrix)
+
+    tasks = [
+        (start, stop, min_count_for_support(min_support, stop - start), algorithm, max_len)
+        for start, stop in bounds
+    ]
+    n_jobs = min(resolve_n_jobs(n_jobs), len(tasks))
+    if n_jobs <= 1:
+        results = [
+            dict(_ENGINES[algorithm](basket_matrix.matrix[start:stop], min_count, max_len))
+            for start, stop, min_count, _, _ in tasks
+        ]
+    else:
+        order = sorted(range(len(tasks)), key=lambda index: tasks[index][0] - tasks[index][1])
+        results = [None] * len(tasks)
+        with SharedBasketMatrix(basket_matrix.matrix) as shared, \
+                ProcessPoolExecutor(n_jobs, initializer=_attach, initargs=(shared.spec,)) as pool:
+            for index, local in zip(order, pool.map(_mine_partition, [tasks[index] for index in order])):
+                results[index] = local
+
+    return [
+        ItemsetLattice.from_itemsets(local.items(), stop - start, basket_matrix.products, min_count)
+        for local, (start, stop, min_count, _, _) in zip(results, tasks)
+    ]
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+
+def factorize_sorted(values):
+    """
+    Integer codes and sorted uniques of a column, like pd.factorize(sort=True).
+
+    A categorical column is not hashed again: its codes are reused and only
+    remapped when the categories are unsorted or partly unused.
+
+    Returns:
+        (int64 codes with -1 for missing values, plain Index of uniques)
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = pd.factorize(values, sort=True)
+        return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+    categories = values.cat.categories
+    codes = values.cat.codes.to_numpy().astype(np.int64)
+    present = codes >= 0
+    used = np.bincount(codes[present], minlength=len(categories)) > 0
+    order = categories.argsort()
+    order = order[used[order]]
+    if len(order) == len(categories) and (order == np.arange(len(order))).all():
+        return codes, pd.Index(categories.to_numpy(), dtype=categories.dtype)
+
+    remap = np.full(len(categories), -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    codes[present] = remap[codes[present]]
+    return codes, pd.Index(categories.to_numpy()[order], dtype=categories.dtype)
+
+
+def parse_dates(values, date_format=None):
+    """
+    Parse a timestamp column, converting each distinct value only once.
+
+    Transaction logs repeat the same few dates millions of times, so the
+    unique strings are parsed (with an explicit date_format when given,
+    which skips format inference) and broadcast back. Unparseable values
+    become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Series(uniques), format=date_format, errors='coerce').to_numpy()
+    result = np.full(len(values), np.datetime64('NaT'), dtype=parsed.dtype if len(parsed) else 'datetime64[ns]')
+    known = codes >= 0
+    result[known] = parsed[codes[known]]
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def infer_date_format(values):
+    """
+    strftime format of the first non-null value, or None when it cannot be guessed.
+
+    Callers parsing a column piece by piece pin this format so every piece
+    reads ambiguous dates ('03/04/2024') the same way.
+    """
+    first = values.first_valid_index()
+    if first is None or pd.api.types.is_datetime64_any_dtype(values):
+        return None
+    return guess_datetime_format(str(values[first]))
+
+
+def clean_transactions(transactions_df, transaction_col='transaction_id', product_col='product_id',
+                       time_column='timestamp', date_format=None, categorical=True):
+    """
+    Drop unusable rows and compact the key columns in one pass.
+
+    Transaction and product ids are integer-coded once. Rows missing either
+    key are masked out, and duplicates are found on the encoded
+    (transaction, product) pair instead of comparing whole rows. Both masks
+    are combined and the frame is copied a single time. The product column
+    then becomes a categorical built from the codes already computed, so it
+    is not hashed again when the basket matrix is encoded. Transaction ids
+    keep their dtype (no str casting). time_column, if present, is parsed
+    with parse_dates.
+
+    Args:
+        transactions_df: raw transactions
+        transaction_col: basket id column
+        product_col: product id column
+        time_column: timestamp column to parse when present
+        date_format: explicit strftime format of time_column, e.g. '%d/%m/%Y'
+        categorical: store the product column as a categorical
+
+    Returns:
+        (cleaned DataFrame, report) where report is a dict with rows_in,
+        dropped_missing_keys, dropped_duplicates, unparsed_timestamps and
+        rows_out
+    """
+    n_rows = len(transactions_df)
+    basket_codes = pd.factorize(transactions_df[transaction_col])[0].astype(np.int64, copy=False)
+    product_codes, products = factorize_sorted(transactions_df[product_col])
+
+    keep = (basket_codes >= 0) & (product_codes >= 0)
+    dropped_missing = int(n_rows - keep.sum())
+
+    pairs = basket_codes * max(len(products), 1) + product_codes
+    duplicated = pd.Series(pairs[keep]).duplicated().to_numpy()
+    dropped_duplicates = int(duplicated.sum())
+    keep[np.flatnonzero(keep)[duplicated]] = False
+
+    cleaned = transactions_df.take(np.flatnonzero(keep))
+    if categorical:
+        cleaned[product_col] = pd.Categorical.from_codes(product_codes[keep], categories=products)
+
+    unparsed = 0
+    if time_column in cleaned.columns:
+        missing_before = int(cleaned[time_column].isna().sum())
+        cleaned[time_column] = parse_dates(cleaned[time_column], date_format)
+        unparsed = int(cleaned[time_column].isna().sum()) - missing_before
+
+    report = {
+        'rows_in': n_rows,
+        'dropped_missing_keys': dropped_missing,
+        'dropped_duplicates': dropped_duplicates,
+        'unparsed_timestamps': unparsed,
+        'rows_out': len(cleaned),
+    }
+    return cleaned, report
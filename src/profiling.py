@@ -0,0 +1,215 @@
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MEMORY_MODES = ('rss', 'tracemalloc', None)
+
+
+def _peak_rss_mb():
+    """High-water mark of the process resident set size, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def _rss_mb():
+    """Current resident set size in MB; the high-water mark where /proc is missing"""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return _peak_rss_mb()
+
+
+class StageRecord:
+    """
+    Measurements for one pipeline stage.
+
+    Attributes:
+        stage: stage name (usually the analyzer method)
+        params: scalar arguments the stage was called with
+        started_at: wall-clock start time
+        seconds: elapsed wall time
+        peak_mb: peak traced memory during the stage ('tracemalloc' mode)
+        rss_delta_mb: resident memory after minus before the stage ('rss'
+            mode); negative when the stage freed memory
+        sizes: input/output sizes after the stage (rows, baskets, items,
+            density, itemsets, rules, ...)
+        depth: nesting level when a stage runs inside another one
+    """
+
+    def __init__(self, stage, params, depth=0):
+        self.stage = stage
+        self.params = params
+        self.depth = depth
+        self.started_at = datetime.now()
+        self.seconds = None
+        self.peak_mb = None
+        self.rss_delta_mb = None
+        self.sizes = {}
+
+    def to_dict(self):
+        return {
+            'stage': self.stage,
+            'params': self.params,
+            'started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'seconds': self.seconds,
+            'peak_mb': self.peak_mb,
+            'rss_delta_mb': self.rss_delta_mb,
+            'depth': self.depth,
+            **self.sizes,
+        }
+
+
+class PipelineProfile:
+    """
+    Per-stage timing and memory log of a MarketBasketAnalyzer.
+
+    Memory is measured according to memory:
+        'rss': change in process resident memory across the stage. Nearly
+            free, but it shows what the stage kept, not its transient peak.
+            Without /proc (macOS) it is the growth of the high-water mark;
+            not available on Windows.
+        'tracemalloc': exact peak of Python and NumPy allocations made during
+            the stage. Several times slower; meant for diagnosing one run.
+        None: timings only.
+    """
+
+    def __init__(self, memory='rss'):
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode: {memory}. Choose from {MEMORY_MODES}")
+        self.memory = memory
+        self.records = []
+        self._depth = 0
+        self._peaks = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        """Forget the recorded stages, e.g. at the start of each dashboard run"""
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, **params):
+        """Time the body of the with block as one stage and yield its StageRecord"""
+        record = StageRecord(name, params, self._depth)
+        tracing = self.memory == 'tracemalloc'
+        own_trace = tracing and not tracemalloc.is_tracing()
+        if own_trace:
+            tracemalloc.start()
+        elif tracing:
+            # Fold the enclosing stage's peak so far in before resetting it.
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if tracing:
+            self._peaks.append(tracemalloc.get_traced_memory()[0])
+        rss_before = _rss_mb() if self.memory == 'rss' else None
+
+        self.records.append(record)
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            self._depth -= 1
+            if tracing:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record.peak_mb = peak / 2 ** 20
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                if own_trace:
+                    tracemalloc.stop()
+            elif rss_before is not None:
+                record.rss_delta_mb = _rss_mb() - rss_before
+
+    @property
+    def total_seconds(self):
+        """Wall time of all top-level stages"""
+        return sum(record.seconds for record in self.records if record.depth == 0)
+
+    def to_frame(self):
+        """One row per stage, in start order"""
+        columns = ['stage', 'seconds', 'peak_mb', 'rss_delta_mb', 'rows', 'baskets', 'items', 'density', 'itemsets', 'rules']
+        frame = pd.DataFrame([record.to_dict() for record in self.records])
+        if frame.empty:
+            return pd.DataFrame(columns=columns)
+        ordered = [col for col in columns if col in frame.columns]
+        return frame[ordered + [col for col in frame.columns if col not in ordered]]
+
+    def to_dict(self):
+        return {
+            'memory': self.memory,
+            'total_seconds': self.total_seconds,
+            'stages': [record.to_dict() for record in self.records],
+        }
+
+    def to_json(self, path=None):
+        """Serialize the profile as JSON; also write it to path when given"""
+        payload = json.dumps(self.to_dict(), indent=2, default=str)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.write(payload)
+        return payload
+
+    def summary(self):
+        """Plain-text table of the stages for reports"""
+        lines = []
+        for record in self.records:
+            label = '  ' * record.depth + record.stage
+            if record.peak_mb is not None:
+                memory = f"{record.peak_mb:9.1f} MB"
+            elif record.rss_delta_mb is not None:
+                memory = f"{record.rss_delta_mb:+9.1f} MB"
+            else:
+                memory = ' ' * 12
+            sizes = ', '.join(
+                f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value:,}"
+                for name, value in record.sizes.items()
+            )
+            lines.append(f"{label:32s} {record.seconds:8.3f} s {memory}  {sizes}".rstrip())
+        return '\n'.join(lines)
+
+
+def profiled(stage):
+    """
+    Record every call of a method as a stage of self.profile.
+
+    Scalar arguments become the stage params and self._profile_sizes() is
+    added to its sizes.
+    """
+    def decorate(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {
+                name: value for name, value in list(bound.arguments.items())[1:]
+                if value is None or isinstance(value, (bool, int, float, str))
+            }
+            with self.profile.stage(stage, **params) as record:
+                result = method(self, *args, **kwargs)
+                record.sizes.update(self._profile_sizes())
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,274 @@
+import json
+import os
+from itertools import chain, combinations
+
+import numpy as np
+import pandas as pd
+
+from .encoding import vocabulary_array
+from .rules import encode_itemsets, take_segments
+
+RANK_METRICS = ('lift', 'confidence', 'support')
+
+_FNV_OFFSET = 14695981039346656037
+_FNV_PRIME = 1099511628211
+_MASK = (1 << 64) - 1
+
+_ARRAYS = (
+    'antecedent_keys', 'antecedent_offsets', 'antecedent_items', 'rule_bounds',
+    'consequent_offsets', 'consequent_items', 'support', 'confidence', 'lift',
+    'products', 'sorted_products', 'sorted_codes', 'in_antecedent'
+)
+
+
+def itemset_hash(codes):
+    """64-bit FNV-1a hash of sorted product codes"""
+    value = _FNV_OFFSET
+    for code in codes:
+        value = ((value ^ int(code)) * _FNV_PRIME) & _MASK
+    return value
+
+
+def _hash_itemsets(offsets, items):
+    """Vectorised itemset_hash for every itemset of an (offsets, items) column"""
+    lengths = np.diff(offsets)
+    keys = np.full(len(lengths), _FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    for position in range(int(lengths.max()) if len(lengths) else 0):
+        active = np.flatnonzero(lengths > position)
+        codes = items[offsets[active] + position].astype(np.uint64)
+        keys[active] = (keys[active] ^ codes) * prime
+    return keys
+
+
+class RuleIndex:
+    """
+    Compiled antecedent -> consequents index for serving recommendations.
+
+    Every distinct antecedent is keyed by a 64-bit hash of its sorted product
+    codes; keys are sorted so a lookup is a binary search, and each
+    antecedent owns a contiguous block of rules ordered by the ranking
+    metric. All state is flat NumPy arrays, so save writes plain .npy files
+    and load can memory-map them: serving processes share one copy of the
+    index through the page cache.
+
+    Build with RuleIndex.from_rules or MarketBasketAnalyzer.build_rule_index.
+    """
+
+    def __init__(self, arrays, rank_by='lift', max_antecedent_len=0):
+        self.rank_by = rank_by
+        self.max_antecedent_len = int(max_antecedent_len)
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def from_rules(cls, rules, products, rank_by='lift'):
+        """
+        Compile a rules frame (antecedents/consequents frozensets plus metrics).
+
+        Args:
+            rules: DataFrame shaped like MarketBasketAnalyzer.rules
+            products: product vocabulary the itemsets refer to
+            rank_by: metric used to order consequents ('lift', 'confidence', 'support')
+        """
+        if rank_by not in RANK_METRICS:
+            raise ValueError(f"Unknown rank metric: {rank_by}. Choose from {RANK_METRICS}")
+        products = pd.Index(products)
+
+        antecedent_offsets, antecedent_codes = encode_itemsets(list(rules['antecedents']), products)
+        consequent_offsets, consequent_codes = encode_itemsets(list(rules['consequents']), products)
+        keys = _hash_itemsets(antecedent_offsets, antecedent_codes)
+
+        # Group rules by antecedent (key, then the codes themselves to split
+        # hash collisions), best-ranked first inside each group.
+        score = rules[rank_by].to_numpy(dtype=float)
+        signature = _segment_signature(antecedent_offsets, antecedent_codes)
+        order = np.lexsort((-score, signature, keys))
+
+        antecedent_offsets, antecedent_codes = take_segments(antecedent_offsets, antecedent_codes, order)
+        consequent_offsets, consequent_codes = take_segments(consequent_offsets, consequent_codes, order)
+        keys = keys[order]
+        signature = signature[order]
+
+        starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]) | (signature[1:] != signature[:-1])]) \
+            if len(keys) else np.empty(0, dtype=np.int64)
+        group_offsets, group_items = take_segments(antecedent_offsets, antecedent_codes, starts)
+
+        in_antecedent = np.zeros(len(products), dtype=bool)
+        in_antecedent[group_items] = True
+        names = vocabulary_array(products)
+        sorted_codes = np.argsort(names, kind='stable')
+
+        arrays = {
+            'antecedent_keys': keys[starts],
+            'antecedent_offsets': group_offsets,
+            'antecedent_items': group_items,
+            'rule_bounds': np.r_[starts, len(keys)].astype(np.int64),
+            'consequent_offsets': consequent_offsets,
+            'consequent_items': consequent_codes,
+            'support': rules['support'].to_numpy(dtype=float)[order],
+            'confidence': rules['confidence'].to_numpy(dtype=float)[order],
+            'lift': rules['lift'].to_numpy(dtype=float)[order],
+            'products': names,
+            'sorted_products': names[sorted_codes],
+            'sorted_codes': sorted_codes,
+            'in_antecedent': in_antecedent,
+        }
+        max_len = int(np.diff(group_offsets).max()) if len(starts) else 0
+        return cls(arrays, rank_by, max_len)
+
+    def __len__(self):
+        return len(self.support)
+
+    def save(self, directory):
+        """Write the index as one .npy file per array plus a small JSON header"""
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as handle:
+            json.dump({'rank_by': self.rank_by, 'max_antecedent_len': self.max_antecedent_len}, handle)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Open an index written by save.
+
+        With mmap=True the arrays are memory-mapped read-only instead of read
+        into private memory.
+        """
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as handle:
+            header = json.load(handle)
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in _ARRAYS
+        }
+        return cls(arrays, header['rank_by'], header['max_antecedent_len'])
+
+    def encode(self, items):
+        """Product codes for known items; unknown items are skipped"""
+        items = list(items)
+        dtype = self.sorted_products.dtype
+        if dtype.kind == 'U':
+            # Casting to the fixed-width dtype would truncate longer names
+            # ('breadsticks' -> 'bread'), so those can never match.
+            width = dtype.itemsize // np.dtype('U1').itemsize
+            items = [item for item in items if len(str(item)) <= width]
+        names = np.asarray(items, dtype=dtype)
+        if len(names) == 0 or len(self.sorted_products) == 0:
+            return []
+        positions = np.searchsorted(self.sorted_products, names)
+        positions = np.minimum(positions, len(self.sorted_products) - 1)
+        found = self.sorted_products[positions] == names
+        return sorted(set(self.sorted_codes[positions[found]].tolist()))
+
+    def _find(self, codes):
+        """Position of the antecedent equal to codes, or -1"""
+        key = np.uint64(itemset_hash(codes))
+        position = int(np.searchsorted(self.antecedent_keys, key))
+        while position < len(self.antecedent_keys) and self.antecedent_keys[position] == key:
+            start, stop = self.antecedent_offsets[position], self.antecedent_offsets[position + 1]
+            if tuple(self.antecedent_items[start:stop].tolist()) == tuple(codes):
+                return position
+            position += 1
+        return -1
+
+    def matching_antecedents(self, codes):
+        """Positions of every indexed antecedent that is a subset of codes"""
+        codes = [code for code in codes if self.in_antecedent[code]]
+        matches = []
+        if len(self.antecedent_keys) == 0:
+            return matches
+        for size in range(1, min(len(codes), self.max_antecedent_len) + 1):
+            subsets = np.fromiter(chain.from_iterable(combinations(codes, size)), dtype=np.int64)
+            subsets = subsets.reshape(-1, size)
+            keys = _hash_itemsets(np.arange(0, subsets.size + 1, size), subsets.ravel())
+            positions = np.searchsorted(self.antecedent_keys, keys)
+            positions = np.minimum(positions, max(len(self.antecedent_keys) - 1, 0))
+            hit = np.flatnonzero(self.antecedent_keys[positions] == keys)
+            subsets, positions = subsets[hit], positions[hit]
+            starts = self.antecedent_offsets[positions]
+            same = self.antecedent_offsets[positions + 1] - starts == size
+            same[same] = (self.antecedent_items[starts[same, None] + np.arange(size)] == subsets[same]).all(axis=1)
+            matches.extend(positions[same].tolist())
+            for subset in subsets[~same]:
+                # Hash collision with another antecedent: scan the equal-key run.
+                position = self._find(subset.tolist())
+                if position >= 0:
+                    matches.append(position)
+        return matches
+
+    def recommend(self, cart, k=5):
+        """
+        Recommend products for a cart.
+
+        Every rule whose antecedent is contained in the cart votes for its
+        consequent products with its ranking metric; each product keeps its
+        best score and products already in the cart are skipped.
+
+        Args:
+            cart: iterable of product ids
+            k: number of recommendations
+
+        Returns:
+            List of (product, score) pairs, best first
+        """
+        cart_codes = self.encode(cart)
+        positions = np.array(self.matching_antecedents(cart_codes), dtype=np.int64)
+        if len(positions) == 0:
+            return []
+
+        rules = _expand_ranges(self.rule_bounds[positions], self.rule_bounds[positions + 1])
+        starts = self.consequent_offsets[rules]
+        lengths = self.consequent_offsets[rules + 1] - starts
+        items = self.consequent_items[_expand_ranges(starts, starts + lengths)]
+        scores = np.repeat(np.asarray(getattr(self, self.rank_by))[rules], lengths)
+
+        keep = ~np.isin(items, cart_codes)
+        items, scores = items[keep], scores[keep]
+        order = np.lexsort((items, -scores))
+        items, scores = items[order], scores[order]
+        # After sorting by score, the first occurrence of a product is its best vote.
+        _, first = np.unique(items, return_index=True)
+        best = np.sort(first)[:k]
+        return [(self.products[items[index]].item(), float(scores[index])) for index in best]
+
+    def rules_for(self, antecedent, limit=None):
+        """
+        Rules with exactly this antecedent, best-ranked first.
+
+        Returns:
+            DataFrame with consequents (tuples of product ids) and metrics
+        """
+        codes = self.encode(antecedent)
+        position = self._find(codes) if len(codes) == len(set(antecedent)) and codes else -1
+        if position < 0:
+            return pd.DataFrame(columns=['consequents', 'support', 'confidence', 'lift'])
+
+        start, stop = int(self.rule_bounds[position]), int(self.rule_bounds[position + 1])
+        if limit is not None:
+            stop = min(stop, start + limit)
+        consequents = [
+            tuple(self.products[self.consequent_items[
+                self.consequent_offsets[rule]:self.consequent_offsets[rule + 1]]].tolist())
+            for rule in range(start, stop)
+        ]
+        return pd.DataFrame({
+            'consequents': consequents,
+            'support': np.asarray(self.support[start:stop]),
+            'confidence': np.asarray(self.confidence[start:stop]),
+            'lift': np.asarray(self.lift[start:stop]),
+        })
+
+
+def _expand_ranges(starts, stops):
+    """Concatenate arange(start, stop) for every pair"""
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+def _segment_signature(offsets, items):
+    """Collision-free integer id per distinct segment content"""
+    segments = [tuple(items[start:stop].tolist()) for start, stop in zip(offsets[:-1], offsets[1:])]
+    return pd.factorize(pd.Series(segments, dtype=object))[0]
@@ -0,0 +1,229 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+RULE_COLUMNS = [
+    'antecedents', 'consequents', 'antecedent support', 'consequent support',
+    'support', 'confidence', 'lift', 'leverage', 'conviction', 'zhangs_metric'
+]
+
+
+class SupportIndex:
+    """
+    Hash index from integer-coded itemsets to their basket counts.
+
+    Single items live in a dense array indexed by product code; longer
+    itemsets are looked up per length through a pandas MultiIndex hash table,
+    so a whole batch of subsets is resolved with one get_indexer call.
+    """
+
+    def __init__(self, lattice):
+        self.n_baskets = lattice.n_baskets
+        self._singles = np.full(len(lattice.products), -1, dtype=np.int64)
+        self._levels = {}
+
+        for length in range(1, lattice.max_length + 1):
+            positions, rows = lattice.by_length(length)
+            if len(positions) == 0:
+                continue
+            counts = lattice.counts[positions]
+            if length == 1:
+                self._singles[rows[:, 0]] = counts
+            else:
+                index = pd.MultiIndex.from_arrays([rows[:, col] for col in range(length)])
+                self._levels[length] = (index, counts)
+
+    def lookup(self, rows):
+        """
+        Return the basket count of every row of an (m, k) code array.
+
+        Itemsets missing from the index get -1.
+        """
+        if rows.shape[1] == 1:
+            return self._singles[rows[:, 0]]
+        level = self._levels.get(rows.shape[1])
+        if level is None:
+            return np.full(len(rows), -1, dtype=np.int64)
+
+        index, counts = level
+        found = index.get_indexer(pd.MultiIndex.from_arrays([rows[:, col] for col in range(rows.shape[1])]))
+        return np.where(found >= 0, counts[found], -1)
+
+
+def _rule_metrics(counts, antecedent_counts, consequent_counts, n_baskets):
+    support = counts / n_baskets
+    antecedent_support = antecedent_counts / n_baskets
+    consequent_support = consequent_counts / n_baskets
+    confidence = support / antecedent_support
+    lift = confidence / consequent_support
+    leverage = support - antecedent_support * consequent_support
+
+    conviction = np.full(len(counts), np.inf)
+    finite = confidence < 1.0
+    conviction[finite] = (1 - consequent_support[finite]) / (1 - confidence[finite])
+
+    denominator = np.maximum(support * (1 - antecedent_support),
+                             antecedent_support * (consequent_support - support))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zhangs_metric = np.where(denominator == 0, 0.0, leverage / denominator)
+
+    return {
+        'antecedent support': antecedent_support,
+        'consequent support': consequent_support,
+        'support': support,
+        'confidence': confidence,
+        'lift': lift,
+        'leverage': leverage,
+        'conviction': conviction,
+        'zhangs_metric': zhangs_metric,
+    }
+
+
+def encode_itemsets(itemsets, products):
+    """
+    Encode a column of product-name itemsets as (offsets, codes) arrays.
+
+    Codes are sorted inside every itemset, so equal itemsets get equal
+    code runs whatever the iteration order of the frozensets.
+
+    Returns:
+        offsets (int64, len + 1) into a flat int32 array of product codes
+    """
+    lengths = np.fromiter((len(itemset) for itemset in itemsets), dtype=np.int64, count=len(itemsets))
+    offsets = np.zeros(len(itemsets) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes = products.get_indexer([item for itemset in itemsets for item in itemset]).astype(np.int32)
+    segment = np.repeat(np.arange(len(itemsets)), lengths)
+    return offsets, codes[np.lexsort((codes, segment))]
+
+
+def decode_itemsets(offsets, codes, names):
+    """Rebuild frozensets of names from (offsets, codes), one per distinct itemset"""
+    cache = {}
+    codes = codes.tolist()
+    itemsets = []
+    for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        key = tuple(codes[start:stop])
+        itemset = cache.get(key)
+        if itemset is None:
+            itemset = frozenset(names[code] for code in key)
+            cache[key] = itemset
+        itemsets.append(itemset)
+    return itemsets
+
+
+def rule_arrays(lattice, min_confidence=0.0, min_lift=None):
+    """
+    Generate association rules from an ItemsetLattice in batched NumPy.
+
+    Itemsets are processed one length at a time as (m, k) code arrays. For
+    each antecedent/consequent split of the k columns, the subset supports
+    are fetched in one vectorised hash lookup and every metric is computed
+    for all m itemsets at once. Confidence and lift thresholds are applied in
+    the same pass. No Python object is created per rule: itemsets stay code
+    arrays, sorted inside every itemset.
+
+    Args:
+        lattice: ItemsetLattice of frequent itemsets (downward closed)
+        min_confidence: minimum rule confidence
+        min_lift: optional minimum rule lift
+
+    Returns:
+        (antecedent_offsets, antecedent_codes, consequent_offsets,
+        consequent_codes, metrics): int64 offsets into flat int32 codes per
+        side, and a dict of float arrays keyed by the metric columns of
+        RULE_COLUMNS, rules in lattice order
+    """
+    index = SupportIndex(lattice)
+    n_baskets = max(lattice.n_baskets, 1)
+    batches = []
+
+    for length in range(2, lattice.max_length + 1):
+        positions, rows = lattice.by_length(length)
+        if len(positions) == 0:
+            continue
+        counts = lattice.counts[positions]
+        subset_counts = {}
+
+        def counts_for(columns):
+            if columns not in subset_counts:
+                subset_counts[columns] = index.lookup(rows[:, list(columns)])
+            return subset_counts[columns]
+
+        all_columns = tuple(range(length))
+        for antecedent_size in range(length - 1, 0, -1):
+            for antecedent in combinations(all_columns, antecedent_size):
+                consequent = tuple(col for col in all_columns if col not in antecedent)
+                antecedent_counts = counts_for(antecedent)
+                consequent_counts = counts_for(consequent)
+
+                known = (antecedent_counts > 0) & (consequent_counts > 0)
+                batch = _rule_metrics(
+                    counts[known], antecedent_counts[known], consequent_counts[known], n_baskets
+                )
+                keep = batch['confidence'] >= min_confidence
+                if min_lift is not None:
+                    keep &= batch['lift'] >= min_lift
+                if not keep.any():
+                    continue
+
+                kept_rows = rows[known][keep]
+                batches.append((
+                    positions[known][keep],
+                    kept_rows[:, list(antecedent)],
+                    kept_rows[:, list(consequent)],
+                    {metric: values[keep] for metric, values in batch.items()},
+                ))
+
+    metric_columns = RULE_COLUMNS[2:]
+    if not batches:
+        empty_offsets = np.zeros(1, dtype=np.int64)
+        empty_codes = np.zeros(0, dtype=np.int32)
+        return (empty_offsets, empty_codes, empty_offsets.copy(), empty_codes.copy(),
+                {metric: np.zeros(0) for metric in metric_columns})
+
+    order = np.argsort(np.concatenate([batch[0] for batch in batches]), kind='stable')
+    sides = []
+    for side in (1, 2):
+        lengths = np.concatenate([np.full(len(batch[side]), batch[side].shape[1]) for batch in batches])
+        codes = np.concatenate([batch[side].ravel() for batch in batches]).astype(np.int32)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        sides.extend(take_segments(offsets, codes, order))
+    metrics = {metric: np.concatenate([batch[3][metric] for batch in batches])[order] for metric in metric_columns}
+    return (*sides, metrics)
+
+
+def take_segments(offsets, codes, positions):
+    """(offsets, codes) of the itemsets at positions, in that order"""
+    starts, stops = offsets[positions], offsets[positions + 1]
+    lengths = stops - starts
+    new_offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, codes[gather]
+
+
+def rules_frame(products, antecedent_offsets, antecedent_codes, consequent_offsets, consequent_codes, metrics):
+    """Rules frame with frozenset itemsets, as produced by generate_rules"""
+    if len(antecedent_offsets) == 1:
+        return pd.DataFrame({col: pd.Series(dtype=object if col in RULE_COLUMNS[:2] else float)
+                             for col in RULE_COLUMNS})
+    names = pd.Index(products).tolist()
+    rules = {
+        'antecedents': decode_itemsets(antecedent_offsets, antecedent_codes, names),
+        'consequents': decode_itemsets(consequent_offsets, consequent_codes, names),
+    }
+    rules.update(metrics)
+    return pd.DataFrame(rules, columns=RULE_COLUMNS)
+
+
+def rules_from_lattice(lattice, min_confidence=0.0, min_lift=None):
+    """
+    Generate association rules from an ItemsetLattice (see rule_arrays).
+
+    Returns:
+        DataFrame with mlxtend's association_rules columns
+    """
+    return rules_frame(lattice.products, *rule_arrays(lattice, min_confidence, min_lift))
@@ -0,0 +1,225 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from .encoding import vocabulary_array
+from .rules import RULE_COLUMNS, encode_itemsets, rule_arrays, rules_frame, take_segments
+
+METRIC_COLUMNS = RULE_COLUMNS[2:]
+ITEMSET_COLUMNS = RULE_COLUMNS[:2]
+
+
+class RuleLabels:
+    """
+    Lazy ', '-joined item names of one itemset column of a RuleStore.
+
+    Nothing is rendered up front; indexing with a position or an array of
+    positions renders only those rules, and each distinct itemset is
+    joined once.
+    """
+
+    def __init__(self, offsets, codes, names, separator=', '):
+        self.offsets = offsets
+        self.codes = codes
+        self.names = names
+        self.separator = separator
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _render(self, position):
+        start, stop = self.offsets[position], self.offsets[position + 1]
+        key = tuple(self.codes[start:stop].tolist())
+        label = self._cache.get(key)
+        if label is None:
+            label = self.separator.join(str(self.names[code]) for code in key)
+            self._cache[key] = label
+        return label
+
+    def __getitem__(self, positions):
+        if np.isscalar(positions):
+            return self._render(int(positions))
+        return [self._render(position) for position in np.arange(len(self))[positions].tolist()]
+
+    def to_list(self):
+        return self[:]
+
+
+class RuleStore:
+    """
+    Columnar association rules: item-code offset arrays plus metric arrays.
+
+    Antecedents and consequents are each an int64 offsets array into a
+    flat int32 array of product codes, and every metric of RULE_COLUMNS is
+    a float64 array, so a million rules take a few dozen megabytes and
+    sorting, top-k and export never touch Python sets. Item names are only
+    rendered on demand through labels() and display().
+
+    Build with RuleStore.from_frame or MarketBasketAnalyzer.rule_store.
+    """
+
+    def __init__(self, products, antecedent_offsets, antecedent_codes, consequent_offsets,
+                 consequent_codes, metrics):
+        self.products = pd.Index(products)
+        self.antecedent_offsets = antecedent_offsets
+        self.antecedent_codes = antecedent_codes
+        self.consequent_offsets = consequent_offsets
+        self.consequent_codes = consequent_codes
+        self.metrics = metrics
+
+    @classmethod
+    def from_frame(cls, rules, products):
+        """Encode a rules frame (antecedents/consequents frozensets plus metrics)"""
+        products = pd.Index(products)
+        antecedent_offsets, antecedent_codes = encode_itemsets(list(rules['antecedents']), products)
+        consequent_offsets, consequent_codes = encode_itemsets(list(rules['consequents']), products)
+        metrics = {col: rules[col].to_numpy(dtype=float) for col in METRIC_COLUMNS}
+        return cls(products, antecedent_offsets, antecedent_codes, consequent_offsets,
+                   consequent_codes, metrics)
+
+    @classmethod
+    def from_lattice(cls, lattice, min_confidence=0.0, min_lift=None):
+        """Generate rules straight into a store (see rules.rule_arrays)"""
+        return cls(lattice.products, *rule_arrays(lattice, min_confidence, min_lift))
+
+    def __len__(self):
+        return len(self.antecedent_offsets) - 1
+
+    def _itemsets(self, side):
+        if side == 'antecedents':
+            return self.antecedent_offsets, self.antecedent_codes
+        if side == 'consequents':
+            return self.consequent_offsets, self.consequent_codes
+        raise ValueError(f"Unknown itemset column: {side}. Choose from {ITEMSET_COLUMNS}")
+
+    def order(self, metric='lift', ascending=False):
+        """Rule positions sorted by metric (stable, so ties keep rule order)"""
+        values = self.metrics[metric]
+        return np.argsort(values if ascending else -values, kind='stable')
+
+    def top(self, k=10, metric='lift'):
+        """Positions of the k rules with the highest metric, best first"""
+        values = self.metrics[metric]
+        if k < len(values):
+            candidates = np.argpartition(-values, k - 1)[:k]
+        else:
+            candidates = np.arange(len(values))
+        return candidates[np.lexsort((candidates, -values[candidates]))]
+
+    def take(self, positions):
+        """New store holding the given rules in the given order"""
+        positions = np.asarray(positions, dtype=np.int64)
+        columns = []
+        for side in ITEMSET_COLUMNS:
+            columns.extend(take_segments(*self._itemsets(side), positions))
+        metrics = {col: values[positions] for col, values in self.metrics.items()}
+        return RuleStore(self.products, *columns, metrics)
+
+    def labels(self, side, separator=', '):
+        """Lazy string view of the antecedents or consequents column"""
+        offsets, codes = self._itemsets(side)
+        return RuleLabels(offsets, codes, self.products.tolist(), separator)
+
+    def display(self, positions=None, separator=', '):
+        """
+        Rules as strings and metrics, rendering only the given positions.
+
+        Returns:
+            DataFrame with antecedents and consequents as joined item names
+        """
+        positions = np.arange(len(self)) if positions is None else np.asarray(positions, dtype=np.int64)
+        frame = {side: self.labels(side, separator)[positions] for side in ITEMSET_COLUMNS}
+        frame.update({col: values[positions] for col, values in self.metrics.items()})
+        return pd.DataFrame(frame, columns=RULE_COLUMNS)
+
+    def to_frame(self, positions=None):
+        """Rules frame with frozenset itemsets, as produced by generate_rules"""
+        store = self if positions is None else self.take(positions)
+        return rules_frame(store.products, *store._itemsets('antecedents'), *store._itemsets('consequents'),
+                           store.metrics)
+
+    def to_csv(self, path_or_buf=None, separator=', '):
+        """Write the rules with joined item names; returns the text when no path is given"""
+        return self.display(separator=separator).to_csv(path_or_buf, index=False)
+
+    def save(self, file):
+        """Write the store as an uncompressed .npz file"""
+        np.savez(
+            file,
+            antecedent_offsets=self.antecedent_offsets,
+            antecedent_codes=self.antecedent_codes,
+            consequent_offsets=self.consequent_offsets,
+            consequent_codes=self.consequent_codes,
+            products=vocabulary_array(self.products),
+            **{f'metric_{position}': self.metrics[col] for position, col in enumerate(METRIC_COLUMNS)}
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Read a store written by save"""
+        with np.load(file) as data:
+            metrics = {col: data[f'metric_{position}'] for position, col in enumerate(METRIC_COLUMNS)}
+            return cls(
+                data['products'], data['antecedent_offsets'], data['antecedent_codes'],
+                data['consequent_offsets'], data['consequent_codes'], metrics
+            )
+
+    def to_arrow(self):
+        """
+        Arrow table with list itemset columns and float64 metrics.
+
+        The item lists are built from the offsets and a single take of the
+        product names, so no per-rule Python objects are created. Items keep
+        the vocabulary's dtype (strings, or numeric ids). Requires pyarrow.
+        """
+        import pyarrow as pa
+
+        names = pa.array(vocabulary_array(self.products))
+        columns = {}
+        for side in ITEMSET_COLUMNS:
+            offsets, codes = self._itemsets(side)
+            columns[side] = pa.ListArray.from_arrays(
+                pa.array(offsets.astype(np.int32)), names.take(pa.array(codes))
+            )
+        columns.update({col: pa.array(values) for col, values in self.metrics.items()})
+        return pa.table(columns)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Rebuild a store from a table written by to_arrow"""
+        columns = {}
+        for side in ITEMSET_COLUMNS:
+            lists = table.column(side).combine_chunks()
+            columns[side] = (np.asarray(lists.offsets, dtype=np.int64),
+                             lists.flatten().to_numpy(zero_copy_only=False))
+        products = pd.Index(np.unique(np.concatenate([values for _, values in columns.values()])))
+        encoded = []
+        for side in ITEMSET_COLUMNS:
+            offsets, values = columns[side]
+            encoded.extend([offsets - offsets[0], products.get_indexer(values).astype(np.int32)])
+        metrics = {col: table.column(col).to_numpy() for col in METRIC_COLUMNS}
+        return cls(products, *encoded, metrics)
+
+    def to_parquet(self, path=None, compression='zstd'):
+        """
+        Write the rules as Parquet (item names dictionary-encoded by the writer).
+
+        Returns the file contents as bytes when no path is given.
+        """
+        import pyarrow.parquet as pq
+
+        if path is not None:
+            pq.write_table(self.to_arrow(), path, compression=compression)
+            return None
+        buffer = io.BytesIO()
+        pq.write_table(self.to_arrow(), buffer, compression=compression)
+        return buffer.getvalue()
+
+    @classmethod
+    def read_parquet(cls, path):
+        """Read rules written by to_parquet"""
+        import pyarrow.parquet as pq
+
+        return cls.from_arrow(pq.read_table(path))
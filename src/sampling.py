@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+
+from .incremental import negative_border
+from .mining import ItemsetLattice, choose_algorithm, count_itemsets, eclat, fpgrowth, min_count_for_support
+
+_ENGINES = {'fpgrowth': fpgrowth, 'eclat': eclat}
+
+
+def sample_size(min_support, confidence=0.95):
+    """
+    Baskets to sample so an itemset at min_support is rarely underestimated by half.
+
+    By the multiplicative Chernoff bound, P(sample support <= (1 - e) * s)
+    <= exp(-e^2 * n * s / 2); with e = 1/2 and delta = 1 - confidence this
+    gives n = 8 * ln(1 / delta) / min_support. Unlike an additive bound the
+    size shrinks as the threshold grows and stays modest for small ones.
+    """
+    return int(math.ceil(8 * math.log(1 / (1 - confidence)) / min_support))
+
+
+def support_bounds(counts, n_baskets, confidence=0.95):
+    """
+    Wilson score interval of the support behind each sample count.
+
+    The interval holds for each itemset separately at the given confidence,
+    not simultaneously for all of them.
+
+    Returns:
+        (lower, upper) float arrays
+    """
+    from scipy import stats
+
+    counts = np.asarray(counts, dtype=float)
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    p = counts / n_baskets
+    denominator = 1 + z ** 2 / n_baskets
+    center = (p + z ** 2 / (2 * n_baskets)) / denominator
+    half = z * np.sqrt(p * (1 - p) / n_baskets + z ** 2 / (4 * n_baskets ** 2)) / denominator
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+
+def count_in_chunks(matrix, itemsets, chunk_size=100_000):
+    """count_itemsets over row blocks of matrix, so only one block is unpacked at a time"""
+    counts = np.zeros(len(itemsets), dtype=np.int64)
+    for start in range(0, matrix.shape[0], chunk_size):
+        counts += count_itemsets(matrix[start:start + chunk_size], itemsets)
+    return counts
+
+
+def sample_itemsets(basket_matrix, min_support, sample=None, verify=False, algorithm='fpgrowth',
+                    max_len=None, confidence=0.95, seed=None, chunk_size=100_000):
+    """
+    Approximate frequent itemsets from a random sample of baskets.
+
+    The sample is mined at min_support * (1 - epsilon), where the relative
+    Chernoff margin epsilon = sqrt(2 * ln(1 / delta) / (n_sample *
+    min_support)) makes an itemset at min_support fall below it with
+    probability at most delta = 1 - confidence. The threshold is never
+    lowered below half of min_support. This is the lowering step of
+    Toivonen's sampling algorithm.
+
+    Without verification the itemsets whose sample support reaches
+    min_support are returned with sample counts; the lattice then
+    describes the sample, and support_lower / support_upper give a Wilson
+    interval for the true support of each one.
+
+    With verify=True the candidates and their negative border are counted
+    in one pass over the full matrix, in row blocks of chunk_size. Counts
+    are then exact and the bounds collapse onto the support. A border
+    itemset turning out frequent means the sample missed something: it is
+    added, but its supersets were never counted, so report['complete'] is
+    False.
+
+    Args:
+        basket_matrix: BasketMatrix to mine
+        min_support: minimum support as a fraction of baskets
+        sample: baskets to sample, as a fraction (<= 1) or a count; defaults
+            to sample_size(min_support, confidence)
+        verify: count the candidates on the full data
+        algorithm: 'fpgrowth' or 'eclat' ('apriori'/'auto' pick one)
+        max_len: optional maximum itemset length
+        confidence: confidence level of the bounds and the lowered threshold
+        seed: seed for the basket sample
+        chunk_size: rows per block of the verification pass
+
+    Returns:
+        (lattice, lower, upper, report), where lower and upper are aligned
+        with the lattice and report is a dict describing the run
+    """
+    if algorithm not in _ENGINES:
+        algorithm = choose_algorithm(basket_matrix)
+
+    n_baskets = basket_matrix.n_baskets
+    if sample is None:
+        n_sample = sample_size(min_support, confidence)
+    elif sample <= 1:
+        n_sample = int(math.ceil(sample * n_baskets))
+    else:
+        n_sample = int(sample)
+    n_sample = max(min(n_sample, n_baskets), 1)
+
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(n_baskets, size=n_sample, replace=False))
+    matrix = basket_matrix.matrix[rows]
+
+    epsilon = math.sqrt(2 * math.log(1 / (1 - confidence)) / (n_sample * min_support))
+    lowered = min_support * max(1 - epsilon, 0.5)
+    lowered_count = min_count_for_support(lowered, n_sample)
+    candidates = dict(_ENGINES[algorithm](matrix, lowered_count, max_len))
+
+    report = {
+        'baskets': n_baskets,
+        'sample_baskets': n_sample,
+        'epsilon': epsilon,
+        'lowered_support': lowered_count / n_sample,
+        'candidates': len(candidates),
+        'verified': verify,
+        'border': 0,
+        'border_misses': 0,
+        'complete': False,
+    }
+
+    if not verify:
+        min_count = min_count_for_support(min_support, n_sample)
+        lattice = ItemsetLattice.from_itemsets(
+            ((codes, count) for codes, count in candidates.items() if count >= min_count),
+            n_sample, basket_matrix.products, min_count
+        )
+        lower, upper = support_bounds(lattice.counts, n_sample, confidence)
+        return lattice, lower, upper, report
+
+    candidate_codes = [tuple(sorted(codes)) for codes in candidates]
+    border = negative_border(set(candidate_codes), len(basket_matrix.products), max_len)
+    counts = count_in_chunks(basket_matrix.matrix, candidate_codes + border, chunk_size)
+
+    min_count = min_count_for_support(min_support, n_baskets)
+    frequent = counts >= min_count
+    misses = int(frequent[len(candidate_codes):].sum())
+    report.update({'border': len(border), 'border_misses': misses, 'complete': misses == 0})
+
+    all_codes = candidate_codes + border
+    lattice = ItemsetLattice.from_itemsets(
+        ((all_codes[position], int(counts[position])) for position in np.flatnonzero(frequent)),
+        n_baskets, basket_matrix.products, min_count
+    )
+    support = lattice.supports
+    return lattice, support, support.copy(), report
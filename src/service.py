@@ -0,0 +1,358 @@
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .mining import ItemsetLattice
+from .recommend import RuleIndex
+from .rules import SupportIndex
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+_MAX_BODY = 1 << 20
+
+
+class ServingModel:
+    """
+    Read-only query model: a RuleIndex plus the frequent itemset supports.
+
+    A model is immutable once built, so the service can swap in a new one
+    while requests against the old one are still being answered.
+
+    Args:
+        rule_index: RuleIndex compiled from the mined rules
+        lattice: ItemsetLattice the rules were generated from
+    """
+
+    def __init__(self, rule_index, lattice):
+        self.rule_index = rule_index
+        self.lattice = lattice
+        self.support_index = SupportIndex(lattice)
+
+    @classmethod
+    def from_analyzer(cls, analyzer, rank_by='lift'):
+        """Build a model from an analyzer that has already generated rules"""
+        return cls(analyzer.build_rule_index(rank_by=rank_by), analyzer._itemset_lattice())
+
+    def save(self, directory):
+        """Write the rule index and itemsets under directory"""
+        self.rule_index.save(os.path.join(directory, 'rules'))
+        self.lattice.save(os.path.join(directory, 'itemsets.npz'))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a model written by save; the rule index is memory-mapped by default"""
+        rule_index = RuleIndex.load(os.path.join(directory, 'rules'), mmap=mmap)
+        lattice = ItemsetLattice.load(os.path.join(directory, 'itemsets.npz'))
+        return cls(rule_index, lattice)
+
+    def recommend(self, items, k=5):
+        return {
+            'items': sorted(items),
+            'recommendations': [
+                {'product': product, 'score': score}
+                for product, score in self.rule_index.recommend(items, k=k)
+            ],
+        }
+
+    def rules(self, antecedent, limit=20):
+        frame = self.rule_index.rules_for(antecedent, limit=limit)
+        return {
+            'antecedent': sorted(antecedent),
+            'rank_by': self.rule_index.rank_by,
+            'rules': [
+                {'consequents': list(row.consequents), 'support': row.support,
+                 'confidence': row.confidence, 'lift': row.lift}
+                for row in frame.itertuples(index=False)
+            ],
+        }
+
+    def itemset_support(self, items):
+        """Support of an itemset, or None when it is not frequent (or unknown)"""
+        codes = self.rule_index.encode(items)
+        count = -1
+        if codes and len(codes) == len(set(items)) and len(codes) <= self.lattice.max_length:
+            count = int(self.support_index.lookup(np.array([codes]))[0])
+        return {
+            'items': sorted(items),
+            'support': count / self.lattice.n_baskets if count >= 0 else None,
+            'count': count if count >= 0 else None,
+        }
+
+
+def _to_python(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class RecommendationService:
+    """
+    Asyncio front end that answers queries against a ServingModel.
+
+    Requests are not evaluated one by one: they are queued and a single
+    worker drains the queue in micro-batches (up to max_batch requests, or
+    whatever arrived within batch_window seconds), evaluating each batch in
+    one thread hop. Identical queries inside a batch are computed once, and
+    answers are kept in an LRU result cache that is dropped when the model
+    changes.
+
+    reload swaps the model atomically: a batch that already started keeps
+    the model it captured, so no request is dropped or answered by a mix of
+    both models.
+
+    Args:
+        model: ServingModel to serve
+        model_dir: directory the model was loaded from (used by reload())
+        batch_window: seconds to wait for more requests before evaluating a batch
+        max_batch: maximum number of requests evaluated together
+        cache_size: number of answers kept in the result cache
+    """
+
+    def __init__(self, model, model_dir=None, batch_window=0.001, max_batch=64, cache_size=4096):
+        self.model = model
+        self.model_dir = model_dir
+        self.version = 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.stats = {'requests': 0, 'cache_hits': 0, 'batches': 0, 'reloads': 0}
+        self._cache = OrderedDict()
+        self._queue = None
+        self._worker = None
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Start the batch worker and listen for HTTP connections"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._drain())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def serve_forever(self, host='127.0.0.1', port=8080):
+        address = await self.start(host, port)
+        print(f"Serving recommendations on http://{address[0]}:{address[1]}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def reload(self, model=None):
+        """
+        Swap in a new model.
+
+        Without an argument the model is re-read from model_dir (in a worker
+        thread, so requests keep being served while it loads).
+        """
+        if model is None:
+            if self.model_dir is None:
+                raise ValueError("No model directory to reload from")
+            model = await asyncio.to_thread(ServingModel.load, self.model_dir)
+        self.model = model
+        self.version += 1
+        self._cache.clear()
+        self.stats['reloads'] += 1
+        return self.version
+
+    async def query(self, kind, *args):
+        """Answer one query ('recommend', 'rules' or 'itemset-support')"""
+        self.stats['requests'] += 1
+        key = (kind, self.version) + args
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return self._cache[key]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, future))
+        return await future
+
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_window > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self.stats['batches'] += 1
+            model, version = self.model, self.version
+            keys = list(dict.fromkeys(key for key, _ in batch))
+            answers = await asyncio.to_thread(self._evaluate, model, keys)
+            for key, future in batch:
+                answer = answers[key]
+                if future.done():
+                    continue
+                if isinstance(answer, Exception):
+                    future.set_exception(answer)
+                else:
+                    future.set_result(answer)
+            if version == self.version:
+                self._remember(answers)
+
+    @staticmethod
+    def _evaluate(model, keys):
+        answers = {}
+        for key in keys:
+            kind, _, *args = key
+            try:
+                if kind == 'recommend':
+                    answers[key] = model.recommend(list(args[0]), k=args[1])
+                elif kind == 'rules':
+                    answers[key] = model.rules(list(args[0]), limit=args[1])
+                else:
+                    answers[key] = model.itemset_support(list(args[0]))
+            except Exception as error:
+                answers[key] = error
+        return answers
+
+    def _remember(self, answers):
+        for key, answer in answers.items():
+            if isinstance(answer, Exception):
+                continue
+            self._cache[key] = answer
+            self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def handle(self, method, path, body=b''):
+        """
+        Route one HTTP request.
+
+        Returns:
+            (status, payload) tuple; payload is JSON-serializable
+        """
+        url = urlsplit(path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if body:
+            try:
+                params.update(json.loads(body))
+            except (ValueError, TypeError):
+                return 400, {'error': 'Request body must be a JSON object'}
+
+        if url.path == '/health':
+            return 200, {'status': 'ok', 'version': self.version, 'rules': len(self.model.rule_index),
+                         **self.stats}
+        if url.path == '/reload':
+            if method != 'POST':
+                return 405, {'error': 'Use POST /reload'}
+            try:
+                return 200, {'version': await self.reload()}
+            except (OSError, ValueError) as error:
+                return 503, {'error': f"Reload failed: {error}"}
+
+        routes = {'/recommend': ('recommend', 'k', 5), '/rules': ('rules', 'limit', 20),
+                  '/itemset-support': ('itemset-support', None, None)}
+        if url.path not in routes:
+            return 404, {'error': f"Unknown endpoint: {url.path}"}
+        kind, count_name, default = routes[url.path]
+
+        items = params.get('items', params.get('antecedent'))
+        if isinstance(items, str):
+            items = [item for item in items.split(',') if item]
+        if not isinstance(items, list) or not items:
+            return 400, {'error': 'Pass the products as items=a,b or a JSON list'}
+        args = (tuple(sorted(set(map(str, items)))),)
+        if count_name is not None:
+            try:
+                count = int(params.get(count_name, default))
+            except (TypeError, ValueError):
+                return 400, {'error': f"{count_name} must be an integer"}
+            if count < 1:
+                return 400, {'error': f"{count_name} must be at least 1"}
+            args += (count,)
+
+        try:
+            return 200, await self.query(kind, *args)
+        except ValueError as error:
+            return 400, {'error': str(error)}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be skipped, so
+                    # the connection is closed after the error.
+                    status, payload = 400, {'error': 'Content-Length must be a non-negative integer'}
+                    keep_alive = False
+                elif length > _MAX_BODY:
+                    status, payload = 413, {'error': 'Request body too large'}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = await self.handle(method, path, body)
+                    except Exception as error:
+                        status, payload = 500, {'error': str(error)}
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                content = json.dumps(payload, default=_to_python).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve recommendations from a saved ServingModel')
+    parser.add_argument('model_dir', help='directory written by ServingModel.save')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-window', type=float, default=0.001)
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    service = RecommendationService(
+        ServingModel.load(args.model_dir), model_dir=args.model_dir,
+        batch_window=args.batch_window, max_batch=args.max_batch
+    )
+    asyncio.run(service.serve_forever(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
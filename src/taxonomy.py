@@ -0,0 +1,268 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .mining import ItemsetLattice, count_itemsets, fpgrowth, min_count_for_support
+from .rules import RULE_COLUMNS, rules_from_lattice
+
+
+class Taxonomy:
+    """
+    Item -> category hierarchy used for generalized (multi-level) mining.
+
+    Built from a child -> parent mapping. Categories may have parents of
+    their own ('tropical fruit' -> 'fruit' -> 'fresh produce'); products
+    missing from the mapping simply have no ancestors.
+    """
+
+    def __init__(self, parents):
+        parents = pd.Series(parents, dtype=object).dropna()
+        self.parents = dict(zip(parents.index, parents.to_numpy()))
+        self._ancestors = {}
+        for child in self.parents:
+            self.ancestors(child)
+
+    @classmethod
+    def from_frame(cls, frame, item_col='product_id', category_col='category'):
+        """Taxonomy from the distinct (item, category) pairs of a DataFrame"""
+        pairs = frame[[item_col, category_col]].dropna().drop_duplicates(item_col)
+        return cls(pd.Series(pairs[category_col].to_numpy(), index=pairs[item_col].to_numpy()))
+
+    @property
+    def categories(self):
+        return sorted({category for child in self.parents for category in self.ancestors(child)}, key=str)
+
+    def ancestors(self, node):
+        """Ancestors of node, nearest first"""
+        chain = self._ancestors.get(node)
+        if chain is None:
+            chain = []
+            parent = self.parents.get(node)
+            while parent is not None:
+                if parent == node or parent in chain:
+                    raise ValueError(f"Taxonomy has a cycle through {parent}")
+                chain.append(parent)
+                parent = self.parents.get(parent)
+            chain = tuple(chain)
+            self._ancestors[node] = chain
+        return chain
+
+    def extend(self, basket_matrix):
+        """
+        Append one column per category to a basket matrix.
+
+        A basket holds a category when it holds any product below it, so the
+        category columns are the boolean product of the basket matrix with the
+        product x category membership matrix.
+
+        Returns:
+            (matrix, nodes, parents): the extended CSR matrix, an Index of
+            products followed by categories, and the parent code of every
+            node (-1 for roots)
+        """
+        products = basket_matrix.products
+        categories = pd.Index(self.categories)
+        if products.isin(categories).any():
+            raise ValueError("Category names must differ from product ids")
+
+        nodes = products.append(categories)
+        n_products = len(products)
+        parents = np.full(len(nodes), -1, dtype=np.int64)
+        rows, columns = [], []
+        for code, node in enumerate(nodes):
+            chain = self.ancestors(node)
+            if not chain:
+                continue
+            chain_codes = categories.get_indexer(chain)
+            parents[code] = n_products + chain_codes[0]
+            if code < n_products:
+                rows.extend([code] * len(chain))
+                columns.extend(chain_codes.tolist())
+
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, columns)), shape=(n_products, len(categories))
+        )
+        rolled = basket_matrix.matrix.astype(np.int32) @ membership
+        matrix = sparse.hstack([basket_matrix.matrix, rolled > 0], format='csr', dtype=bool)
+        matrix.sort_indices()
+        return matrix, nodes, parents
+
+
+def _generalizations(candidate, parents, ancestors):
+    """Itemsets replacing one member of candidate by its parent, skipping ones that repeat a node"""
+    for position, code in enumerate(candidate):
+        parent = parents[code]
+        if parent < 0:
+            continue
+        rest = candidate[:position] + candidate[position + 1:]
+        if any(other == parent or parent in ancestors[other] or other in ancestors[parent] for other in rest):
+            continue
+        yield tuple(sorted(rest + (parent,)))
+
+
+def taxonomy_itemsets(basket_matrix, taxonomy, min_support, item_support=None, max_categories=1,
+                      max_len=None):
+    """
+    Frequent generalized itemsets over products and their categories.
+
+    Mining is level-wise over the extended matrix (see Taxonomy.extend) and
+    top-down through the hierarchy, following Srikant & Agrawal's Cumulate
+    and Han & Fu's multi-level mining:
+
+    - a node is only kept when its parent category is frequent, so the
+      products of an infrequent category are never counted
+    - a candidate is only counted when every subset and every
+      generalization (one member replaced by its parent) is frequent;
+      candidates are counted in order of depth so generalizations come first
+    - itemsets holding a node together with one of its ancestors are never
+      formed, since their support is that of the itemset without the ancestor
+    - cross-level itemsets (products and categories together) hold at most
+      max_categories categories. Categories are dense, so adding more of
+      them to a product itemset mostly restates category-level patterns;
+      the cap is what keeps low thresholds from exploding
+
+    Category-only itemsets need min_support, itemsets with any product need
+    item_support. With item_support >= min_support the result is exactly
+    every such itemset; a lower item_support is Han & Fu's reduced support,
+    and then only descendants of frequent generalizations are explored.
+
+    Args:
+        basket_matrix: BasketMatrix to mine
+        taxonomy: Taxonomy of the products
+        min_support: minimum support of category-level itemsets
+        item_support: minimum support of itemsets with a product; defaults
+            to min_support
+        max_categories: most categories in a cross-level itemset (None for
+            no cap, which is plain Cumulate)
+        max_len: optional maximum itemset length
+
+    Returns:
+        (lattice, report): an ItemsetLattice over the frequent nodes and a
+        dict counting the nodes, candidates and pruned candidates
+    """
+    if item_support is None:
+        item_support = min_support
+
+    matrix, nodes, parents = taxonomy.extend(basket_matrix)
+    n_baskets = basket_matrix.n_baskets
+    n_products = basket_matrix.n_products
+    category_count = min_count_for_support(min_support, n_baskets)
+    item_count = min_count_for_support(item_support, n_baskets)
+
+    is_product = np.arange(len(nodes)) < n_products
+    thresholds = np.where(is_product, item_count, category_count)
+    node_counts = np.bincount(matrix.indices, minlength=len(nodes))
+    depths = np.array([len(taxonomy.ancestors(node)) for node in nodes], dtype=np.int64)
+
+    keep = np.zeros(len(nodes), dtype=bool)
+    pruned_nodes = 0
+    for depth in range(int(depths.max(initial=0)) + 1):
+        level = np.flatnonzero(depths == depth)
+        open_parent = (parents[level] < 0) | keep[np.maximum(parents[level], 0)]
+        pruned_nodes += int((~open_parent).sum())
+        keep[level] = open_parent & (node_counts[level] >= thresholds[level])
+
+    # Mine over the kept columns only, with codes renumbered 0..n-1
+    columns = np.flatnonzero(keep)
+    local = np.full(len(nodes), -1, dtype=np.int64)
+    local[columns] = np.arange(len(columns))
+    matrix = matrix[:, columns].tocsr()
+    matrix.sort_indices()
+    parents = np.where(parents[columns] >= 0, local[np.maximum(parents[columns], 0)], -1)
+    depths = depths[columns]
+    is_product = is_product[columns]
+    ancestors = [
+        frozenset(local[nodes.get_indexer(list(taxonomy.ancestors(nodes[node])))].tolist()) for node in columns
+    ]
+
+    def admissible(codes):
+        general = len(codes) - int(is_product[list(codes)].sum())
+        return general == len(codes) or max_categories is None or general <= max_categories
+
+    frequent = {(code,): int(node_counts[node]) for code, node in enumerate(columns)}
+    report = {
+        'nodes': len(nodes),
+        'categories': len(nodes) - n_products,
+        'frequent_nodes': len(columns),
+        'pruned_nodes': pruned_nodes,
+        'candidates': 0,
+        'pruned_candidates': 0,
+    }
+
+    # Category-only itemsets are few columns over dense rows: FP-growth mines
+    # them outright. The joins below skip them: codes sort products first, so
+    # a candidate starting with a category holds categories only.
+    category_codes = np.flatnonzero(~is_product)
+    category_matrix = matrix[:, category_codes].tocsr()
+    category_matrix.sort_indices()
+    for codes, count in fpgrowth(category_matrix, category_count, max_len):
+        codes = category_codes[list(codes)].tolist()
+        if len(codes) > 1 and not any(other in ancestors[code] for code in codes for other in codes):
+            frequent[tuple(sorted(codes))] = int(count)
+
+    current = [(code,) for code in range(len(columns))]
+    length = 1
+    while current and (max_len is None or length < max_len):
+        length += 1
+        by_depth = {}
+        prefixes = {}
+        for codes in current:
+            prefixes.setdefault(codes[:-1], []).append(codes[-1])
+        for prefix, lasts in prefixes.items():
+            for position, first in enumerate(lasts):
+                if not prefix and not is_product[first]:
+                    break
+                for second in lasts[position + 1:]:
+                    if first in ancestors[second] or second in ancestors[first]:
+                        continue
+                    candidate = prefix + (first, second)
+                    if not admissible(candidate):
+                        continue
+                    if all(candidate[:skip] + candidate[skip + 1:] in frequent for skip in range(len(prefix))):
+                        by_depth.setdefault(int(depths[list(candidate)].sum()), []).append(candidate)
+
+        current = []
+        for depth in sorted(by_depth):
+            candidates = [
+                candidate for candidate in by_depth[depth]
+                if all(general in frequent for general in _generalizations(candidate, parents, ancestors)
+                       if admissible(general))
+            ]
+            report['pruned_candidates'] += len(by_depth[depth]) - len(candidates)
+            report['candidates'] += len(candidates)
+            counts = count_itemsets(matrix, candidates)
+            for candidate, count in zip(candidates, counts.tolist()):
+                if count >= item_count:
+                    frequent[candidate] = count
+                    current.append(candidate)
+        current.sort()
+
+    lattice = ItemsetLattice.from_itemsets(
+        frequent.items(), n_baskets, nodes[columns], min(category_count, item_count)
+    )
+    report['itemsets'] = len(lattice)
+    return lattice, report
+
+
+def taxonomy_rules(lattice, taxonomy, min_confidence=0.0, min_lift=None):
+    """
+    Rules from a taxonomy lattice with the level they were found at.
+
+    Returns:
+        DataFrame with the usual rule columns plus level: 'item' when every
+        node is a product, 'category' when every node is a category, and
+        'cross' for rules mixing the two
+    """
+    rules = rules_from_lattice(lattice, min_confidence=min_confidence, min_lift=min_lift)
+    categories = set(taxonomy.categories)
+    levels = []
+    for antecedents, consequents in zip(rules['antecedents'], rules['consequents']):
+        general = sum(node in categories for node in antecedents | consequents)
+        if general == 0:
+            levels.append('item')
+        elif general == len(antecedents) + len(consequents):
+            levels.append('category')
+        else:
+            levels.append('cross')
+    rules['level'] = pd.Series(levels, index=rules.index, dtype=object)
+    return rules[RULE_COLUMNS + ['level']]
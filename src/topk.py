@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+
+from .mining import ItemsetLattice, choose_algorithm, eclat, fpgrowth
+from .rules import rules_from_lattice
+
+TOP_K_METRICS = ('support', 'confidence', 'lift')
+
+_ENGINES = {'fpgrowth': fpgrowth, 'eclat': eclat}
+
+
+def _top(rules, k, metric):
+    """Best k rules by metric, ties broken by support and then mining order"""
+    if rules.empty:
+        return rules
+    order = np.lexsort((np.arange(len(rules)), -rules['support'].to_numpy(), -rules[metric].to_numpy()))
+    return rules.iloc[order[:k]].reset_index(drop=True)
+
+
+def top_k_rules(basket_matrix, k=100, metric='lift', min_confidence=0.0, min_count=2, max_len=None,
+                max_itemsets=200_000, time_limit=None, algorithm='fpgrowth'):
+    """
+    Find the k best rules by metric without choosing min_support up front.
+
+    The search starts at the count of the second most frequent item (no pair
+    can be more frequent) and halves the basket count threshold each round.
+    Every round mines a superset of the previous lattice, so the best k rules
+    so far are simply the top of the new rule set. Once k rules are held, the
+    k-th best value becomes the internal min_confidence or min_lift of the
+    next round, as in TopKRules, so weaker rules are never materialised.
+
+    For metric='support' the search stops as soon as k rules are found and
+    the answer is exact: any missing rule is below the current threshold.
+    Confidence and lift are not anti-monotone, so those searches continue
+    down to min_count, or stop early when the next round is predicted (from
+    the growth of the last one) to exceed max_itemsets itemsets or the
+    remaining time_limit. The returned search report says where it stopped.
+
+    Args:
+        basket_matrix: BasketMatrix to mine
+        k: number of rules to return
+        metric: 'support', 'confidence' or 'lift'
+        min_confidence: confidence floor applied to every rule
+        min_count: lowest basket count a rule may have
+        max_len: optional maximum itemset length
+        max_itemsets: itemset budget of a single round
+        time_limit: optional wall clock budget in seconds
+        algorithm: 'fpgrowth', 'eclat' or 'auto'
+
+    Returns:
+        (rules, lattice, search) where rules holds at most k rules sorted by
+        metric, lattice is the ItemsetLattice of the last round and search is
+        a dict with min_support, exact, stopped and the per-round log
+    """
+    if metric not in TOP_K_METRICS:
+        raise ValueError(f"Unknown metric: {metric}. Choose from {TOP_K_METRICS}")
+    if k < 1:
+        raise ValueError("k must be positive")
+    if algorithm not in _ENGINES:
+        algorithm = choose_algorithm(basket_matrix)
+
+    started = time.perf_counter()
+    n_baskets = basket_matrix.n_baskets
+    min_count = max(int(min_count), 1)
+    item_counts = np.sort(np.bincount(basket_matrix.matrix.indices, minlength=len(basket_matrix.products)))[::-1]
+    count = max(int(item_counts[1]) if len(item_counts) > 1 else min_count, min_count)
+
+    best = None
+    lattice = None
+    floors = {'confidence': min_confidence, 'lift': None}
+    rounds = []
+    stopped = 'min_count'
+    while True:
+        round_started = time.perf_counter()
+        itemsets = _ENGINES[algorithm](basket_matrix.matrix, count, max_len)
+        lattice = ItemsetLattice.from_itemsets(itemsets, n_baskets, basket_matrix.products, count)
+        rules = rules_from_lattice(lattice, min_confidence=floors['confidence'], min_lift=floors['lift'])
+        best = _top(rules, k, metric)
+        seconds = time.perf_counter() - round_started
+        rounds.append({
+            'min_support': count / max(n_baskets, 1), 'itemsets': len(lattice),
+            'rules': len(rules), 'seconds': seconds,
+        })
+
+        if len(best) == k and metric != 'support':
+            floors[metric] = max(floors[metric] or 0.0, float(best[metric].iloc[-1]))
+        if len(best) == k and metric == 'support':
+            stopped = 'k_rules'
+            break
+        if count <= min_count:
+            break
+
+        # Each halving has so far multiplied the lattice by growth; assume
+        # the next one does too before committing to it.
+        previous = rounds[-2]['itemsets'] if len(rounds) > 1 else 0
+        growth = max(len(lattice) / previous if previous else 2.0, 2.0)
+        if len(lattice) * growth > max_itemsets:
+            stopped = 'max_itemsets'
+            break
+        if time_limit is not None and \
+                time.perf_counter() - started + seconds * growth > time_limit:
+            stopped = 'time_limit'
+            break
+        count = max(count // 2, min_count)
+
+    search = {
+        'min_support': count / max(n_baskets, 1),
+        'exact': stopped != 'max_itemsets' and stopped != 'time_limit',
+        'stopped': stopped,
+        'rounds': rounds,
+    }
+    return best, lattice, search
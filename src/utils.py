@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from .preprocessing import clean_transactions
+
 def generate_sample_data(n_transactions=1000):
     """
     Create a sample transaction data for testing at demonstration
@@ -29,12 +31,68 @@ def generate_sample_data(n_transactions=1000):
     
     return pd.DataFrame(data)
 
-def clean_transaction_data(df):
+BASKET_SIZE_DISTRIBUTIONS = ('poisson', 'geometric', 'fixed')
+
+def generate_synthetic_baskets(n_baskets=10000, n_products=1000, zipf_exponent=1.1,
+                               mean_basket_size=4.0, size_distribution='poisson', seed=None):
+    """
+    Gumawa ng malaking synthetic transaction data para sa benchmarks
+
+    Product popularity follows a Zipf law (rank r is drawn with weight
+    r ** -zipf_exponent), so a higher exponent concentrates purchases on a
+    few products and gives a denser head of the matrix. Basket sizes are
+    drawn from size_distribution with the given mean (at least one item).
+    Items are drawn with replacement and duplicates inside a basket are
+    dropped, so very popular products make baskets slightly smaller than
+    the nominal size.
+
+    Args:
+        n_baskets: Number of transactions
+        n_products: Catalog size
+        zipf_exponent: Skew of product popularity (0 = uniform)
+        mean_basket_size: Average number of items per basket
+        size_distribution: 'poisson', 'geometric' or 'fixed'
+        seed: Seed for the random generator
+
+    Returns:
+        DataFrame with transaction_id and product_id columns
+    """
+    if size_distribution not in BASKET_SIZE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown basket size distribution: {size_distribution}. "
+                         f"Choose from {BASKET_SIZE_DISTRIBUTIONS}")
+    rng = np.random.default_rng(seed)
+
+    if size_distribution == 'poisson':
+        sizes = 1 + rng.poisson(max(mean_basket_size - 1, 0), n_baskets)
+    elif size_distribution == 'geometric':
+        sizes = rng.geometric(1 / max(mean_basket_size, 1), n_baskets)
+    else:
+        sizes = np.full(n_baskets, max(int(round(mean_basket_size)), 1))
+    sizes = np.minimum(sizes, n_products)
+
+    weights = np.arange(1, n_products + 1, dtype=float) ** -zipf_exponent
+    products = rng.choice(n_products, size=int(sizes.sum()), p=weights / weights.sum())
+    baskets = np.repeat(np.arange(n_baskets), sizes)
+
+    pairs = np.unique(baskets.astype(np.int64) * n_products + products)
+    width = len(str(n_products - 1))
+    names = np.array([f"p{code:0{width}d}" for code in range(n_products)], dtype=object)
+    return pd.DataFrame({
+        'transaction_id': pairs // n_products,
+        'product_id': names[pairs % n_products],
+    })
+
+def clean_transaction_data(df, date_format=None):
     """
     Clean the transaction before analyzing
+
+    Runs the single-pass clean_transactions pipeline: rows without a
+    transaction or product and repeated (transaction, product) pairs are
+    dropped, product_id becomes categorical and timestamp is parsed.
     
     Args:
         df: DataFrame of raw transaction data
+        date_format: Optional format of the timestamp column, e.g. '%d/%m/%Y'
         
     Returns:
         Cleaned DataFrame
@@ -43,18 +101,13 @@ def clean_transaction_data(df):
     missing_cols = [col for col in required_cols if col not in df.columns]
     if missing_cols:
         raise ValueError(f"These columns are missing: {missing_cols}")
-    
-    df_clean = df.drop_duplicates()
 
-    if df_clean.isnull().any().any():
-        print(f"May {df_clean.isnull().sum().sum()} null values ang na-drop")
-        df_clean = df_clean.dropna()
+    df_clean, report = clean_transactions(df, date_format=date_format)
 
-    if 'transaction_id' in df_clean.columns:
-        df_clean['transaction_id'] = df_clean['transaction_id'].astype(str)
-    
-    if 'timestamp' in df_clean.columns:
-        df_clean['timestamp'] = pd.to_datetime(df_clean['timestamp'], errors='coerce')
+    if report['dropped_missing_keys']:
+        print(f"May {report['dropped_missing_keys']} rows na walang transaction o product ang na-drop")
+    if report['dropped_duplicates']:
+        print(f"May {report['dropped_duplicates']} duplicate rows ang na-drop")
     
     return df_clean
 
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _seaborn():
+    import seaborn as sns
+    return sns
+
+
+class AnalyzerPlots:
+    """
+    Plotting methods of MarketBasketAnalyzer.
+
+    matplotlib, seaborn and networkx are imported on the first plot call,
+    not when the analyzer is imported, so batch jobs that only mine
+    itemsets and rules never load the plotting stack. The methods rely on
+    the analyzer's rules, transactions_df, cooccurrence() and profile.
+    """
+
+    @profiled('plot_product_frequency')
+    def plot_product_frequency(self, top_n=20):
+        """Plot top N most frequent products"""
+        plt, sns = _pyplot(), _seaborn()
+        plt.figure(figsize=(12, 6))
+        if self.transactions_df is None:
+            basket_matrix = self._basket_matrix()
+            product_freq = pd.Series(basket_matrix.item_counts(), index=basket_matrix.products).nlargest(top_n)
+        else:
+            product_freq = self.transactions_df['product_id'].value_counts().head(top_n)
+        sns.barplot(x=product_freq.values, y=product_freq.index.to_numpy())
+        plt.title(f'Top {top_n} Most Frequent Products')
+        plt.xlabel('Frequency')
+        plt.ylabel('Product ID')
+        return plt
+
+    @profiled('plot_association_heatmap')
+    def plot_association_heatmap(self, top_n=20):
+        """Create a heatmap of co-occurrences among the top N most frequent products"""
+        plt, sns = _pyplot(), _seaborn()
+        cooc_matrix = self.cooccurrence().pair_counts(top_n)
+        
+        plt.figure(figsize=(12, 10))
+        sns.heatmap(
+            cooc_matrix,
+            annot=True,
+            cmap='YlOrRd',
+            fmt='g'
+        )
+        plt.title('Product Co-occurrence Heatmap')
+        return plt
+
+    @profiled('create_network_graph')
+    def create_network_graph(self, min_confidence=0.5, min_lift=1.0, max_edges=200, layout_cache=None):
+        """
+        Create a network graph of product associations.
+
+        Only the max_edges rules with the highest lift are drawn (None draws
+        all). Multi-item antecedents and consequents are shown as their own
+        grey nodes joined to their items by dotted lines. Layouts are cached
+        per edge set, and large graphs use a cheaper layout; see
+        src/network.py. Pass a long-lived LayoutCache as layout_cache to share
+        layouts between analyzers; otherwise each analyzer keeps its own.
+        """
+        import networkx as nx
+        from .network import LayoutCache, build_graph, rule_edges
+
+        plt = _pyplot()
+        if self.rules is None:
+            self.generate_rules(min_confidence)
+        if layout_cache is None:
+            if self._layouts is None:
+                self._layouts = LayoutCache()
+            layout_cache = self._layouts
+
+        edges = rule_edges(self.rules, min_confidence=min_confidence, min_lift=min_lift, max_edges=max_edges)
+        
+        if edges.empty:
+            plt.figure(figsize=(8, 6))
+            plt.text(0.5, 0.5, "No associations meet the criteria", 
+                     horizontalalignment='center', verticalalignment='center',
+                     fontsize=14)
+            plt.gca().set_axis_off()
+            return plt
+
+        G = build_graph(edges)
+        
+        plt.figure(figsize=(12, 12))
+        with self.profile.stage('network_layout', nodes=G.number_of_nodes(), edges=G.number_of_edges()) as record:
+            pos, record.params['cached'] = layout_cache.get(G)
+
+        hyperedges = [node for node, hyperedge in G.nodes(data='hyperedge') if hyperedge]
+        items = [node for node, hyperedge in G.nodes(data='hyperedge') if not hyperedge]
+        rules = [(u, v) for u, v, kind in G.edges(data='kind') if kind == 'rule']
+        members = [(u, v) for u, v, kind in G.edges(data='kind') if kind == 'member']
+        lifts = np.array([G[u][v]['weight'] for u, v in rules])
+        widths = 1 + 4 * (lifts - lifts.min()) / max(lifts.max() - lifts.min(), 1e-9)
+
+        nx.draw_networkx_nodes(G, pos, nodelist=items, node_color='lightblue', node_size=1000)
+        nx.draw_networkx_nodes(G, pos, nodelist=hyperedges, node_color='lightgrey', node_size=400)
+        nx.draw_networkx_edges(G, pos, edgelist=rules, width=widths)
+        nx.draw_networkx_edges(G, pos, edgelist=members, style='dotted', edge_color='grey')
+        nx.draw_networkx_labels(G, pos, font_size=8)
+        plt.gca().set_axis_off()
+        return plt
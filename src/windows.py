@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from .encoding import BasketMatrix
+from .mining import ItemsetLattice, count_itemsets, min_count_for_support, mine_itemsets
+from .rules import RULE_COLUMNS, rules_from_lattice
+
+WINDOW_COLUMNS = ['window_start', 'window_end', 'window_baskets']
+
+
+class WindowedCounts:
+    """
+    Itemset counts per time partition, combinable into arbitrary windows.
+
+    Each basket is assigned once to a calendar partition (day, week,
+    month, ...). Candidates are the itemsets frequent in at least one
+    partition: an itemset reaching min_support over a run of partitions
+    must reach it in one of them, so no window can have a frequent itemset
+    outside this set. Every candidate is then counted once per partition,
+    and the counts of any window (a fixed calendar period or a sliding run
+    of partitions) are plain sums of partition rows; no window is mined
+    again.
+
+    Build with WindowedCounts.build or MarketBasketAnalyzer.mine_windows.
+
+    Attributes:
+        periods: PeriodIndex of the partitions, consecutive and gap-free
+        basket_counts: baskets per partition
+        candidates: ItemsetLattice of all candidates with their total counts
+        partition_counts: (partitions x candidates) int64 count matrix
+        min_support: smallest support any window can be asked for
+        undated_baskets: baskets left out of every window for lack of a timestamp
+    """
+
+    def __init__(self, periods, basket_counts, candidates, partition_counts, min_support, undated_baskets=0):
+        self.periods = periods
+        self.basket_counts = np.asarray(basket_counts, dtype=np.int64)
+        self.candidates = candidates
+        self.partition_counts = partition_counts
+        self.min_support = min_support
+        self.undated_baskets = int(undated_baskets)
+
+    @classmethod
+    def build(cls, basket_matrix, basket_times, freq='M', min_support=0.01, algorithm='fpgrowth', max_len=None):
+        """
+        Partition baskets by time and count the candidate itemsets.
+
+        Args:
+            basket_matrix: BasketMatrix of all baskets
+            basket_times: timestamp per basket row (NaT rows are left out)
+            freq: pandas period alias of a partition ('D', 'W', 'M', ...)
+            min_support: minimum support used for every partition and window
+            algorithm: native engine used to mine partitions
+            max_len: optional maximum itemset length
+        """
+        times = pd.DatetimeIndex(basket_times)
+        if len(times) != basket_matrix.n_baskets:
+            raise ValueError("basket_times must hold one timestamp per basket")
+        dated = np.flatnonzero(~times.isna())
+        if len(dated) == 0:
+            raise ValueError("No baskets have a timestamp")
+
+        labels = times[dated].to_period(freq)
+        periods = pd.period_range(labels.min(), labels.max(), freq=freq)
+        partition = labels.asi8 - periods.asi8[0]
+
+        # One pass to group rows by partition; slices are then contiguous.
+        order = dated[np.argsort(partition, kind='stable')]
+        matrix = basket_matrix.matrix[order]
+        basket_counts = np.bincount(partition, minlength=len(periods))
+        bounds = np.zeros(len(periods) + 1, dtype=np.int64)
+        np.cumsum(basket_counts, out=bounds[1:])
+
+        slices = []
+        candidates = {}
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            part = BasketMatrix(matrix[start:stop], basket_matrix.products, np.arange(stop - start))
+            slices.append(part)
+            if stop > start:
+                local = mine_itemsets(part, min_support, algorithm=algorithm, max_len=max_len)
+                candidates.update(dict.fromkeys(codes for codes, _ in local.iter_itemsets()))
+
+        lattice = ItemsetLattice.from_itemsets(
+            ((codes, 0) for codes in candidates), len(dated), basket_matrix.products
+        )
+        codes = [codes for codes, _ in lattice.iter_itemsets()]
+        partition_counts = np.zeros((len(periods), len(lattice)), dtype=np.int64)
+        for position, part in enumerate(slices):
+            if part.n_baskets:
+                partition_counts[position] = count_itemsets(part.matrix, codes)
+        lattice.counts = partition_counts.sum(axis=0)
+        lattice.min_count = min_count_for_support(min_support, len(dated))
+        return cls(periods, basket_counts, lattice, partition_counts, min_support,
+                   undated_baskets=basket_matrix.n_baskets - len(dated))
+
+    def __len__(self):
+        return len(self.periods)
+
+    def window_lattice(self, start, stop, min_support=None):
+        """
+        Frequent itemsets of partitions [start, stop).
+
+        min_support defaults to the build threshold and may only be higher.
+        """
+        min_support = self.min_support if min_support is None else min_support
+        if min_support < self.min_support:
+            raise ValueError(f"Counts were built for min_support >= {self.min_support}")
+        n_baskets = int(self.basket_counts[start:stop].sum())
+        counts = self.partition_counts[start:stop].sum(axis=0)
+        lattice = ItemsetLattice(
+            self.candidates.offsets, self.candidates.items, counts, n_baskets, self.candidates.products
+        )
+        return lattice.filter(max(min_count_for_support(min_support, n_baskets), 1))
+
+    def windows(self, size=1, step=1):
+        """(start, stop) partition ranges of a window of size partitions moved by step"""
+        if size < 1 or step < 1:
+            raise ValueError("Window size and step must be positive")
+        return [(start, start + size) for start in range(0, max(len(self) - size, 0) + 1, step)]
+
+    def rules(self, size=1, step=1, min_support=None, min_confidence=0.5, min_lift=None):
+        """
+        Association rules of every window, stacked.
+
+        Returns:
+            DataFrame with window_start, window_end (timestamps) and
+            window_baskets followed by the usual rule columns
+        """
+        frames = []
+        for start, stop in self.windows(size, step):
+            lattice = self.window_lattice(start, stop, min_support)
+            if lattice.n_baskets == 0:
+                continue
+            rules = rules_from_lattice(lattice, min_confidence=min_confidence, min_lift=min_lift)
+            if rules.empty:
+                continue
+            rules.insert(0, 'window_start', self.periods[start].start_time)
+            rules.insert(1, 'window_end', self.periods[stop - 1].end_time)
+            rules.insert(2, 'window_baskets', lattice.n_baskets)
+            frames.append(rules)
+
+        if not frames:
+            columns = {col: pd.Series(dtype='datetime64[ns]') for col in WINDOW_COLUMNS[:2]}
+            columns['window_baskets'] = pd.Series(dtype=np.int64)
+            columns.update({col: pd.Series(dtype=object if col in RULE_COLUMNS[:2] else float)
+                            for col in RULE_COLUMNS})
+            return pd.DataFrame(columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def support_trend(self, itemset, size=1):
+        """
+        Support of one itemset per window of size partitions (rule drift).
+
+        Returns:
+            Series indexed by window start period; NaN for windows without baskets
+
+        Raises:
+            KeyError: the itemset is not frequent in any partition, so it was
+                never counted
+        """
+        codes = self.candidates.products.get_indexer(list(itemset))
+        codes = tuple(sorted(codes.tolist()))
+        position = next(
+            (index for index, (candidate, _) in enumerate(self.candidates.iter_itemsets()) if candidate == codes),
+            None
+        )
+        if position is None:
+            raise KeyError(f"{set(itemset)} is not frequent in any partition")
+
+        windows = self.windows(size, 1)
+        values = []
+        for start, stop in windows:
+            n_baskets = self.basket_counts[start:stop].sum()
+            count = self.partition_counts[start:stop, position].sum()
+            values.append(count / n_baskets if n_baskets else np.nan)
+        return pd.Series(values, index=self.periods[[start for start, _ in windows]], name='support')
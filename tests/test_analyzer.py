@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
 from src.utils import generate_sample_data
 
 def test_analyzer_initialization():
@@ -89,3 +90,122 @@ def test_report_generation():
     assert isinstance(report, str)
     assert "Dataset Overview" in report
     assert "Association Rules Summary" in report
+
+def test_sparse_binary_matrix():
+    """Test kung pareho ang sparse at dense na binary matrix"""
+    df = generate_sample_data(200)
+    analyzer = MarketBasketAnalyzer(df)
+    dense = analyzer.create_binary_matrix()
+    basket_matrix = analyzer.create_binary_matrix(sparse=True)
+
+    assert isinstance(basket_matrix, BasketMatrix)
+    assert basket_matrix.shape == dense.shape
+    assert list(basket_matrix.products) == list(dense.columns)
+    assert (basket_matrix.matrix.toarray() == dense.to_numpy()).all()
+
+def test_sparse_downstream():
+    """Test kung gumagana ang itemsets, heatmap at insights sa sparse matrix"""
+    df = generate_sample_data(200)
+    dense_analyzer = MarketBasketAnalyzer(df)
+    dense_itemsets = dense_analyzer.find_frequent_itemsets(min_support=0.05)
+
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.create_binary_matrix(sparse=True)
+    itemsets = analyzer.find_frequent_itemsets(min_support=0.05)
+
+    assert set(zip(itemsets['itemsets'], itemsets['support'].round(10))) == \
+        set(zip(dense_itemsets['itemsets'], dense_itemsets['support'].round(10)))
+
+    insights = analyzer.generate_insights()
+    assert insights['total_transactions'] == df['transaction_id'].nunique()
+    assert insights['unique_products'] == df['product_id'].nunique()
+
+    assert analyzer.plot_association_heatmap(top_n=5) is not None
+
+def test_from_csv_streaming(tmp_path):
+    """Test kung pareho ang streaming CSV ingestion at ang in-memory na path"""
+    np.random.seed(21)
+    df = generate_sample_data(150)
+    df = pd.concat([df, df.head(20)], ignore_index=True)
+    df.loc[3, 'product_id'] = None
+    path = tmp_path / 'transactions.csv'
+    df.to_csv(path, index=False)
+
+    analyzer = MarketBasketAnalyzer.from_csv(path, chunksize=64)
+
+    expected = MarketBasketAnalyzer(pd.read_csv(path))
+    expected.preprocess_data()
+    expected_matrix = expected.create_binary_matrix(sparse=True)
+
+    assert analyzer.transactions_df is None
+    assert list(analyzer.binary_matrix.products) == list(expected_matrix.products)
+    assert list(analyzer.binary_matrix.transactions) == list(expected_matrix.transactions)
+    assert (analyzer.binary_matrix.matrix != expected_matrix.matrix).nnz == 0
+
+    itemsets = analyzer.find_frequent_itemsets(min_support=0.05, algorithm='fpgrowth')
+    assert itemsets.equals(expected.find_frequent_itemsets(min_support=0.05, algorithm='fpgrowth'))
+    assert analyzer.generate_insights()['total_transactions'] == df['transaction_id'].nunique()
+    assert analyzer.plot_product_frequency() is not None
+
+    insights = analyzer.generate_insights()
+    expected_insights = expected.generate_insights()
+    assert insights['unique_customers'] == expected_insights['unique_customers']
+    assert insights['date_range'] == expected_insights['date_range']
+
+    cached = MarketBasketAnalyzer.from_csv(path, chunksize=64, cache=tmp_path / 'cache')
+    cached = MarketBasketAnalyzer.from_csv(path, chunksize=64, cache=tmp_path / 'cache')
+    assert cached.generate_insights()['date_range'] == expected_insights['date_range']
+    assert cached.preprocess_report == analyzer.preprocess_report == expected.preprocess_report
+
+def test_from_csv_pins_date_format_and_merges_usecols(tmp_path):
+    """Test kung iisang date format ang gamit sa lahat ng chunk at tinatanggap ang usecols"""
+    df = pd.DataFrame({
+        'transaction_id': [1, 1, 2, 3, 4, 4],
+        'product_id': ['a', 'b', 'a', 'c', 'b', 'c'],
+        'customer_id': [7, 7, 8, 7, 9, 9],
+        'timestamp': ['03/04/2024', '03/04/2024', '05/04/2024', '25/04/2024', '28/04/2024', '28/04/2024'],
+    })
+    path = tmp_path / 'transactions.csv'
+    df.to_csv(path, index=False)
+
+    analyzer = MarketBasketAnalyzer.from_csv(path, chunksize=3)
+    expected = MarketBasketAnalyzer(pd.read_csv(path))
+    expected.preprocess_data()
+    assert analyzer.generate_insights()['date_range'] == expected.generate_insights()['date_range']
+    assert analyzer.preprocess_report['unparsed_timestamps'] == expected.preprocess_report['unparsed_timestamps'] == 3
+
+    day_first = MarketBasketAnalyzer.from_csv(path, chunksize=3, date_format='%d/%m/%Y')
+    assert day_first.generate_insights()['date_range'] == (pd.Timestamp('2024-04-03'), pd.Timestamp('2024-04-28'))
+
+    narrow = MarketBasketAnalyzer.from_csv(path, usecols=['customer_id'])
+    assert narrow.generate_insights()['unique_customers'] == 3
+    assert 'date_range' not in narrow.generate_insights()
+
+def test_from_csv_missing_column(tmp_path):
+    """Test kung nag-e-error kapag kulang ang columns sa CSV"""
+    path = tmp_path / 'transactions.csv'
+    pd.DataFrame({'transaction_id': [1, 2], 'item': ['a', 'b']}).to_csv(path, index=False)
+
+    with pytest.raises(ValueError):
+        MarketBasketAnalyzer.from_csv(path)
+
+def test_support_threshold_reuse(monkeypatch):
+    """Test kung sinasala lang ang naunang lattice kapag tumaas ang min_support"""
+    np.random.seed(31)
+    df = generate_sample_data(300)
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+    analyzer.generate_rules(min_confidence=0.1)
+
+    def no_mining(*args, **kwargs):
+        raise AssertionError("should not mine again")
+    monkeypatch.setattr('src.analyzer.mine_itemsets', no_mining)
+    monkeypatch.setattr('src.analyzer.rules_from_lattice', no_mining)
+
+    itemsets = analyzer.find_frequent_itemsets(min_support=0.06, algorithm='fpgrowth')
+    rules = analyzer.generate_rules(min_confidence=0.4, min_lift=1.0)
+    monkeypatch.undo()
+
+    expected = MarketBasketAnalyzer(df)
+    assert itemsets.equals(expected.find_frequent_itemsets(min_support=0.06, algorithm='fpgrowth'))
+    assert rules.equals(expected.generate_rules(min_confidence=0.4, min_lift=1.0))
@@ -0,0 +1,25 @@
+from benchmarks.bench_pipeline import bench_dataset, bench_startup, compare
+from src.utils import generate_synthetic_baskets
+
+def test_bench_and_compare():
+    """Test kung nahuhuli ng benchmark ang mga regression"""
+    transactions = generate_synthetic_baskets(500, 30, seed=5)
+    results = {'results': bench_dataset(transactions, 'tiny', [0.05, 0.1], 'fpgrowth', 0.1,
+                                        sparse=True, memory=False)}
+
+    stages = [result['stage'] for result in results['results']]
+    assert stages.count('find_frequent_itemsets') == 2
+    assert compare(results, results) == []
+
+    slower = {'results': [dict(result, seconds=result['seconds'] * 3 + 1) for result in results['results']]}
+    regressions = compare(slower, results)
+    assert len(regressions) == len(results['results'])
+    assert all(regression['metric'] == 'seconds' for regression in regressions)
+
+def test_startup_is_headless():
+    """Test kung hindi naglo-load ng plotting libraries ang pag-import ng analyzer"""
+    results = bench_startup(repeats=1)
+
+    assert [result['stage'] for result in results] == ['import src.analyzer', 'cli --help']
+    assert results[0]['outputs']['plotting_loaded'] is False
+    assert all(result['seconds'] > 0 for result in results)
@@ -0,0 +1,89 @@
+import os
+import numpy as np
+import pandas as pd
+from src.analyzer import MarketBasketAnalyzer
+from src.cache import ResultCache, fingerprint_transactions
+from src.encoding import BasketMatrix
+from src.mining import ItemsetLattice, mine_itemsets
+from src.rulestore import RuleStore
+from src.utils import generate_sample_data
+
+def _sample(seed=23):
+    np.random.seed(seed)
+    return generate_sample_data(200)
+
+def test_round_trips(tmp_path):
+    """Test kung buo pa rin ang matrix, itemsets at rules pagkatapos i-save"""
+    basket_matrix = BasketMatrix.from_transactions(_sample())
+    lattice = mine_itemsets(basket_matrix, 0.05, algorithm='eclat')
+    store = RuleStore.from_lattice(lattice, min_confidence=0.1)
+    cache = ResultCache(tmp_path / 'cache')
+
+    basket_matrix.save(tmp_path / 'matrix.npz')
+    lattice.save(tmp_path / 'itemsets.npz')
+    cache.put_rule_store('rules', store)
+
+    loaded_matrix = BasketMatrix.load(tmp_path / 'matrix.npz')
+    assert (loaded_matrix.matrix != basket_matrix.matrix).nnz == 0
+    assert list(loaded_matrix.transactions) == list(basket_matrix.transactions)
+    assert ItemsetLattice.load(tmp_path / 'itemsets.npz').to_frame().equals(lattice.to_frame())
+    assert cache.get_rule_store('rules').to_frame().equals(store.to_frame())
+
+def test_fingerprint_tracks_content():
+    """Test kung nagbabago ang fingerprint kapag nagbago ang data"""
+    df = _sample()
+    changed = df.copy()
+    changed.loc[0, 'product_id'] = 'caviar'
+
+    assert fingerprint_transactions(df) == fingerprint_transactions(df.copy())
+    assert fingerprint_transactions(df) != fingerprint_transactions(changed)
+
+def test_analyzer_uses_cache(tmp_path):
+    """Test kung nilo-load ng analyzer ang resulta mula sa cache"""
+    df = _sample()
+    first = MarketBasketAnalyzer(df, cache=tmp_path)
+    first.find_frequent_itemsets(min_support=0.05, algorithm='fpgrowth')
+    first.generate_rules(min_confidence=0.2)
+
+    second = MarketBasketAnalyzer(df, cache=ResultCache(tmp_path))
+    second.binary_matrix = None
+    itemsets = second.find_frequent_itemsets(min_support=0.05, algorithm='fpgrowth')
+    rules = second.generate_rules(min_confidence=0.2)
+
+    assert itemsets.equals(first.frequent_itemsets)
+    assert rules.equals(first.rules)
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.npz')]) == 3
+
+def test_lru_eviction(tmp_path):
+    """Test kung tinatanggal ang pinakalumang entry kapag puno na ang cache"""
+    basket_matrix = BasketMatrix.from_transactions(_sample())
+    cache = ResultCache(tmp_path)
+    cache.put_matrix('old', basket_matrix)
+    os.utime(tmp_path / 'old.npz', (0, 0))
+    cache.max_bytes = os.path.getsize(tmp_path / 'old.npz') + 1
+    cache.put_matrix('new', basket_matrix)
+
+    assert cache.get_matrix('old') is None
+    assert cache.get_matrix('new') is not None
+
+def test_new_analyzer_reuses_lower_support_lattice(tmp_path, monkeypatch):
+    """Test kung ang bagong analyzer (bawat Streamlit rerun) ay hindi na nagmi-mine ulit"""
+    df = _sample()
+    first = MarketBasketAnalyzer(df, cache=ResultCache(tmp_path))
+    first.preprocess_data()
+    first.find_frequent_itemsets(min_support=0.03, algorithm='fpgrowth')
+    expected = MarketBasketAnalyzer(df).find_frequent_itemsets(min_support=0.08, algorithm='fpgrowth')
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mined again")
+    monkeypatch.setattr('src.analyzer.mine_itemsets', fail)
+
+    second = MarketBasketAnalyzer(df, cache=ResultCache(tmp_path))
+    second.preprocess_data()
+    itemsets = second.find_frequent_itemsets(min_support=0.08, algorithm='fpgrowth')
+    rules = second.generate_rules(min_confidence=0.2)
+
+    assert sorted(zip(itemsets['itemsets'].map(sorted).map(tuple), itemsets['support'])) == \
+        sorted(zip(expected['itemsets'].map(sorted).map(tuple), expected['support']))
+    assert (rules['support'] >= 0.08).all()
+    assert second._itemset_pool[0].min_count < second._itemset_lattice().min_count
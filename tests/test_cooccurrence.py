@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.cooccurrence import CooccurrenceIndex
+from src.encoding import BasketMatrix
+from src.utils import generate_sample_data
+
+def _index(seed=41):
+    np.random.seed(seed)
+    return CooccurrenceIndex(BasketMatrix.from_transactions(generate_sample_data(250)))
+
+def test_pair_counts_use_most_frequent_products():
+    """Test kung ang pinakamadalas na products ang nasa heatmap"""
+    index = _index()
+    dense = index.basket_matrix.to_dataframe(sparse_frame=False).astype(int)
+    expected = dense.sum().sort_values(ascending=False, kind='stable').index[:4]
+
+    pairs = index.pair_counts(top_n=4)
+
+    assert list(pairs.index) == list(expected)
+    full = dense.T.dot(dense)
+    assert (pairs.to_numpy() == full.loc[expected, expected].to_numpy()).all()
+
+def test_top_partners():
+    """Test kung tama ang top-k na kasamang products"""
+    index = _index()
+    dense = index.basket_matrix.to_dataframe(sparse_frame=False)
+    together = dense[dense['bread']].drop(columns='bread').sum()
+
+    partners = index.top_partners('bread', k=3)
+
+    assert len(partners) == 3
+    assert 'bread' not in set(partners['product'])
+    assert partners['count'].tolist() == sorted(together, reverse=True)[:3]
+    assert list(index.top_partners('bread', k=3, metric='lift')['lift']) == \
+        sorted(index.top_partners('bread', k=20, metric='lift')['lift'], reverse=True)[:3]
+
+    with pytest.raises(KeyError):
+        index.top_partners('caviar')
+
+def test_analyzer_top_partners():
+    """Test kung gumagana ang top_partners sa analyzer"""
+    np.random.seed(43)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(100))
+    partners = analyzer.top_partners('milk', k=5, metric='confidence')
+
+    assert list(partners.columns) == ['product', 'count', 'confidence', 'lift']
+    assert partners['confidence'].is_monotonic_decreasing
+    assert analyzer.plot_association_heatmap(top_n=5) is not None
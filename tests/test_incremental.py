@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
+from src.incremental import IncrementalMiner, candidate_join, negative_border
+from src.mining import mine_itemsets
+from src.utils import generate_sample_data
+
+def _split_sample(n_transactions=300, n_new=40, seed=13):
+    np.random.seed(seed)
+    df = generate_sample_data(n_transactions)
+    is_new = df['transaction_id'] >= n_transactions - n_new
+    return df, df[~is_new], df[is_new]
+
+def test_candidate_join():
+    """Test kung tama ang apriori candidate generation"""
+    frequent = {(0, 1), (0, 2), (1, 2), (1, 3)}
+    assert candidate_join(frequent) == [(0, 1, 2)]
+
+def test_negative_border():
+    """Test kung tama ang negative border"""
+    frequent = {(0,), (1,), (2,), (0, 1)}
+    border = set(negative_border(frequent, 4))
+    assert border == {(3,), (0, 2), (1, 2)}
+
+def test_incremental_miner_matches_full_mining():
+    """Test kung pareho ang incremental update at ang buong mining"""
+    df, old, new = _split_sample()
+    full = BasketMatrix.from_transactions(df)
+    base = BasketMatrix.from_transactions(old)
+
+    miner = IncrementalMiner(0.04).fit(base)
+    combined, delta = base.append(new)
+    miner.update(delta, combined)
+
+    expected = mine_itemsets(full, 0.04, algorithm='fpgrowth')
+    assert miner.lattice(combined.products).to_frame().equals(expected.to_frame())
+
+def test_incremental_miner_skips_rescan():
+    """Test kung hindi nagre-rescan kapag hindi nagbago ang border"""
+    df, old, _ = _split_sample()
+    base = BasketMatrix.from_transactions(old)
+    miner = IncrementalMiner(0.04).fit(base)
+
+    # Re-adding the same baskets keeps every support unchanged.
+    repeat = old.assign(transaction_id=old['transaction_id'] + 10_000)
+    combined, delta = base.append(repeat)
+
+    assert miner.update(delta, combined) is False
+    assert miner.rescans == 0
+    expected = mine_itemsets(combined, 0.04, algorithm='fpgrowth')
+    assert miner.lattice(combined.products).to_frame().equals(expected.to_frame())
+
+def test_analyzer_add_transactions():
+    """Test kung gumagana ang add_transactions at update sa analyzer"""
+    df, old, new = _split_sample()
+    new = pd.concat([new, pd.DataFrame({'transaction_id': [999, 999], 'product_id': ['honey', 'bread']})])
+
+    analyzer = MarketBasketAnalyzer(old)
+    analyzer.find_frequent_itemsets(min_support=0.05)
+    analyzer.generate_rules(min_confidence=0.3)
+    itemsets = analyzer.add_transactions(new).update()
+
+    expected = MarketBasketAnalyzer(pd.concat([old, new]))
+    expected.find_frequent_itemsets(min_support=0.05)
+    expected_rules = expected.generate_rules(min_confidence=0.3)
+
+    assert set(zip(itemsets['itemsets'], itemsets['support'].round(10))) == \
+        set(zip(expected.frequent_itemsets['itemsets'], expected.frequent_itemsets['support'].round(10)))
+    assert len(analyzer.rules) == len(expected_rules)
+    assert 'honey' in analyzer.binary_matrix.columns
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+from mlxtend.frequent_patterns import apriori
+from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
+from src.mining import eclat, fpgrowth, min_count_for_support, mine_itemsets
+from src.utils import generate_sample_data
+
+def _as_set(frame):
+    return set(zip(frame['itemsets'], frame['support'].round(10)))
+
+def _basket_matrix(n_transactions=300):
+    np.random.seed(7)
+    return BasketMatrix.from_transactions(generate_sample_data(n_transactions))
+
+def test_min_count_for_support():
+    """Test kung tama ang conversion ng support sa basket count"""
+    assert min_count_for_support(0.05, 200) == 10
+    assert min_count_for_support(0.051, 200) == 11
+    assert min_count_for_support(0.0, 200) == 1
+
+@pytest.mark.parametrize('algorithm', ['fpgrowth', 'eclat'])
+def test_native_engines_match_apriori(algorithm):
+    """Test kung pareho ang resulta ng native engines at ng apriori"""
+    basket_matrix = _basket_matrix()
+    expected = apriori(basket_matrix.to_dataframe(sparse_frame=False), min_support=0.02, use_colnames=True)
+
+    lattice = mine_itemsets(basket_matrix, 0.02, algorithm=algorithm)
+
+    assert _as_set(lattice.to_frame()) == _as_set(expected)
+
+def test_eclat_vertical_layouts():
+    """Test kung pareho ang bitset at tid-list na ECLAT"""
+    matrix = _basket_matrix().matrix
+    bitset = sorted((tuple(sorted(items)), count) for items, count in eclat(matrix, 5, vertical='bitset'))
+    tidlist = sorted((tuple(sorted(items)), count) for items, count in eclat(matrix, 5, vertical='tidlist'))
+    tree = sorted((tuple(sorted(items)), count) for items, count in fpgrowth(matrix, 5))
+
+    assert bitset == tidlist == tree
+
+def test_max_len():
+    """Test kung nirerespeto ang max_len"""
+    lattice = mine_itemsets(_basket_matrix(), 0.01, algorithm='fpgrowth', max_len=2)
+    assert lattice.max_length == 2
+
+def test_analyzer_algorithm_option():
+    """Test kung pareho ang frame ng bawat algorithm sa analyzer"""
+    np.random.seed(3)
+    df = generate_sample_data(200)
+    results = {}
+    for algorithm in ['apriori', 'fpgrowth', 'eclat', 'auto']:
+        analyzer = MarketBasketAnalyzer(df)
+        itemsets = analyzer.find_frequent_itemsets(min_support=0.05, algorithm=algorithm)
+        assert list(itemsets.columns) == ['support', 'itemsets']
+        results[algorithm] = _as_set(itemsets)
+        analyzer.generate_rules(min_confidence=0.1)
+
+    assert results['apriori'] == results['fpgrowth'] == results['eclat'] == results['auto']
+
+    with pytest.raises(ValueError):
+        MarketBasketAnalyzer(df).find_frequent_itemsets(algorithm='magic')
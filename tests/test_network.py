@@ -0,0 +1,58 @@
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from src.analyzer import MarketBasketAnalyzer
+from src.network import LayoutCache, build_graph, rule_edges
+from src.utils import generate_sample_data
+
+def _rules():
+    np.random.seed(23)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(300))
+    analyzer.preprocess_data()
+    analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+    analyzer.generate_rules(min_confidence=0.1)
+    return analyzer
+
+def test_rule_edges_keeps_strongest_rules_and_hyperedges():
+    """Test kung top edges by lift lang ang kinukuha at may hyperedge nodes"""
+    analyzer = _rules()
+    rules = analyzer.rules
+    edges = rule_edges(rules, min_confidence=0.1, min_lift=0.0, max_edges=15)
+
+    rule_rows = edges[edges['kind'] == 'rule']
+    assert len(rule_rows) == 15
+    assert np.allclose(rule_rows['lift'].to_numpy(), np.sort(rules['lift'].to_numpy())[::-1][:15])
+
+    members = edges[edges['kind'] == 'member']
+    hyper = set(rule_rows['source']) | set(rule_rows['target'])
+    hyper = {node for node in hyper if ' + ' in node}
+    assert hyper and set(members['source']) == hyper
+    for node, group in members.groupby('source'):
+        assert sorted(group['target']) == node.split(' + ')
+
+    G = build_graph(edges)
+    assert all(G.nodes[node]['hyperedge'] for node in hyper)
+    assert rule_edges(rules, min_lift=1e9).empty
+
+def test_network_graph_layout_is_cached():
+    """Test kung nire-reuse ang layout para sa parehong rule set"""
+    analyzer = _rules()
+    cache = LayoutCache(size=1)
+    G = build_graph(rule_edges(analyzer.rules, min_confidence=0.1, min_lift=0.0, max_edges=30))
+
+    pos, hit = cache.get(G)
+    assert not hit and set(pos) == set(G.nodes)
+    again, hit = cache.get(G)
+    assert hit and again is pos
+
+    analyzer.create_network_graph(min_confidence=0.1, min_lift=0.0, max_edges=30)
+    analyzer.create_network_graph(min_confidence=0.1, min_lift=0.0, max_edges=30)
+    layouts = [record for record in analyzer.profile.records if record.stage == 'network_layout']
+    assert [record.params['cached'] for record in layouts] == [False, True]
+
+    shared = LayoutCache()
+    for _ in range(2):
+        fresh = _rules()
+        fresh.create_network_graph(min_confidence=0.1, min_lift=0.0, max_edges=30, layout_cache=shared)
+        assert fresh._layouts is None
+    assert [record.params['cached'] for record in fresh.profile.records if record.stage == 'network_layout'] == [True]
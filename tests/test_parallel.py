@@ -0,0 +1,56 @@
+import numpy as np
+from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
+from src.mining import count_itemsets, mine_itemsets
+from src.parallel import SON_MIN_WORK, partition_bounds, son_itemsets
+from src.utils import generate_sample_data
+
+def test_partition_bounds():
+    """Test kung sakop ng partitions ang lahat ng rows"""
+    bounds = partition_bounds(10, 3)
+    assert bounds[0][0] == 0 and bounds[-1][1] == 10
+    assert all(stop == start for (_, stop), (start, _) in zip(bounds, bounds[1:]))
+    assert partition_bounds(2, 4) == [(0, 1), (1, 2)]
+
+def test_count_itemsets():
+    """Test kung tama ang bilang ng baskets sa bawat itemset"""
+    np.random.seed(11)
+    basket_matrix = BasketMatrix.from_transactions(generate_sample_data(150))
+    lattice = mine_itemsets(basket_matrix, 0.02, algorithm='eclat')
+
+    counts = count_itemsets(basket_matrix.matrix, [codes for codes, _ in lattice.iter_itemsets()])
+
+    assert (counts == lattice.counts).all()
+
+def test_son_matches_single_process():
+    """Test kung eksaktong pareho ang parallel at single-process na resulta"""
+    np.random.seed(5)
+    basket_matrix = BasketMatrix.from_transactions(generate_sample_data(400))
+    expected = mine_itemsets(basket_matrix, 0.03, algorithm='fpgrowth')
+
+    lattice = son_itemsets(basket_matrix, 0.03, algorithm='fpgrowth', n_jobs=3, min_work=0)
+
+    assert lattice.to_frame().equals(expected.to_frame())
+
+def test_small_matrix_skips_the_pool(monkeypatch):
+    """Test kung hindi na gumagamit ng process pool ang maliit na matrix"""
+    np.random.seed(6)
+    basket_matrix = BasketMatrix.from_transactions(generate_sample_data(400))
+    expected = mine_itemsets(basket_matrix, 0.03, algorithm='fpgrowth')
+
+    def fail(*args, **kwargs):
+        raise AssertionError("started a process pool")
+    monkeypatch.setattr('src.parallel.ProcessPoolExecutor', fail)
+    lattice = son_itemsets(basket_matrix, 0.03, algorithm='fpgrowth', n_jobs=3)
+
+    assert basket_matrix.n_baskets * basket_matrix.nnz < SON_MIN_WORK
+    assert lattice.to_frame().equals(expected.to_frame())
+
+def test_analyzer_n_jobs():
+    """Test kung pareho ang frame ng analyzer kapag may n_jobs"""
+    np.random.seed(9)
+    df = generate_sample_data(300)
+    expected = MarketBasketAnalyzer(df).find_frequent_itemsets(min_support=0.05)
+    itemsets = MarketBasketAnalyzer(df).find_frequent_itemsets(min_support=0.05, n_jobs=2)
+
+    assert itemsets.equals(expected)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from src.preprocessing import clean_transactions, factorize_sorted
+from src.utils import generate_sample_data
+
+def test_clean_transactions_matches_dropna_drop_duplicates():
+    """Test kung pareho ang resulta sa lumang dropna + drop_duplicates"""
+    df = generate_sample_data(300)
+    df['timestamp'] = df['timestamp'].dt.strftime('%d/%m/%Y')
+    df = pd.concat([df, df.head(25)], ignore_index=True)
+    df.loc[[3, 40], 'product_id'] = None
+    df.loc[7, 'transaction_id'] = None
+
+    cleaned, report = clean_transactions(df, date_format='%d/%m/%Y')
+
+    expected = df.dropna(subset=['transaction_id', 'product_id']) \
+        .drop_duplicates(subset=['transaction_id', 'product_id'])
+    assert cleaned.index.equals(expected.index)
+    assert isinstance(cleaned['product_id'].dtype, pd.CategoricalDtype)
+    assert list(cleaned['product_id'].cat.categories) == sorted(expected['product_id'].unique())
+    assert (cleaned['product_id'].astype(str) == expected['product_id']).all()
+    assert cleaned['timestamp'].equals(pd.to_datetime(expected['timestamp'], format='%d/%m/%Y'))
+
+    assert report['rows_in'] == len(df)
+    assert report['dropped_missing_keys'] == 3
+    assert report['rows_out'] == len(cleaned)
+    assert report['rows_in'] - report['dropped_missing_keys'] - report['dropped_duplicates'] == len(cleaned)
+    assert report['unparsed_timestamps'] == 0
+
+    df.loc[0, 'timestamp'] = 'not a date'
+    _, report = clean_transactions(df, date_format='%d/%m/%Y')
+    assert report['unparsed_timestamps'] == 1
+
+def test_factorize_sorted_remaps_categorical_codes():
+    """Test kung tama ang codes ng categorical na hindi sorted o may unused category"""
+    values = pd.Series(pd.Categorical(['milk', 'bread', None, 'milk'], categories=['milk', 'tea', 'bread']))
+    codes, uniques = factorize_sorted(values)
+
+    assert list(uniques) == ['bread', 'milk']
+    assert codes.tolist() == [1, 0, -1, 1]
+
+    plain_codes, plain_uniques = factorize_sorted(values.astype(object))
+    assert np.array_equal(codes, plain_codes)
+    assert list(plain_uniques) == list(uniques)
@@ -0,0 +1,78 @@
+import json
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.profiling import PipelineProfile
+from src.utils import generate_sample_data
+
+def test_analyzer_records_stages(tmp_path):
+    """Test kung naitatala ang oras at laki ng bawat stage"""
+    np.random.seed(71)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(200))
+    analyzer.preprocess_data()
+    analyzer.find_frequent_itemsets(min_support=0.05)
+    analyzer.generate_rules(min_confidence=0.3)
+
+    frame = analyzer.profile.to_frame()
+    assert list(frame['stage']) == ['preprocess_data', 'find_frequent_itemsets',
+                                    'create_binary_matrix', 'generate_rules']
+    assert (frame['seconds'] >= 0).all()
+    rules_stage = analyzer.profile.records[-1]
+    assert rules_stage.params == {'min_confidence': 0.3, 'min_lift': None, 'engine': 'native'}
+    assert rules_stage.sizes['rules'] == len(analyzer.rules)
+    assert rules_stage.sizes['itemsets'] == len(analyzer.frequent_itemsets)
+    assert rules_stage.sizes['baskets'] == 200
+    assert analyzer.profile.records[2].depth == 1
+
+    assert '4. Performance' in analyzer.generate_report()
+    analyzer.profile.to_json(tmp_path / 'profile.json')
+    exported = json.loads((tmp_path / 'profile.json').read_text())
+    assert [stage['stage'] for stage in exported['stages']] == list(frame['stage'])
+
+def test_tracemalloc_peak():
+    """Test kung nasusukat ang peak memory ng nested na stages"""
+    profile = PipelineProfile(memory='tracemalloc')
+    with profile.stage('outer'):
+        with profile.stage('inner'):
+            block = np.ones(4 * 2 ** 20 // 8)
+        del block
+
+    outer, inner = profile.records
+    assert inner.peak_mb >= 4
+    assert outer.peak_mb >= inner.peak_mb
+    assert profile.total_seconds == outer.seconds
+
+def test_rss_records_each_stage_delta():
+    """Test kung sariling pagbabago ng memory ang naitatala ng bawat stage"""
+    pytest.importorskip('resource')
+    profile = PipelineProfile()
+    with profile.stage('allocate'):
+        block = np.ones(64 * 2 ** 20 // 8)
+    with profile.stage('idle'):
+        pass
+
+    allocate, idle = profile.records
+    assert allocate.rss_delta_mb >= 48
+    assert abs(idle.rss_delta_mb) < 16
+    assert block.sum() > 0
+
+def test_cleared_profile_reports_one_run():
+    """Test kung hindi nadodoble ang total_seconds sa dalawang run ng parehong query"""
+    np.random.seed(72)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(200))
+    analyzer.preprocess_data()
+    analyzer.profile.clear()
+
+    def run():
+        analyzer.find_frequent_itemsets(min_support=0.05)
+        analyzer.generate_rules(min_confidence=0.3)
+        return [record.stage for record in analyzer.profile.records], analyzer.profile.total_seconds
+
+    first_stages, first_total = run()
+    analyzer.profile.clear()
+    second_stages, second_total = run()
+
+    assert second_stages == ['find_frequent_itemsets', 'generate_rules']
+    assert first_stages[0] == 'find_frequent_itemsets' and first_stages[-1] == 'generate_rules'
+    assert second_total == sum(record.seconds for record in analyzer.profile.records)
+    assert second_total < first_total
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.recommend import RuleIndex
+from src.utils import generate_sample_data
+
+def _analyzer(seed=51):
+    np.random.seed(seed)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(300))
+    analyzer.preprocess_data()
+    analyzer.create_binary_matrix()
+    analyzer.find_frequent_itemsets(min_support=0.05)
+    analyzer.generate_rules(min_confidence=0.2)
+    return analyzer
+
+def _expected(rules, cart, k):
+    """Brute-force: best lift per consequent item over rules contained in the cart"""
+    best = {}
+    for _, rule in rules.iterrows():
+        if rule['antecedents'] <= cart:
+            for item in rule['consequents'] - cart:
+                best[item] = max(best.get(item, -np.inf), rule['lift'])
+    return sorted(best.items(), key=lambda pair: -pair[1])[:k]
+
+def test_recommend_matches_brute_force():
+    """Test kung pareho ang recommendations sa brute-force na subset matching"""
+    analyzer = _analyzer()
+    index = analyzer.build_rule_index()
+    assert len(index) == len(analyzer.rules)
+
+    for cart in [{'bread'}, {'milk', 'eggs'}, {'bread', 'butter', 'cheese', 'caviar'}]:
+        expected = _expected(analyzer.rules, cart, k=4)
+        result = index.recommend(cart, k=4)
+        assert [score for _, score in result] == pytest.approx([score for _, score in expected])
+        assert not {product for product, _ in result} & cart
+
+    assert index.recommend(['caviar']) == []
+    assert index.encode(['butterscotch', 'yogurts']) == []
+    assert index.recommend(['butterscotch']) == []
+
+def test_save_and_mmap_load(tmp_path):
+    """Test kung pareho ang resulta ng memory-mapped na index"""
+    analyzer = _analyzer()
+    index = analyzer.build_rule_index(rank_by='confidence')
+    index.save(tmp_path / 'index')
+
+    loaded = RuleIndex.load(tmp_path / 'index')
+
+    assert isinstance(loaded.lift, np.memmap)
+    assert loaded.rank_by == 'confidence'
+    assert loaded.recommend({'milk', 'bread'}) == index.recommend({'milk', 'bread'})
+    rules = loaded.rules_for(['milk'])
+    assert rules['confidence'].is_monotonic_decreasing
+    assert len(rules) == sum(analyzer.rules['antecedents'] == frozenset(['milk']))
+
+    with pytest.raises(ValueError):
+        analyzer.build_rule_index(rank_by='novelty')
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from mlxtend.frequent_patterns import association_rules
+from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
+from src.mining import mine_itemsets
+from src.rules import RULE_COLUMNS, SupportIndex, rules_from_lattice
+from src.utils import generate_sample_data
+
+def _lattice(min_support=0.02):
+    np.random.seed(17)
+    return mine_itemsets(BasketMatrix.from_transactions(generate_sample_data(300)), min_support, algorithm='eclat')
+
+def _by_rule(rules):
+    return {(a, c): np.array(row, dtype=float) for a, c, *row in rules.itertuples(index=False)}
+
+def test_support_index_lookup():
+    """Test kung tama ang lookup ng support counts"""
+    lattice = _lattice()
+    index = SupportIndex(lattice)
+    _, rows = lattice.by_length(2)
+    positions, _ = lattice.by_length(2)
+
+    assert (index.lookup(rows) == lattice.counts[positions]).all()
+    assert index.lookup(np.array([[0, 0]])).tolist() == [-1]
+
+def test_native_rules_match_mlxtend():
+    """Test kung pareho ang native rules at ang mlxtend association_rules"""
+    lattice = _lattice()
+    expected = _by_rule(association_rules(lattice.to_frame(), metric='confidence', min_threshold=0.2))
+    rules = rules_from_lattice(lattice, min_confidence=0.2)
+
+    assert list(rules.columns) == RULE_COLUMNS
+    actual = _by_rule(rules)
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert np.allclose(actual[key], values, equal_nan=True)
+
+def test_multi_metric_pruning():
+    """Test kung sabay na nafi-filter ang confidence at lift"""
+    rules = rules_from_lattice(_lattice(), min_confidence=0.2, min_lift=1.1)
+    assert (rules['confidence'] >= 0.2).all()
+    assert (rules['lift'] >= 1.1).all()
+
+    empty = rules_from_lattice(_lattice(), min_confidence=1.1)
+    assert empty.empty
+    assert list(empty.columns) == RULE_COLUMNS
+
+def test_analyzer_rule_engines():
+    """Test kung pareho ang native at mlxtend na engine sa analyzer"""
+    np.random.seed(4)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(200))
+    analyzer.find_frequent_itemsets(min_support=0.05)
+
+    native = _by_rule(analyzer.generate_rules(min_confidence=0.2, min_lift=1.0))
+    reference = _by_rule(analyzer.generate_rules(min_confidence=0.2, min_lift=1.0, engine='mlxtend'))
+
+    assert native.keys() == reference.keys()
+    with pytest.raises(ValueError):
+        analyzer.generate_rules(engine='magic')
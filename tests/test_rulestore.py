@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.rulestore import RuleStore
+from src.utils import generate_sample_data
+
+def _analyzer():
+    np.random.seed(31)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(300))
+    analyzer.preprocess_data()
+    analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+    analyzer.generate_rules(min_confidence=0.1)
+    return analyzer
+
+def test_rule_store_round_trips_and_renders_lazily(tmp_path):
+    """Test kung tama ang columnar rules, top-k at string view"""
+    analyzer = _analyzer()
+    rules = analyzer.rules
+    store = analyzer.rule_store()
+    pd.testing.assert_frame_equal(RuleStore.from_frame(rules, store.products).to_frame(), rules)
+
+    assert analyzer.rule_store() is store
+    assert len(store) == len(rules)
+    pd.testing.assert_frame_equal(store.to_frame(), rules)
+
+    top = store.top(10, 'lift')
+    expected = rules.sort_values('lift', ascending=False, kind='stable').head(10)
+    assert top.tolist() == expected.index.tolist()
+    assert store.order('lift')[:10].tolist() == top.tolist()
+    pd.testing.assert_frame_equal(store.take(top).to_frame(), expected.reset_index(drop=True))
+
+    shown = store.display(top)
+    assert shown['antecedents'].tolist() == [', '.join(sorted(items)) for items in expected['antecedents']]
+    labels = store.labels('consequents')
+    assert labels[int(top[0])] == ', '.join(sorted(expected['consequents'].iloc[0]))
+    assert len(labels._cache) == 1
+
+    csv = pd.read_csv(pd.io.common.StringIO(store.to_csv()))
+    assert csv['antecedents'].tolist() == store.labels('antecedents').to_list()
+
+    store.save(tmp_path / 'rules.npz')
+    pd.testing.assert_frame_equal(RuleStore.load(tmp_path / 'rules.npz').to_frame(), rules)
+
+def test_rule_store_parquet_round_trip(tmp_path):
+    """Test kung buo ang rules pagkatapos ng Parquet export"""
+    pytest.importorskip('pyarrow')
+    store = _analyzer().rule_store()
+
+    store.to_parquet(tmp_path / 'rules.parquet')
+    loaded = RuleStore.read_parquet(tmp_path / 'rules.parquet')
+
+    pd.testing.assert_frame_equal(loaded.to_frame(), store.to_frame())
+    assert RuleStore.from_arrow(store.to_arrow()).display().equals(store.display())
+
+def test_rule_store_skips_frame_encoding_and_keeps_numeric_ids(tmp_path, monkeypatch):
+    """Test kung walang per-rule encoding at numeric pa rin ang ids pagkatapos ng Parquet"""
+    pytest.importorskip('pyarrow')
+    df = generate_sample_data(300)
+    df['product_id'] = df['product_id'].astype('category').cat.codes.astype(np.int64) + 100
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.preprocess_data()
+    analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rules were encoded from the frame")
+    monkeypatch.setattr(RuleStore, 'from_frame', fail)
+    analyzer.generate_rules(min_confidence=0.1)
+    store = analyzer.rule_store()
+    analyzer.generate_rules(min_confidence=0.3)
+    assert len(analyzer.rule_store()) == len(analyzer.rules) < len(store)
+
+    store.to_parquet(tmp_path / 'rules.parquet')
+    loaded = RuleStore.read_parquet(tmp_path / 'rules.parquet').to_frame()
+    assert loaded['antecedents'].iloc[0] == store.to_frame()['antecedents'].iloc[0]
+    assert all(isinstance(item, (int, np.integer)) for item in loaded['antecedents'].iloc[0])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.incremental import negative_border
+from src.sampling import sample_size
+from src.utils import generate_synthetic_baskets
+
+def _analyzer():
+    analyzer = MarketBasketAnalyzer(generate_synthetic_baskets(20000, 60, zipf_exponent=0.8, seed=4))
+    analyzer.preprocess_data()
+    return analyzer
+
+def test_sampled_itemsets_have_bounds_and_stay_separate():
+    """Test kung may confidence bounds ang sample estimates at hindi nire-reuse"""
+    analyzer = _analyzer()
+    exact = analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+
+    approx = analyzer.find_frequent_itemsets(min_support=0.02, approximate=True, seed=1)
+    report = analyzer.sample_report
+    assert report['sample_baskets'] == sample_size(0.02) < 20000
+    assert report['lowered_support'] < 0.02 and not report['complete']
+    assert (approx['support_lower'] <= approx['support']).all()
+    assert (approx['support'] <= approx['support_upper']).all()
+
+    truth = exact.set_index('itemsets')['support']
+    common = approx[approx['itemsets'].isin(truth.index)]
+    inside = (common['support_lower'] <= common['itemsets'].map(truth)) & \
+        (common['itemsets'].map(truth) <= common['support_upper'])
+    assert inside.mean() > 0.85
+    assert len(common) > 0.8 * len(exact)
+
+    analyzer.generate_rules(min_confidence=0.1)
+    assert analyzer._rule_pool is None
+    with pytest.raises(ValueError):
+        analyzer.update()
+
+    again = analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+    assert list(again.columns) == ['support', 'itemsets']
+    assert sorted(again['itemsets'], key=sorted) == sorted(exact['itemsets'], key=sorted)
+
+def test_verified_sample_matches_exact_mining():
+    """Test kung eksakto ang resulta kapag may verification pass"""
+    analyzer = _analyzer()
+    exact = analyzer.find_frequent_itemsets(min_support=0.01, algorithm='fpgrowth')
+
+    verified = analyzer.find_frequent_itemsets(min_support=0.01, sample=0.2, verify=True, seed=2)
+    report = analyzer.sample_report
+    assert report['verified'] and report['border'] > 0 and report['complete']
+    key = lambda frame: sorted(zip(frame['itemsets'].map(sorted).map(tuple), frame['support'].round(12)))
+    assert key(verified) == key(exact)
+    assert np.array_equal(verified['support_lower'], verified['support'])
+
+    border = negative_border({(0,), (1,), (2,), (0, 1), (0, 2), (1, 2)}, 4)
+    assert sorted(border) == [(0, 1, 2), (3,)]
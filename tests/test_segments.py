@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.utils import generate_sample_data
+
+def _key(rules):
+    return sorted(zip(rules['antecedents'].map(sorted).map(tuple), rules['consequents'].map(sorted).map(tuple),
+                      rules['support'].round(12), rules['lift'].round(12)))
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_mine_by_matches_per_segment_runs(n_jobs):
+    """Test kung pareho ang rules bawat segment sa hiwalay na analyzer"""
+    np.random.seed(91)
+    df = generate_sample_data(400)
+    stores = np.random.choice(['north', 'south', 'east', 'kiosk'], df['transaction_id'].max() + 1,
+                              p=[0.4, 0.3, 0.28, 0.02])
+    df['store'] = stores[df['transaction_id']]
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.preprocess_data()
+
+    rules = analyzer.mine_by('store', min_support=0.06, min_confidence=0.3, n_jobs=n_jobs, min_baskets=20)
+
+    assert list(rules.columns[:2]) == ['segment', 'segment_baskets']
+    assert set(rules['segment']) == {'east', 'north', 'south'}
+    for store, segment_rules in rules.groupby('segment'):
+        subset = df[df['store'] == store]
+        direct = MarketBasketAnalyzer(subset)
+        direct.find_frequent_itemsets(min_support=0.06, algorithm='fpgrowth')
+        expected = direct.generate_rules(min_confidence=0.3)
+        assert segment_rules['segment_baskets'].iloc[0] == subset['transaction_id'].nunique()
+        assert _key(segment_rules) == _key(expected)
+
+    with pytest.raises(ValueError):
+        analyzer.mine_by('region')
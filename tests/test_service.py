@@ -0,0 +1,114 @@
+import asyncio
+import json
+import numpy as np
+from src.analyzer import MarketBasketAnalyzer
+from src.service import RecommendationService, ServingModel
+from src.utils import generate_sample_data
+
+def _model(seed=61, min_confidence=0.2):
+    np.random.seed(seed)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(300))
+    analyzer.preprocess_data()
+    analyzer.create_binary_matrix()
+    analyzer.find_frequent_itemsets(min_support=0.05)
+    analyzer.generate_rules(min_confidence=min_confidence)
+    return analyzer, ServingModel.from_analyzer(analyzer)
+
+async def _get(host, port, path, headers=''):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{headers}Connection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+def test_http_endpoints(tmp_path):
+    """Test kung tama ang sagot ng /recommend, /rules at /itemset-support"""
+    analyzer, model = _model()
+    model.save(tmp_path / 'model')
+    service = RecommendationService(ServingModel.load(tmp_path / 'model'))
+    expected = model.rule_index.recommend(['milk', 'bread'], k=3)
+    milk = analyzer.frequent_itemsets[analyzer.frequent_itemsets['itemsets'] == frozenset(['milk'])]
+
+    async def scenario():
+        host, port = await service.start('127.0.0.1', 0)
+        try:
+            results = await asyncio.gather(*(
+                _get(host, port, '/recommend?items=milk,bread&k=3') for _ in range(10)
+            ))
+            rules = await _get(host, port, '/rules?antecedent=milk&limit=2')
+            support = await _get(host, port, '/itemset-support?items=milk')
+            missing = await _get(host, port, '/itemset-support?items=caviar')
+            truncated = await _get(host, port, '/itemset-support?items=coffeecake')
+            bad = await _get(host, port, '/recommend')
+            unknown = await _get(host, port, '/nope')
+            return results, rules, support, missing, truncated, bad, unknown
+        finally:
+            await service.stop()
+
+    results, rules, support, missing, truncated, bad, unknown = asyncio.run(scenario())
+
+    for status, payload in results:
+        assert status == 200
+        assert [(row['product'], row['score']) for row in payload['recommendations']] == expected
+    assert service.stats['batches'] < service.stats['requests']
+    assert rules[0] == 200 and len(rules[1]['rules']) <= 2
+    assert support[1]['support'] == milk['support'].iloc[0]
+    assert missing[1]['support'] is None
+    assert truncated[1]['support'] is None
+    assert bad[0] == 400 and unknown[0] == 404
+
+def test_invalid_lengths_and_counts_are_rejected():
+    """Test kung 400 ang sagot sa maling Content-Length at sa k o limit na mas mababa sa 1"""
+    _, model = _model()
+    service = RecommendationService(model, batch_window=0.0)
+
+    async def scenario():
+        host, port = await service.start('127.0.0.1', 0)
+        try:
+            lengths = [await _get(host, port, '/health', f"Content-Length: {length}\r\n")
+                       for length in ('abc', '-5')]
+            counts = [await service.handle('GET', path)
+                      for path in ('/recommend?items=milk&k=0', '/recommend?items=milk&k=-2',
+                                   '/rules?antecedent=milk&limit=0')]
+            health = await _get(host, port, '/health')
+            return lengths, counts, health
+        finally:
+            await service.stop()
+
+    lengths, counts, health = asyncio.run(scenario())
+
+    assert [status for status, _ in lengths] == [400, 400]
+    assert [status for status, _ in counts] == [400, 400, 400]
+    assert 'at least 1' in counts[2][1]['error']
+    assert health[0] == 200 and service.stats['requests'] == 0
+
+def test_hot_reload_and_cache():
+    """Test kung napapalitan ang model nang hindi nawawala ang requests"""
+    _, model = _model()
+    _, stricter = _model(min_confidence=0.9)
+    service = RecommendationService(model, batch_window=0.0)
+
+    async def scenario():
+        await service.start('127.0.0.1', 0)
+        try:
+            first = await service.handle('GET', '/recommend?items=milk&k=5')
+            cached = await service.handle('GET', '/recommend?items=milk&k=5')
+            pending = [asyncio.create_task(service.handle('GET', f'/recommend?items=milk&k={k}'))
+                       for k in range(1, 20)]
+            await service.reload(stricter)
+            during = await asyncio.gather(*pending)
+            after = await service.handle('GET', '/recommend?items=milk&k=5')
+            return first, cached, during, after
+        finally:
+            await service.stop()
+
+    first, cached, during, after = asyncio.run(scenario())
+
+    assert first == cached and service.stats['cache_hits'] >= 1
+    assert all(status == 200 for status, _ in during)
+    assert service.version == 2
+    assert after[1]['recommendations'] == [
+        {'product': product, 'score': score} for product, score in stricter.rule_index.recommend(['milk'])
+    ]
@@ -0,0 +1,62 @@
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.encoding import BasketMatrix
+from src.mining import mine_itemsets
+from src.taxonomy import Taxonomy, taxonomy_itemsets
+from src.utils import generate_synthetic_baskets
+
+def _basket_matrix():
+    analyzer = MarketBasketAnalyzer(generate_synthetic_baskets(3000, 40, zipf_exponent=0.7, seed=5))
+    analyzer.preprocess_data()
+    return analyzer._basket_matrix()
+
+def _taxonomy(products):
+    parents = {product: f'group {code % 6}' for code, product in enumerate(products)}
+    parents.update({f'group {group}': f'dept {group % 2}' for group in range(6)})
+    parents[products[0]] = None
+    return Taxonomy(parents)
+
+def test_taxonomy_itemsets_match_filtered_flat_mining():
+    """Test kung pareho sa flat mining ng extended matrix ang generalized itemsets"""
+    basket_matrix = _basket_matrix()
+    taxonomy = _taxonomy(basket_matrix.products)
+    matrix, nodes, _ = taxonomy.extend(basket_matrix)
+    categories = set(taxonomy.categories)
+    flat = mine_itemsets(BasketMatrix(matrix, nodes, basket_matrix.transactions), 0.01)
+
+    for max_categories in (None, 1):
+        expected = {}
+        for codes, count in flat.iter_itemsets():
+            names = nodes[list(codes)].tolist()
+            if any(name in taxonomy.ancestors(other) for name in names for other in names):
+                continue
+            general = sum(name in categories for name in names)
+            if max_categories is not None and general < len(names) and general > max_categories:
+                continue
+            expected[frozenset(names)] = count
+
+        lattice, report = taxonomy_itemsets(basket_matrix, taxonomy, 0.01, max_categories=max_categories)
+        found = {frozenset(lattice.products[list(codes)]): count for codes, count in lattice.iter_itemsets()}
+        assert found == expected
+        assert report['pruned_candidates'] > 0 and report['candidates'] < len(flat)
+
+def test_mine_taxonomy_rolls_up_and_prunes_descendants():
+    """Test kung may category at cross-level rules at hindi binibilang ang anak ng bihirang category"""
+    df = generate_synthetic_baskets(3000, 40, zipf_exponent=1.2, seed=8)
+    codes = df['product_id'].str[1:].astype(int)
+    df['category'] = 'rare'
+    df.loc[codes < 38, 'category'] = 'group ' + (codes % 3).astype(str)
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.preprocess_data()
+
+    rules = analyzer.mine_taxonomy('category', min_support=0.05, min_confidence=0.1, item_support=0.01)
+    report = analyzer.taxonomy_report
+    assert set(rules['level']) == {'item', 'category', 'cross'}
+    assert report['pruned_nodes'] == 2
+    nodes = set().union(*rules['antecedents'], *rules['consequents'])
+    assert 'rare' not in nodes and not nodes & {'p38', 'p39'}
+
+    with pytest.raises(ValueError):
+        analyzer.mine_taxonomy('aisle')
+    with pytest.raises(ValueError):
+        Taxonomy({'a': 'b', 'b': 'a'})
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.utils import generate_sample_data
+
+def _analyzer(seed):
+    np.random.seed(seed)
+    analyzer = MarketBasketAnalyzer(generate_sample_data(300))
+    analyzer.preprocess_data()
+    return analyzer
+
+@pytest.mark.parametrize('metric', ['support', 'confidence', 'lift'])
+def test_find_top_rules_matches_full_mining(metric):
+    """Test kung ang top-k rules ay pareho sa top-k ng buong mining"""
+    analyzer = _analyzer(17)
+    top = analyzer.find_top_rules(k=25, metric=metric, min_confidence=0.2, min_count=3)
+    search = analyzer.top_rules_search
+
+    assert len(top) == 25
+    assert search['exact']
+    assert (np.diff(top[metric].to_numpy()) <= 0).all()
+    assert analyzer.rules is top
+
+    full = _analyzer(17)
+    n_baskets = full._basket_matrix().n_baskets
+    full.find_frequent_itemsets(min_support=3 / n_baskets, algorithm='fpgrowth')
+    expected = full.generate_rules(min_confidence=0.2)[metric].sort_values(ascending=False).head(25)
+    assert np.allclose(top[metric].to_numpy(), expected.to_numpy())
+
+    if metric == 'support':
+        assert search['stopped'] == 'k_rules'
+        assert search['min_support'] > 3 / n_baskets
+
+def test_find_top_rules_respects_budget():
+    """Test kung titigil ang search kapag lalampas sa itemset budget"""
+    analyzer = _analyzer(5)
+    top = analyzer.find_top_rules(k=10, metric='lift', min_count=1, max_itemsets=50)
+    search = analyzer.top_rules_search
+
+    assert search['stopped'] == 'max_itemsets'
+    assert not search['exact']
+    assert all(entry['itemsets'] <= 50 for entry in search['rounds'])
+    assert len(top) <= 10
+
+    with pytest.raises(ValueError):
+        analyzer.find_top_rules(metric='leverage')
+
+def test_capped_top_rules_are_not_reused():
+    """Test kung hindi nire-reuse ang lattice na may max_len"""
+    analyzer = _analyzer(9)
+    analyzer.find_top_rules(k=20, metric='lift', min_count=2, max_len=2)
+    capped = analyzer.find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+
+    expected = _analyzer(9).find_frequent_itemsets(min_support=0.02, algorithm='fpgrowth')
+    assert capped['itemsets'].map(len).max() > 2
+    assert sorted(capped['itemsets'], key=sorted) == sorted(expected['itemsets'], key=sorted)
+
+def test_repeated_top_rules_query_is_not_searched_again(monkeypatch):
+    """Test kung hindi na hinahanap ulit ang parehong top-k query sa bawat rerun"""
+    analyzer = _analyzer(23)
+    top = analyzer.find_top_rules(k=20, metric='lift', min_confidence=0.2)
+    itemsets = analyzer.frequent_itemsets
+    analyzer.find_frequent_itemsets(min_support=0.05)
+    analyzer.generate_rules(min_confidence=0.5)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("searched again")
+    monkeypatch.setattr('src.analyzer.top_k_rules', fail)
+    again = analyzer.find_top_rules(k=20, metric='lift', min_confidence=0.2)
+    assert again.equals(top)
+    assert len(analyzer.rule_store()) == len(top)
+    assert analyzer.frequent_itemsets.equals(itemsets)
+
+    with pytest.raises(AssertionError):
+        analyzer.find_top_rules(k=30, metric='lift', min_confidence=0.2)
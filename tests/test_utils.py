@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from src.utils import generate_synthetic_baskets
+
+def test_synthetic_baskets_shape_and_skew():
+    """Test kung tama ang laki at Zipf skew ng synthetic data"""
+    df = generate_synthetic_baskets(2000, 100, zipf_exponent=1.5, mean_basket_size=5, seed=3)
+
+    assert list(df.columns) == ['transaction_id', 'product_id']
+    assert df['transaction_id'].nunique() == 2000
+    assert not df.duplicated().any()
+    counts = df['product_id'].value_counts()
+    assert counts.index[0] == 'p00'
+    assert counts.iloc[0] > 10 * counts.iloc[-1]
+
+    sizes = generate_synthetic_baskets(500, 50, mean_basket_size=3, size_distribution='fixed', seed=1) \
+        .groupby('transaction_id').size()
+    assert sizes.max() <= 3
+    assert generate_synthetic_baskets(100, 20, seed=7).equals(generate_synthetic_baskets(100, 20, seed=7))
+
+    with pytest.raises(ValueError):
+        generate_synthetic_baskets(10, 10, size_distribution='normal')
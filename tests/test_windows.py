@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer import MarketBasketAnalyzer
+from src.utils import generate_sample_data
+
+def _analyzer(seed=81):
+    np.random.seed(seed)
+    df = generate_sample_data(600)
+    # Isang petsa bawat basket
+    days = np.random.randint(0, 365, df['transaction_id'].max() + 1)
+    df['timestamp'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(days[df['transaction_id']], unit='D')
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.preprocess_data()
+    return analyzer
+
+def _direct_rules(df, min_support, min_confidence):
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.find_frequent_itemsets(min_support=min_support, algorithm='fpgrowth')
+    return analyzer.generate_rules(min_confidence=min_confidence)
+
+def _key(rules):
+    return sorted(zip(rules['antecedents'].map(sorted).map(tuple), rules['consequents'].map(sorted).map(tuple),
+                      rules['support'].round(12), rules['confidence'].round(12)))
+
+@pytest.mark.parametrize('window', [1, 3])
+def test_windows_match_direct_mining(window):
+    """Test kung pareho ang rules ng bawat window sa direktang pag-mine"""
+    analyzer = _analyzer()
+    rules = analyzer.mine_windows(freq='M', window=window, step=2, min_support=0.08, min_confidence=0.3)
+    df = analyzer.transactions_df
+
+    starts = sorted(rules['window_start'].unique())
+    assert len(starts) == len(range(0, 12 - window + 1, 2))
+    for start in starts:
+        window_rules = rules[rules['window_start'] == start]
+        end = window_rules['window_end'].iloc[0]
+        in_window = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
+        assert window_rules['window_baskets'].iloc[0] == in_window['transaction_id'].nunique()
+        assert _key(window_rules) == _key(_direct_rules(in_window, 0.08, 0.3))
+
+def test_window_reuse_and_trend():
+    """Test kung nagagamit ulit ang partition counts at ang support trend"""
+    analyzer = _analyzer()
+    analyzer.mine_windows(freq='M', min_support=0.05, min_confidence=0.3)
+    counts = analyzer.windowed
+    stricter = analyzer.mine_windows(freq='M', min_support=0.1, min_confidence=0.3)
+
+    assert analyzer.windowed is counts
+    assert (stricter['support'] >= 0.1).all()
+    trend = counts.support_trend(['milk'])
+    assert len(trend) == 12
+    january = analyzer.transactions_df[analyzer.transactions_df['timestamp'].dt.month == 1]
+    assert trend.iloc[0] == pytest.approx(
+        (january['product_id'] == 'milk').sum() / january['transaction_id'].nunique())
+
+    with pytest.raises(ValueError):
+        MarketBasketAnalyzer(analyzer.transactions_df.drop(columns='timestamp')).mine_windows()
+
+def test_day_first_dates_use_date_format():
+    """Test kung tama ang pag-parse ng dd/mm/yyyy at nabibilang ang walang petsa"""
+    np.random.seed(83)
+    df = generate_sample_data(400).drop(columns='timestamp')
+    days = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.random.randint(0, 365, 400), unit='D')
+    df['Date'] = days.strftime('%d/%m/%Y')[df['transaction_id']]
+    df = df.sort_values('Date', kind='stable')
+    n_baskets = df['transaction_id'].nunique()
+
+    guessed = MarketBasketAnalyzer(df)
+    guessed.preprocess_data()
+    guessed.mine_windows(time_column='Date', min_support=0.1)
+    assert guessed.windowed.undated_baskets > 0
+    assert guessed.windowed.basket_counts.sum() + guessed.windowed.undated_baskets == n_baskets
+
+    analyzer = MarketBasketAnalyzer(df)
+    analyzer.preprocess_data(date_format='%d/%m/%Y')
+    analyzer.mine_windows(time_column='Date', min_support=0.1)
+    assert analyzer.windowed.undated_baskets == 0
+    assert len(analyzer.windowed) == 12 and analyzer.windowed.basket_counts.sum() == n_baskets